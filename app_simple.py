@@ -3,13 +3,19 @@ from flask_socketio import SocketIO, emit, join_room
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_bcrypt import Bcrypt
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+import asyncio
+import glob
 import os
 import uuid
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+import hashlib
+import io
 import json
 from pathlib import Path
-import PyPDF2
 import requests
 import urllib.request
 import tempfile
@@ -19,207 +25,380 @@ import shutil
 from database import (
     db, User, Audiobook, init_database, get_user_audiobooks, 
     create_audiobook, update_audiobook_progress, create_user, 
-    authenticate_user, delete_audiobook, get_database_stats
+    authenticate_user, delete_audiobook, enqueue_audiobook,
+    get_user_audiobooks_page, AUDIOBOOK_FIELDS, find_existing_audiobooks,
+    create_audiobooks_bulk, enqueue_audiobooks_bulk, set_audiobooks_status,
+    cancel_audiobook_conversion, set_audiobook_priority, get_audiobook_statuses
 )
-
-# Import voice engines
-try:
-    from gtts import gTTS
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
-
-try:
-    import pyttsx3
-    PYTTSX3_AVAILABLE = True
-except ImportError:
-    PYTTSX3_AVAILABLE = False
-
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from stats import count_by_status, get_user_stats, get_global_stats
+from scheduler import ConversionScheduler, DatabaseQueue, QueueFullError
+from pdf_extraction import count_pages, iter_page_texts
+from tts_cache import TTSCache
+from source_cache import SourceCache
+from downloader import RangedDownloader
+from progress import ProgressReporter, get_progress_stats
+from db_writer import DatabaseWriter
+from cache import TTLCache, MemoryBackend, make_backend
+from http_client import HTTPClient
+import audio_pack
+from manifest import AudioManifest, manifest_path
+from tts_engines import TTSEngineRegistry
+from broker import BrokerManager
+from async_engine import AsyncConversionEngine
+from text_cleaning import TextCleaner, record_totals, get_cleaning_stats
 
 # Flask app configuration
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
+app.config['CONVERSION_WORKERS'] = int(os.environ.get('CONVERSION_WORKERS', 2))  # Concurrent conversions
+app.config['CONVERSION_ENGINE'] = os.environ.get('CONVERSION_ENGINE', 'threads')  # 'threads' (thread per book) or 'async' (event loop)
+app.config['ASYNC_MAX_BOOKS'] = int(os.environ.get('ASYNC_MAX_BOOKS', 200))  # Concurrent conversions with the async engine
+app.config['ASYNC_IO_THREADS'] = int(os.environ.get('ASYNC_IO_THREADS', 16))  # Threads for downloads and TTS calls, shared by all books
+app.config['ASYNC_CPU_THREADS'] = int(os.environ.get('ASYNC_CPU_THREADS', 2))  # Threads for hashing and packing
+app.config['ASYNC_EXTRACT_THREADS'] = int(os.environ.get('ASYNC_EXTRACT_THREADS', 8))  # Threads for PDF text extraction, so a slow PDF doesn't stall other books
+app.config['CONVERSION_QUEUE_SIZE'] = int(os.environ.get('CONVERSION_QUEUE_SIZE', 100))  # Max waiting jobs
+app.config['CONVERSION_STALE_SECONDS'] = int(os.environ.get('CONVERSION_STALE_SECONDS', 600))  # Worker nodes requeue 'processing' jobs silent this long
+app.config['NODE_ROLE'] = os.environ.get('NODE_ROLE', 'all')  # 'all', 'web' (no conversions) or 'worker' (see worker.py)
+app.config['WORKER_POLL_INTERVAL'] = float(os.environ.get('WORKER_POLL_INTERVAL', 1.0))  # Seconds between worker polls for queued jobs
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('SOCKETIO_MESSAGE_QUEUE', '')  # redis://, amqp:// or broker:// URL shared by all nodes
+app.config['TTS_PAGE_CONCURRENCY'] = int(os.environ.get('TTS_PAGE_CONCURRENCY', 4))  # Pages in flight per book
+app.config['TTS_GLOBAL_CONCURRENCY'] = int(os.environ.get('TTS_GLOBAL_CONCURRENCY', 8))  # Pages in flight across books
+app.config['TTS_PAGE_RETRIES'] = int(os.environ.get('TTS_PAGE_RETRIES', 2))  # Retries per failed page
+app.config['TTS_CHUNK_CHARS'] = int(os.environ.get('TTS_CHUNK_CHARS', 500))  # Max chars per audio chunk, 0 = whole pages
+app.config['TTS_GTTS_CONCURRENCY'] = int(os.environ.get('TTS_GTTS_CONCURRENCY', 8))  # gTTS requests at once
+app.config['TTS_PYTTSX3_CONCURRENCY'] = int(os.environ.get('TTS_PYTTSX3_CONCURRENCY', 1))  # pyttsx3 batches at once
+app.config['TTS_OPENAI_CONCURRENCY'] = int(os.environ.get('TTS_OPENAI_CONCURRENCY', 4))  # OpenAI requests at once
+app.config['TEXT_CLEANING'] = os.environ.get('TEXT_CLEANING', '1') == '1'  # Strip headers/footers, page numbers and boilerplate before TTS
+app.config['TEXT_CLEANING_WINDOW'] = int(os.environ.get('TEXT_CLEANING_WINDOW', 6))  # Pages read ahead to spot repeated headers/footers
+app.config['TEXT_CLEANING_MIN_REPEATS'] = int(os.environ.get('TEXT_CLEANING_MIN_REPEATS', 3))  # Pages a line must repeat on to count as header/footer
+app.config['TTS_FAKE_ENGINE'] = os.environ.get('TTS_FAKE_ENGINE', '0') == '1'  # Offer the silent 'fake' engine (tests, benchmarks)
+app.config['AUDIO_OUTPUT_FORMAT'] = os.environ.get('AUDIO_OUTPUT_FORMAT', 'pages')  # 'pages', 'packed' (one file + index) or 'both'
+app.config['AUDIO_CACHE_MAX_AGE'] = int(os.environ.get('AUDIO_CACHE_MAX_AGE', 604800))  # Browser cache lifetime for audio of completed books
+app.config['EXTRACT_PROCESS_WORKERS'] = int(os.environ.get('EXTRACT_PROCESS_WORKERS', min(4, os.cpu_count() or 1)))  # PDF extraction processes
+app.config['EXTRACT_PROCESS_MIN_PAGES'] = int(os.environ.get('EXTRACT_PROCESS_MIN_PAGES', 100))  # Smaller PDFs extract in-process
+app.config['EXTRACT_SHARD_SIZE'] = int(os.environ.get('EXTRACT_SHARD_SIZE', 25))  # Pages per extraction shard
+app.config['TTS_CACHE_DIR'] = os.environ.get('TTS_CACHE_DIR', os.path.join('cache', 'tts'))
+app.config['TTS_CACHE_MAX_MB'] = int(os.environ.get('TTS_CACHE_MAX_MB', 2048))  # 0 disables the cache
+app.config['SOURCE_CACHE_DIR'] = os.environ.get('SOURCE_CACHE_DIR', os.path.join('cache', 'sources'))
+app.config['SOURCE_CACHE_MAX_MB'] = int(os.environ.get('SOURCE_CACHE_MAX_MB', 4096))
+app.config['SOURCE_CACHE_REVALIDATE_SECONDS'] = int(os.environ.get('SOURCE_CACHE_REVALIDATE_SECONDS', 3600))
+app.config['DOWNLOAD_CONNECTIONS'] = int(os.environ.get('DOWNLOAD_CONNECTIONS', 4))  # Parallel Range requests per PDF
+app.config['DOWNLOAD_CHUNK_KB'] = int(os.environ.get('DOWNLOAD_CHUNK_KB', 1024))  # Read size per response chunk
+app.config['DOWNLOAD_SEGMENT_MIN_MB'] = int(os.environ.get('DOWNLOAD_SEGMENT_MIN_MB', 4))  # Smallest range per connection
+app.config['DOWNLOAD_TIMEOUT'] = int(os.environ.get('DOWNLOAD_TIMEOUT', 30))
+app.config['DOWNLOAD_RETRIES'] = int(os.environ.get('DOWNLOAD_RETRIES', 3))  # Retries per failed segment
+app.config['PROGRESS_DB_INTERVAL'] = float(os.environ.get('PROGRESS_DB_INTERVAL', 2.0))  # Seconds between progress writes
+app.config['PROGRESS_EMIT_INTERVAL'] = float(os.environ.get('PROGRESS_EMIT_INTERVAL', 0.5))  # Seconds between progress events
+app.config['SEARCH_CACHE_BACKEND'] = os.environ.get('SEARCH_CACHE_BACKEND', 'memory')  # 'memory' or 'disk' (shared by workers)
+app.config['SEARCH_CACHE_PATH'] = os.environ.get('SEARCH_CACHE_PATH', os.path.join('cache', 'search.db'))
+app.config['SEARCH_CACHE_TTL'] = int(os.environ.get('SEARCH_CACHE_TTL', 300))  # Seconds a search result is fresh
+app.config['SEARCH_CACHE_STALE_TTL'] = int(os.environ.get('SEARCH_CACHE_STALE_TTL', 3600))  # Extra seconds served stale while refreshing
+app.config['SEARCH_CACHE_MAX_ENTRIES'] = int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', 1000))
+app.config['PREVIEW_CACHE_BACKEND'] = os.environ.get('PREVIEW_CACHE_BACKEND', app.config['SEARCH_CACHE_BACKEND'])
+app.config['PREVIEW_CACHE_PATH'] = os.environ.get('PREVIEW_CACHE_PATH', os.path.join('cache', 'previews.db'))
+app.config['PREVIEW_CACHE_TTL'] = int(os.environ.get('PREVIEW_CACHE_TTL', 3600))  # Seconds book details are fresh
+app.config['PREVIEW_CACHE_STALE_TTL'] = int(os.environ.get('PREVIEW_CACHE_STALE_TTL', 86400))  # Extra seconds served stale while refreshing
+app.config['PREVIEW_CACHE_MAX_ENTRIES'] = int(os.environ.get('PREVIEW_CACHE_MAX_ENTRIES', 2000))
+app.config['AUDIOBOOKS_PAGE_SIZE'] = int(os.environ.get('AUDIOBOOKS_PAGE_SIZE', 50))  # Library page size (dashboard and /api/audiobooks)
+app.config['AUDIOBOOKS_MAX_PAGE_SIZE'] = int(os.environ.get('AUDIOBOOKS_MAX_PAGE_SIZE', 200))
+app.config['DB_WRITE_QUEUE'] = os.environ.get('DB_WRITE_QUEUE', '1') == '1'  # Serialize background DB writes on one thread
+app.config['BATCH_MAX_BOOKS'] = int(os.environ.get('BATCH_MAX_BOOKS', 500))  # Books per batch add/convert request
+app.config['STATS_CACHE_TTL'] = int(os.environ.get('STATS_CACHE_TTL', 30))  # Seconds global stats are reused
+app.config['HTTP_POOL_CONNECTIONS'] = int(os.environ.get('HTTP_POOL_CONNECTIONS', 10))  # Hosts with pooled connections
+app.config['HTTP_POOL_MAXSIZE'] = int(os.environ.get('HTTP_POOL_MAXSIZE', 20))  # Keep-alive connections per host
+app.config['HTTP_RETRIES'] = int(os.environ.get('HTTP_RETRIES', 3))  # Retries on connection errors, 429 and 5xx
+app.config['HTTP_BACKOFF'] = float(os.environ.get('HTTP_BACKOFF', 0.5))  # Backoff base in seconds between retries
+app.config['HTTP_HOST_CONCURRENCY'] = int(os.environ.get('HTTP_HOST_CONCURRENCY', 8))  # Simultaneous requests per host
 
 # Initialize database with auto-configuration
 if not init_database(app):
     print("❌ Failed to initialize database. Exiting.")
     exit(1)
 
+def create_socketio():
+    """
+    Create the Socket.IO server.
+    
+    With SOCKETIO_MESSAGE_QUEUE set, rooms and events are shared with every
+    other node on the same queue, so progress emitted on a worker node reaches
+    clients connected to any web node. Worker nodes only emit, through a
+    write-only instance that isn't attached to the web app.
+    """
+    url = app.config['SOCKETIO_MESSAGE_QUEUE']
+    worker = app.config['NODE_ROLE'] == 'worker'
+    if not url:
+        if worker:
+            print("⚠️ No SOCKETIO_MESSAGE_QUEUE set: progress from this worker won't reach web clients")
+        return SocketIO(app, cors_allowed_origins="*")
+    
+    options = {'cors_allowed_origins': "*", 'message_queue': url}
+    if url.startswith('broker://'):
+        options['client_manager'] = BrokerManager(url, write_only=worker)
+    print(f"🔗 Socket.IO message queue: {url}")
+    return SocketIO(None if worker else app, **options)
+
 # Initialize other extensions
 bcrypt = Bcrypt(app)
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = create_socketio()
 
 # Global variables
-active_conversions = {}
+active_conversions = {}  # Conversions running in this process: audiobook_id -> AudiobookConverter
 UPLOAD_FOLDER = 'uploads'
 OUTPUT_FOLDER = 'output'
 
+# Converter progress and page-count writes go through one writer thread
+db_writer = DatabaseWriter(app) if app.config['DB_WRITE_QUEUE'] else None
+
+# Caps concurrent TTS requests across all books being converted
+tts_semaphore = threading.BoundedSemaphore(max(1, app.config['TTS_GLOBAL_CONCURRENCY']))
+
+# Voice engines, each with its own concurrency limit and rate-limit pause
+tts_engines = TTSEngineRegistry(
+    concurrency={
+        'gtts': app.config['TTS_GTTS_CONCURRENCY'],
+        'pyttsx3': app.config['TTS_PYTTSX3_CONCURRENCY'],
+        'openai': app.config['TTS_OPENAI_CONCURRENCY']
+    },
+    enable_fake=app.config['TTS_FAKE_ENGINE']
+)
+
+# Event loop running conversions as coroutines (CONVERSION_ENGINE=async)
+async_engine = AsyncConversionEngine(
+    app, io_threads=app.config['ASYNC_IO_THREADS'], cpu_threads=app.config['ASYNC_CPU_THREADS'],
+    extract_threads=app.config['ASYNC_EXTRACT_THREADS']
+) if app.config['CONVERSION_ENGINE'] == 'async' else None
+
+# Synthesized audio shared between conversions with the same text and voice
+tts_cache = TTSCache(app.config['TTS_CACHE_DIR'], app.config['TTS_CACHE_MAX_MB'] * 1024 * 1024) if app.config['TTS_CACHE_MAX_MB'] > 0 else None
+
+# Shared keep-alive client for all Open Library and archive.org traffic
+http_client = HTTPClient(
+    pool_connections=app.config['HTTP_POOL_CONNECTIONS'],
+    pool_maxsize=app.config['HTTP_POOL_MAXSIZE'],
+    retries=app.config['HTTP_RETRIES'],
+    backoff_factor=app.config['HTTP_BACKOFF'],
+    host_concurrency=app.config['HTTP_HOST_CONCURRENCY']
+)
+
+# Downloaded source PDFs shared between conversions of the same book
+source_cache = SourceCache(
+    app.config['SOURCE_CACHE_DIR'],
+    app.config['SOURCE_CACHE_MAX_MB'] * 1024 * 1024,
+    revalidate_after=app.config['SOURCE_CACHE_REVALIDATE_SECONDS'],
+    timeout=app.config['DOWNLOAD_TIMEOUT'],
+    downloader=RangedDownloader(
+        connections=app.config['DOWNLOAD_CONNECTIONS'],
+        chunk_size=app.config['DOWNLOAD_CHUNK_KB'] * 1024,
+        min_segment_size=app.config['DOWNLOAD_SEGMENT_MIN_MB'] * 1024 * 1024,
+        timeout=app.config['DOWNLOAD_TIMEOUT'],
+        retries=app.config['DOWNLOAD_RETRIES'],
+        http=http_client
+    )
+)
+
+# Global library stats, shared by every /api/stats request for a few seconds
+stats_cache = TTLCache(MemoryBackend(max_entries=1), ttl=app.config['STATS_CACHE_TTL'], stale_ttl=app.config['STATS_CACHE_TTL'])
+
+# Content hashes behind audio ETags, keyed by file path and version
+audio_etags = MemoryBackend(max_entries=10000)
+
 # Create directories
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
+# Open Library search results, keyed by normalized query, language and limit
+search_cache = TTLCache(
+    make_backend(app.config['SEARCH_CACHE_BACKEND'], app.config['SEARCH_CACHE_PATH'], app.config['SEARCH_CACHE_MAX_ENTRIES']),
+    ttl=app.config['SEARCH_CACHE_TTL'],
+    stale_ttl=app.config['SEARCH_CACHE_STALE_TTL']
+)
+
+# Open Library book details for previews, keyed by book key
+preview_cache = TTLCache(
+    make_backend(app.config['PREVIEW_CACHE_BACKEND'], app.config['PREVIEW_CACHE_PATH'], app.config['PREVIEW_CACHE_MAX_ENTRIES']),
+    ttl=app.config['PREVIEW_CACHE_TTL'],
+    stale_ttl=app.config['PREVIEW_CACHE_STALE_TTL']
+)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(user_id)
 
+def normalize_work_key(key):
+    """Turn 'OL45804W', 'works/OL45804W' or '/works/OL45804W' into '/works/OL45804W'"""
+    key = str(key).strip().strip('/')
+    if not key.startswith('works/'):
+        key = f"works/{key}"
+    return f"/{key}"
+
 class OpenLibraryAPI:
     """Simplified Open Library API interface"""
+
+    SEARCH_FIELDS = 'key,title,author_name,first_publish_year,ia,subject,isbn,publisher,publish_date,number_of_pages_median,language,cover_i,ratings_average,ratings_count,first_sentence'
     
     @staticmethod
     def search_books(query, language='en', limit=15):
+        """Search Open Library, served from the search cache when possible"""
+        key = json.dumps([' '.join(query.lower().split()), language, limit])
         try:
-            url = "https://openlibrary.org/search.json"
-            params = {
-                'q': query.strip().replace(' ', '+'),
-                'limit': limit,
-                'fields': 'key,title,author_name,first_publish_year,ia,subject,isbn,publisher,publish_date,number_of_pages_median,language,cover_i,ratings_average,ratings_count,first_sentence'
-            }
-            
-            # Add proper headers to avoid being blocked
-            headers = {
-                'User-Agent': 'AudioGen/1.0 (https://github.com/audiobook-app)',
-                'Accept': 'application/json',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            # Check if response is actually JSON
-            content_type = response.headers.get('content-type', '')
-            if 'application/json' not in content_type.lower():
-                print(f"Warning: Unexpected content type: {content_type}")
-                print(f"Response preview: {response.text[:200]}")
-                return []
-            
-            data = response.json()
-            
-            books = []
-            for doc in data.get('docs', []):
-                ia_id = doc.get('ia')
-                if not ia_id:
-                    continue
-                    
-                ia_id = ia_id[0] if isinstance(ia_id, list) else ia_id
-                
-                # Get cover image URL
-                cover_id = doc.get('cover_i')
-                cover_url = f"https://covers.openlibrary.org/b/id/{cover_id}-L.jpg" if cover_id else None
-                
-                # Get first sentence preview
-                first_sentence = doc.get('first_sentence')
-                if isinstance(first_sentence, list) and first_sentence:
-                    first_sentence = first_sentence[0]
-                
-                # Format publisher info
-                publishers = doc.get('publisher', [])
-                publisher = publishers[0] if isinstance(publishers, list) and publishers else 'Unknown Publisher'
-                
-                # Format publish dates
-                publish_dates = doc.get('publish_date', [])
-                recent_publish = publish_dates[-1] if isinstance(publish_dates, list) and publish_dates else None
-                
-                # Calculate estimated reading time (250 WPM average)
-                pages = doc.get('number_of_pages_median', 0)
-                estimated_hours = round((pages * 250) / 15000, 1) if pages else None  # 250 words/page, 250 WPM reading
-                
-                book = {
-                    'title': doc.get('title', 'Unknown Title'),
-                    'author': ', '.join(doc.get('author_name', [])) if doc.get('author_name') else 'Unknown Author',
-                    'year': doc.get('first_publish_year', ''),
-                    'key': doc.get('key', ''),
-                    'ia_id': ia_id,
-                    'download_url': f"https://archive.org/download/{ia_id}/{ia_id}.pdf",
-                    'subjects': doc.get('subject', [])[:5] if doc.get('subject') else [],
-                    'isbn': doc.get('isbn', [])[:1] if doc.get('isbn') else [],
-                    'publisher': publisher,
-                    'recent_publish_date': recent_publish,
-                    'pages': pages,
-                    'estimated_hours': estimated_hours,
-                    'cover_url': cover_url,
-                    'rating': round(doc.get('ratings_average', 0), 1) if doc.get('ratings_average') else None,
-                    'rating_count': doc.get('ratings_count', 0),
-                    'first_sentence': first_sentence,
-                    'languages': doc.get('language', [])[:3] if doc.get('language') else ['English']
-                }
-                books.append(book)
-            
-            return books
-            
+            return search_cache.get_or_compute(key, lambda: OpenLibraryAPI.fetch_search_results(query, language, limit))
         except requests.exceptions.RequestException as e:
             print(f"Network error during search: {e}")
             return []
         except json.JSONDecodeError as e:
             print(f"JSON decode error: {e}")
-            print(f"Response content: {response.text[:500] if 'response' in locals() else 'No response'}")
             return []
         except Exception as e:
             print(f"Search error: {e}")
             return []
 
     @staticmethod
-    def get_book_details(book_key):
-        """Get detailed book information from Open Library by book key"""
+    def fetch_search_results(query, language='en', limit=15):
+        """Query the Open Library search API directly (raises on upstream errors)"""
+        url = "https://openlibrary.org/search.json"
+        params = {
+            'q': query.strip().replace(' ', '+'),
+            'limit': limit,
+            'fields': OpenLibraryAPI.SEARCH_FIELDS
+        }
+
+        # Add proper headers to avoid being blocked
+        headers = {
+            'User-Agent': 'AudioGen/1.0 (https://github.com/audiobook-app)',
+            'Accept': 'application/json',
+            'Content-Type': 'application/json'
+        }
+
+        response = http_client.get(url, params=params, headers=headers, timeout=15)
+        response.raise_for_status()
+
+        # Check if response is actually JSON
+        content_type = response.headers.get('content-type', '')
+        if 'application/json' not in content_type.lower():
+            print(f"Response preview: {response.text[:200]}")
+            raise ValueError(f"Unexpected content type: {content_type}")
+
         try:
-            # First try to get detailed book info
-            detail_url = f"https://openlibrary.org{book_key}.json"
-            headers = {
-                'User-Agent': 'AudioGen/1.0 (https://github.com/audiobook-app)',
-                'Accept': 'application/json'
-            }
-            
-            response = requests.get(detail_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                book_data = response.json()
-                
-                # Get additional info from works API if this is a work
-                works_data = {}
-                if '/works/' in book_key:
-                    works_url = f"https://openlibrary.org{book_key}.json"
-                    works_response = requests.get(works_url, headers=headers, timeout=10)
-                    if works_response.status_code == 200:
-                        works_data = works_response.json()
-                
-                # Extract comprehensive information
-                description = None
-                if works_data.get('description'):
-                    desc = works_data['description']
-                    if isinstance(desc, dict):
-                        description = desc.get('value', '')
-                    elif isinstance(desc, str):
-                        description = desc
-                
-                # Get cover information
-                covers = book_data.get('covers', works_data.get('covers', []))
-                cover_url = f"https://covers.openlibrary.org/b/id/{covers[0]}-L.jpg" if covers else None
-                
-                # Extract subjects and genres
-                subjects = book_data.get('subjects', works_data.get('subjects', []))
-                
-                return {
-                    'title': book_data.get('title', works_data.get('title', 'Unknown Title')),
-                    'description': description,
-                    'subjects': subjects[:10] if subjects else [],
-                    'cover_url': cover_url,
-                    'first_publish_date': book_data.get('first_publish_date', ''),
-                    'key': book_data.get('key', book_key),
-                    'revision': book_data.get('revision', 1),
-                    'created': book_data.get('created', {}).get('value', ''),
-                    'last_modified': book_data.get('last_modified', {}).get('value', '')
-                }
-            
+            data = response.json()
+        except json.JSONDecodeError:
+            print(f"Response content: {response.text[:500]}")
+            raise
+
+        books = []
+        for doc in data.get('docs', []):
+            book = OpenLibraryAPI.parse_search_doc(doc)
+            if book:
+                books.append(book)
+
+        return books
+
+    @staticmethod
+    def parse_search_doc(doc):
+        """Build a book dictionary from a search.json doc, or None if it has no Internet Archive scan"""
+        ia_id = doc.get('ia')
+        if not ia_id:
             return None
-            
+
+        ia_id = ia_id[0] if isinstance(ia_id, list) else ia_id
+
+        # Get cover image URL
+        cover_id = doc.get('cover_i')
+        cover_url = f"https://covers.openlibrary.org/b/id/{cover_id}-L.jpg" if cover_id else None
+
+        # Get first sentence preview
+        first_sentence = doc.get('first_sentence')
+        if isinstance(first_sentence, list) and first_sentence:
+            first_sentence = first_sentence[0]
+
+        # Format publisher info
+        publishers = doc.get('publisher', [])
+        publisher = publishers[0] if isinstance(publishers, list) and publishers else 'Unknown Publisher'
+
+        # Format publish dates
+        publish_dates = doc.get('publish_date', [])
+        recent_publish = publish_dates[-1] if isinstance(publish_dates, list) and publish_dates else None
+
+        # Calculate estimated reading time (250 WPM average)
+        pages = doc.get('number_of_pages_median', 0)
+        estimated_hours = round((pages * 250) / 15000, 1) if pages else None  # 250 words/page, 250 WPM reading
+
+        return {
+            'title': doc.get('title', 'Unknown Title'),
+            'author': ', '.join(doc.get('author_name', [])) if doc.get('author_name') else 'Unknown Author',
+            'year': doc.get('first_publish_year', ''),
+            'key': doc.get('key', ''),
+            'ia_id': ia_id,
+            'download_url': f"https://archive.org/download/{ia_id}/{ia_id}.pdf",
+            'subjects': doc.get('subject', [])[:5] if doc.get('subject') else [],
+            'isbn': doc.get('isbn', [])[:1] if doc.get('isbn') else [],
+            'publisher': publisher,
+            'recent_publish_date': recent_publish,
+            'pages': pages,
+            'estimated_hours': estimated_hours,
+            'cover_url': cover_url,
+            'rating': round(doc.get('ratings_average', 0), 1) if doc.get('ratings_average') else None,
+            'rating_count': doc.get('ratings_count', 0),
+            'first_sentence': first_sentence,
+            'languages': doc.get('language', [])[:3] if doc.get('language') else ['English']
+        }
+
+    @staticmethod
+    def fetch_books_by_keys(keys, batch_size=100):
+        """
+        Look up many works by Open Library key with a few search requests.
+        
+        Keys are resolved in batches of batch_size, one OR query per batch, and
+        the batches run in parallel.
+        
+        Args:
+            keys: Work keys ('/works/OL45804W' or 'OL45804W')
+        
+        Returns:
+            Tuple of (dict of normalized key -> book, or None if the work has no
+            Internet Archive scan; set of keys whose lookup failed)
+        """
+        keys = list(dict.fromkeys(normalize_work_key(key) for key in keys))
+        batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+
+        def fetch(batch):
+            response = http_client.get(
+                "https://openlibrary.org/search.json",
+                params={
+                    'q': 'key:(' + ' OR '.join(f'"{key}"' for key in batch) + ')',
+                    'limit': len(batch),
+                    'fields': OpenLibraryAPI.SEARCH_FIELDS
+                },
+                headers={'User-Agent': 'AudioGen/1.0 (https://github.com/audiobook-app)', 'Accept': 'application/json'},
+                timeout=30
+            )
+            response.raise_for_status()
+            return {doc.get('key'): OpenLibraryAPI.parse_search_doc(doc) for doc in response.json().get('docs', [])}
+
+        books = {}
+        failed = set()
+        if not batches:
+            return books, failed
+        with ThreadPoolExecutor(max_workers=min(4, len(batches))) as executor:
+            for batch, future in [(batch, executor.submit(fetch, batch)) for batch in batches]:
+                try:
+                    found = future.result()
+                except Exception as e:
+                    print(f"❌ Open Library key lookup failed for {len(batch)} works: {e}")
+                    failed.update(batch)
+                    continue
+                for key in batch:
+                    books[key] = found.get(key)
+        return books, failed
+
+    @staticmethod
+    def get_book_details(book_key):
+        """Get detailed book information by book key, served from the preview cache when possible"""
+        try:
+            return preview_cache.get_or_compute(book_key, lambda: OpenLibraryAPI.fetch_book_details(book_key))
         except requests.exceptions.RequestException as e:
             print(f"Network error during book details fetch: {e}")
             return None
@@ -227,97 +406,550 @@ class OpenLibraryAPI:
             print(f"Error fetching book details: {e}")
             return None
 
+    @staticmethod
+    def fetch_book_details(book_key):
+        """
+        Fetch book details from Open Library (raises on upstream errors).
+
+        The requested document is fetched once. At most one related document
+        is requested, and only when the first one lacks something: the work
+        (description, subjects) for an edition key, or a few editions for a
+        work without covers. Which one depends on the first response, so the
+        two requests can't overlap.
+
+        Returns:
+            Details dictionary, or None if Open Library doesn't know the key
+        """
+        headers = {
+            'User-Agent': 'AudioGen/1.0 (https://github.com/audiobook-app)',
+            'Accept': 'application/json'
+        }
+
+        def fetch_json(url, timeout=10):
+            response = http_client.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+
+        def valid_covers(document):
+            return [cover for cover in document.get('covers') or [] if cover and cover > 0]  # -1 marks a removed cover
+
+        book_data = fetch_json(f"https://openlibrary.org{book_key}.json", timeout=15)
+        if book_data is None:
+            return None
+
+        is_work = '/works/' in book_key
+        works_data = book_data if is_work else {}
+
+        editions = None
+        if not is_work and book_data.get('works'):
+            works_data = fetch_json(f"https://openlibrary.org{book_data['works'][0]['key']}.json") or {}
+        elif is_work and not valid_covers(book_data):
+            editions = fetch_json(f"https://openlibrary.org{book_key}/editions.json?limit=5")
+
+        # Extract comprehensive information
+        description = None
+        desc = book_data.get('description') or works_data.get('description')
+        if isinstance(desc, dict):
+            description = desc.get('value', '')
+        elif isinstance(desc, str):
+            description = desc
+
+        # Get cover information, falling back to the first edition that has one
+        covers = valid_covers(book_data) or valid_covers(works_data)
+        if not covers and editions:
+            for edition in editions.get('entries', []):
+                covers = valid_covers(edition)
+                if covers:
+                    break
+        cover_url = f"https://covers.openlibrary.org/b/id/{covers[0]}-L.jpg" if covers else None
+
+        # Extract subjects and genres
+        subjects = book_data.get('subjects') or works_data.get('subjects') or []
+
+        return {
+            'title': book_data.get('title', works_data.get('title', 'Unknown Title')),
+            'description': description,
+            'subjects': subjects[:10] if subjects else [],
+            'cover_url': cover_url,
+            'first_publish_date': book_data.get('first_publish_date', works_data.get('first_publish_date', '')),
+            'key': book_data.get('key', book_key),
+            'revision': book_data.get('revision', 1),
+            'created': book_data.get('created', {}).get('value', ''),
+            'last_modified': book_data.get('last_modified', {}).get('value', '')
+        }
+
+def packed_audio_paths(audiobook_id):
+    """Paths of an audiobook's packed MP3 and its page index"""
+    return (os.path.join(OUTPUT_FOLDER, f"{audiobook_id}.mp3"),
+            os.path.join(OUTPUT_FOLDER, f"{audiobook_id}.index.json"))
+
+def remove_audiobook_files(audiobook_id):
+    """
+    Delete an audiobook's audio: page and chunk files, packed file and index,
+    and the manifest (including partly written files).
+    
+    Returns:
+        Number of files removed
+    """
+    prefix = os.path.join(OUTPUT_FOLDER, glob.escape(audiobook_id))
+    removed = 0
+    for path in glob.glob(f"{prefix}_page_*") + glob.glob(f"{prefix}.*"):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+class ConversionCancelled(Exception):
+    """Raised inside a conversion that was cancelled, at the next page or chunk"""
+
 class AudiobookConverter:
     def __init__(self, audiobook_id, socketio_instance):
         self.audiobook_id = audiobook_id
         self.socketio = socketio_instance
         self.audiobook = Audiobook.query.get(audiobook_id)
         self.log_prefix = f"[AudiobookConverter:{audiobook_id}]"
+        self.total_pages = 0
+        # An earlier, interrupted run's manifest holds the checkpoints to resume from
+        path = manifest_path(OUTPUT_FOLDER, audiobook_id)
+        self.manifest = AudioManifest.load(path) or AudioManifest(path, audiobook_id)
+        self._manifest_saved_at = 0.0
+        self._text_hashes = {}  # page_num -> SHA-256 of the text being synthesized
+        self.resumed_pages = 0
+        self.cancel_event = threading.Event()
+        self.stopped = threading.Event()  # Set once the conversion has returned
+        self.delete_files = False
+        self.progress = ProgressReporter(
+            app, socketio_instance, audiobook_id,
+            db_interval=app.config['PROGRESS_DB_INTERVAL'],
+            emit_interval=app.config['PROGRESS_EMIT_INTERVAL'],
+            log_prefix=self.log_prefix,
+            writer=db_writer,
+            heartbeat_interval=min(60.0, app.config['CONVERSION_STALE_SECONDS'] / 4)
+        )
     
-    def emit_progress(self, status, progress=None, message=""):
-        print(f"{self.log_prefix} {status}: {message}")  # Add logging
-        update = {
-            'status': status,
-            'progress': progress,
-            'message': message,
-            'audiobook_id': self.audiobook_id
-        }
-        self.socketio.emit('conversion_progress', update, room=self.audiobook_id)
+    def cancel(self, delete_files=False):
+        """
+        Ask the conversion to stop at the next page or chunk.
         
-        # Update database
-        if status == 'completed':
-            update_audiobook_progress(self.audiobook_id, status='completed', progress=100)
-        elif status == 'failed':
-            update_audiobook_progress(self.audiobook_id, status='failed', error_message=message)
-        elif progress is not None:
-            update_audiobook_progress(self.audiobook_id, progress=progress)
+        Args:
+            delete_files: The audiobook is being deleted; remove its audio once stopped
+        """
+        self.delete_files = self.delete_files or delete_files
+        self.cancel_event.set()
+    
+    def check_cancelled(self, path=None):
+        """Raise ConversionCancelled if the job was cancelled (removing path first if the book is being deleted)"""
+        if self.cancel_event.is_set():
+            if path and self.delete_files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise ConversionCancelled(f"Conversion of {self.audiobook_id} cancelled")
+    
+    def conversion_cancelled(self):
+        """Report a stopped conversion; finished pages stay as checkpoints unless the book was deleted"""
+        if self.delete_files:
+            removed = remove_audiobook_files(self.audiobook_id)
+            print(f"{self.log_prefix} Removed {removed} files of the deleted audiobook")
+        else:
+            try:
+                self.save_manifest(force=True)
+            except OSError as manifest_error:
+                print(f"{self.log_prefix} Could not save manifest: {manifest_error}")
+        self.emit_progress("cancelled", 0, "Conversion cancelled")
+    
+    def emit_progress(self, status, progress=None, message=""):
+        # Coalesced: most intermediate updates never reach the database or clients
+        self.progress.report(status, progress, message)
         
     def download_pdf(self, url):
+        """
+        Get the source PDF through the shared source cache.
+        
+        The returned path is pinned in the cache; pass it to source_cache.release()
+        when the conversion no longer needs it instead of deleting it.
+        """
         try:
             self.emit_progress("downloading", 10, f"Downloading PDF from {url}")
-            filename = f"{self.audiobook_id}.pdf"
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            with open(filepath, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        file.write(chunk)
+            last_percent = [-1]
+            
+            def on_progress(downloaded, total):
+                # Byte-level callbacks; only report whole-percent changes
+                if not total:
+                    return
+                percent = int(100 * downloaded / total)
+                if percent != last_percent[0]:
+                    last_percent[0] = percent
+                    self.emit_progress("downloading", 10 + 20 * downloaded / total,
+                                       f"Downloaded {downloaded / 1048576:.1f} of {total / 1048576:.1f} MB")
+            
+            filepath = source_cache.acquire(url, on_progress)
             self.emit_progress("downloaded", 30, f"Download complete: {filepath}")
             return filepath
         except Exception as e:
             print(f"{self.log_prefix} Download failed: {e}")
             raise Exception(f"Download failed: {str(e)}")
     
+    def iter_text_pages(self, pdf_path):
+        """
+        Yield {'page_number', 'text'} for each PDF page with text, as soon as it is extracted.
+        
+        Pages that fail to extract are skipped. Sets self.total_pages (and the
+        audiobook's total_pages) before the first page is yielded.
+        """
+        self.total_pages = count_pages(pdf_path)
+        if db_writer:
+            db_writer.submit(update_audiobook_progress, self.audiobook_id, total_pages=self.total_pages)
+        else:
+            update_audiobook_progress(self.audiobook_id, total_pages=self.total_pages)
+        
+        # Large PDFs are sharded across extraction processes, small ones stay in-process
+        workers = app.config['EXTRACT_PROCESS_WORKERS']
+        if self.total_pages < app.config['EXTRACT_PROCESS_MIN_PAGES']:
+            workers = 1
+        
+        extracted = 0
+        for page_number, text, error in iter_page_texts(pdf_path, self.total_pages, workers, app.config['EXTRACT_SHARD_SIZE']):
+            if error:
+                print(f"{self.log_prefix} Failed to extract page {page_number}: {error}")
+                continue
+            if text and text.strip():
+                extracted += 1
+                yield {
+                    'page_number': page_number,
+                    'text': text.strip()
+                }
+        if not extracted:
+            raise Exception("No text extracted from PDF. Conversion aborted.")
+    
+    def iter_clean_pages(self, pdf_path):
+        """
+        iter_text_pages with the text cleaned for synthesis (TEXT_CLEANING).
+        
+        Headers, footers, page numbers and boilerplate pages are removed; the
+        characters saved are recorded in the manifest once the last page is out.
+        """
+        if not app.config['TEXT_CLEANING']:
+            yield from self.iter_text_pages(pdf_path)
+            return
+        
+        cleaner = TextCleaner(window=app.config['TEXT_CLEANING_WINDOW'],
+                              min_repeats=app.config['TEXT_CLEANING_MIN_REPEATS'])
+        cleaned = 0
+        for page_data in cleaner.clean_pages(self.iter_text_pages(pdf_path)):
+            cleaned += 1
+            yield page_data
+        
+        stats = cleaner.get_stats()
+        self.manifest.set_text_stats(stats)
+        record_totals(stats)
+        print(f"{self.log_prefix} Text cleaning saved {stats['chars_saved']} of {stats['chars_in']} characters "
+              f"({stats['percent_saved']}%), dropped {stats['pages_dropped']} pages")
+        if not cleaned:
+            raise Exception("No text left after cleaning the PDF. Conversion aborted.")
+    
     def extract_text(self, pdf_path):
         try:
             self.emit_progress("extracting", 40, f"Extracting text from {pdf_path}")
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                total_pages = len(pdf_reader.pages)
-                update_audiobook_progress(self.audiobook_id, total_pages=total_pages)
-                text_pages = []
-                for i, page in enumerate(pdf_reader.pages):
-                    try:
-                        text = page.extract_text()
-                        if text and text.strip():
-                            text_pages.append({
-                                'page_number': i + 1,
-                                'text': text.strip()
-                            })
-                    except Exception as e:
-                        print(f"{self.log_prefix} Failed to extract page {i+1}: {e}")
-                        continue
-                    progress = 40 + (i / total_pages) * 20
-                    self.emit_progress("extracting", progress, f"Extracted page {i + 1} of {total_pages}")
-                self.emit_progress("extracted", 60, f"Text extraction complete! {len(text_pages)} pages processed.")
-                if not text_pages:
-                    raise Exception("No text extracted from PDF. Conversion aborted.")
-                return text_pages
+            text_pages = []
+            for page_data in self.iter_clean_pages(pdf_path):
+                text_pages.append(page_data)
+                progress = 40 + (page_data['page_number'] / self.total_pages) * 20
+                self.emit_progress("extracting", progress, f"Extracted page {page_data['page_number']} of {self.total_pages}")
+            self.emit_progress("extracted", 60, f"Text extraction complete! {len(text_pages)} pages processed.")
+            return text_pages
         except Exception as e:
             print(f"{self.log_prefix} Text extraction failed: {e}")
             raise Exception(f"Text extraction failed: {str(e)}")
     
+    def stream_to_audio(self, pdf_path, voice_engine, voice_settings):
+        """
+        Extract and synthesize in one pass: each page goes to TTS as soon as it is
+        extracted, so early pages are playable long before the book is parsed and
+        only the pages in flight are held in memory.
+        """
+        self.emit_progress("extracting", 40, f"Extracting text from {pdf_path}")
+        return self.convert_to_audio(self.iter_clean_pages(pdf_path), voice_engine, voice_settings)
+    
+    def emit_chunk_ready(self, page_num, chunk_index, total_chunks):
+        """Tell listeners a chunk can be played before the rest of its page is done"""
+        self.socketio.emit('chunk_ready', {
+            'audiobook_id': self.audiobook_id,
+            'page': page_num,
+            'chunk': chunk_index,
+            'total_chunks': total_chunks,
+            'stream_url': f'/api/audiobook/{self.audiobook_id}/stream/{page_num}/chunk/{chunk_index}'
+        }, room=self.audiobook_id)
+    
+    def audio_path(self, page_num, chunk_index=None):
+        """Output path for a page (or one chunk of it), using the names the stream routes serve"""
+        if chunk_index is None:
+            filename = f"{self.audiobook_id}_page_{page_num:03d}.mp3"
+        else:
+            filename = f"{self.audiobook_id}_page_{page_num:03d}_chunk_{chunk_index:02d}.mp3"
+        return os.path.join(OUTPUT_FOLDER, filename)
+    
     def convert_to_audio(self, text_pages, voice_engine, voice_settings):
+        """
+        Synthesize pages from a list or a generator, several at a time.
+        
+        With TTS_CHUNK_CHARS set, each page is split at sentence boundaries and
+        its chunks are synthesized concurrently as separate files, so the first
+        chunk is playable before the page is finished. At most
+        TTS_PAGE_CONCURRENCY chunks are in flight. Returns the audio file paths
+        in page (and chunk) order.
+        """
+        try:
+            self.emit_progress("converting", 60, "Starting audio conversion...")
+            self.begin_checkpoints(voice_engine, voice_settings)
+            if isinstance(text_pages, list):
+                self.total_pages = len(text_pages)
+            page_chunks = {}   # page_num -> list of chunk paths (None until synthesized)
+            audio_files = {}   # page_num -> list of paths, once the whole page is done
+            in_flight = {}
+            
+            concurrency = max(1, app.config['TTS_PAGE_CONCURRENCY'])
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                
+                def collect():
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page_num, chunk_index = in_flight.pop(future)
+                        self.record_chunk(page_chunks, audio_files, page_num, chunk_index, future.result())
+                
+                try:
+                    for page_num, page_data in enumerate(text_pages, start=1):
+                        self.check_cancelled()
+                        chunks = self.page_chunks(page_data['text'])
+                        resumed = self.checkpoint_page(page_num, page_data['text'], len(chunks))
+                        if resumed:
+                            self.resume_page(audio_files, page_num, resumed)
+                            continue
+                        page_chunks[page_num] = [None] * len(chunks)
+                        for chunk_index, chunk_text in chunks:
+                            while len(in_flight) >= concurrency:
+                                collect()
+                            self.check_cancelled()
+                            future = executor.submit(self.synthesize_page, chunk_text, voice_engine, voice_settings, page_num, chunk_index)
+                            in_flight[future] = (page_num, chunk_index)
+                    while in_flight:
+                        collect()
+                except Exception:
+                    for future in in_flight:
+                        future.cancel()
+                    raise
+            
+            return self.finish_audio(audio_files)
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            self.audio_failed(e)
+            raise
+
+    async def convert_to_audio_async(self, text_pages, voice_engine, voice_settings):
+        """
+        Event-loop version of convert_to_audio (CONVERSION_ENGINE=async).
+        
+        Takes an async iterator of pages. Chunks are synthesized on the async
+        engine's shared I/O threads instead of a pool per book; at most
+        TTS_PAGE_CONCURRENCY chunks of this book are in flight.
+        """
         try:
-            self.emit_progress("converting", 65, "Starting audio conversion...")
-            audio_files = []
-            total_pages = len(text_pages)
-            for i, page_data in enumerate(text_pages):
-                page_num = i + 1
-                audio_path = os.path.join(OUTPUT_FOLDER, f"{self.audiobook_id}_page_{page_num}.mp3")
-                self.generate_audio(page_data['text'], voice_engine, voice_settings, page_num, audio_path)
+            await async_engine.run_io(self.emit_progress, "converting", 60, "Starting audio conversion...")
+            await async_engine.run_io(self.begin_checkpoints, voice_engine, voice_settings)
+            page_chunks = {}
+            audio_files = {}
+            slots = asyncio.Semaphore(max(1, app.config['TTS_PAGE_CONCURRENCY']))
+            record_lock = asyncio.Lock()  # record_chunk updates page_chunks/audio_files
+            tasks = set()
+            errors = []
+            
+            async def synthesize(page_num, chunk_index, chunk_text):
+                try:
+                    path = await async_engine.run_io(self.synthesize_page, chunk_text, voice_engine, voice_settings, page_num, chunk_index)
+                    async with record_lock:
+                        await async_engine.run_cpu(self.record_chunk, page_chunks, audio_files, page_num, chunk_index, path)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    slots.release()
+            
+            try:
+                page_num = 0
+                async for page_data in text_pages:
+                    page_num += 1
+                    self.check_cancelled()
+                    chunks = self.page_chunks(page_data['text'])
+                    resumed = await async_engine.run_cpu(self.checkpoint_page, page_num, page_data['text'], len(chunks))
+                    if resumed:
+                        async with record_lock:
+                            await async_engine.run_io(self.resume_page, audio_files, page_num, resumed)
+                        continue
+                    page_chunks[page_num] = [None] * len(chunks)
+                    for chunk_index, chunk_text in chunks:
+                        await slots.acquire()
+                        if errors:
+                            raise errors[0]
+                        self.check_cancelled()
+                        task = asyncio.ensure_future(synthesize(page_num, chunk_index, chunk_text))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                if tasks:
+                    await asyncio.wait(set(tasks))
+                if errors:
+                    raise errors[0]
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            
+            return await async_engine.run_cpu(self.finish_audio, audio_files)
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            await async_engine.run_io(self.audio_failed, e)
+            raise
+
+    def page_chunks(self, text):
+        """Split page text into (chunk_index, text) pieces; chunk_index is None for whole pages"""
+        chunk_chars = app.config['TTS_CHUNK_CHARS']
+        if chunk_chars > 0:
+            return list(enumerate(self.split_page_into_chunks(text, chunk_chars)))
+        return [(None, text)]
+
+    def begin_checkpoints(self, voice_engine, voice_settings):
+        """Start the manifest for this run, keeping pages an interrupted run made with the same settings"""
+        synthesis_key = hashlib.sha256(json.dumps({
+            'engine': voice_engine,
+            'settings': voice_settings,
+            'chunk_chars': app.config['TTS_CHUNK_CHARS']
+        }, sort_keys=True).encode()).hexdigest()
+        kept = self.manifest.begin(synthesis_key)
+        if kept:
+            print(f"{self.log_prefix} Resuming: {kept} pages already synthesized")
+
+    def checkpoint_page(self, page_num, text, chunk_count):
+        """Record an extracted page; returns its audio paths if an earlier run already synthesized it"""
+        text_sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        self._text_hashes[page_num] = text_sha256
+        self.manifest.set_extracted(page_num, text_sha256)
+        return self.manifest.reusable_page(page_num, text_sha256, chunk_count)
+
+    def resume_page(self, audio_files, page_num, paths):
+        """Count a page synthesized by an earlier run as done"""
+        audio_files[page_num] = paths
+        self.resumed_pages += 1
+        total = max(self.total_pages, len(audio_files))
+        self.emit_progress("converting", int(60 + 35*len(audio_files)/total), f"Resumed page {page_num} from checkpoint ({len(audio_files)}/{total})")
+
+    def record_chunk(self, page_chunks, audio_files, page_num, chunk_index, path):
+        """Store a synthesized chunk; when its page is complete, add it to the manifest and report progress"""
+        chunks = page_chunks[page_num]
+        chunks[chunk_index or 0] = path
+        if chunk_index is not None:
+            self.emit_chunk_ready(page_num, chunk_index, len(chunks))
+        if all(chunks):
+            audio_files[page_num] = page_chunks.pop(page_num)
+            self.manifest.add_page(page_num, audio_files[page_num], self._text_hashes.get(page_num))
+            self.save_manifest()
+            total = max(self.total_pages, len(audio_files))
+            self.emit_progress("converting", int(60 + 35*len(audio_files)/total), f"Converted page {page_num} ({len(audio_files)}/{total})")
+
+    def finish_audio(self, audio_files):
+        """Pack the pages if configured, save the manifest and report completion; returns the audio paths"""
+        paths = [path for page_num in sorted(audio_files) for path in audio_files[page_num]]
+        if app.config['AUDIO_OUTPUT_FORMAT'] in ('packed', 'both'):
+            paths = self.pack_audio(audio_files)
+        self.save_manifest(force=True)
+        
+        message = "Conversion complete!"
+        if self.resumed_pages:
+            message += f" Resumed {self.resumed_pages} pages from an earlier run."
+        if self.manifest.text_stats:
+            message += f" Text cleaning saved {self.manifest.text_stats['chars_saved']} characters."
+        self.emit_progress("completed", 100, message)
+        return paths
+
+    def audio_failed(self, error):
+        """Log a failed synthesis and keep the finished pages; run_conversion reports the failure"""
+        print(f"{self.log_prefix} Audio conversion failed: {error}")
+        try:
+            self.save_manifest(force=True)  # Pages that did finish stay listed
+        except OSError as manifest_error:
+            print(f"{self.log_prefix} Could not save manifest: {manifest_error}")
+
+    def save_manifest(self, force=False):
+        """Write the audio manifest, at most once a second unless forced"""
+        now = time.monotonic()
+        if force or now - self._manifest_saved_at >= 1.0:
+            self._manifest_saved_at = now
+            self.manifest.save()
+
+    def pack_audio(self, audio_files):
+        """
+        Concatenate the page audio into one seekable MP3 with a page index.
+        
+        In 'packed' mode the per-page files are removed afterwards.
+        
+        Args:
+            audio_files: Dictionary of page number -> chunk paths in order
+        
+        Returns:
+            List with the packed file path
+        """
+        self.emit_progress("converting", 96, "Packing audio into a single file...")
+        pack_path, index_path = packed_audio_paths(self.audiobook_id)
+        index = audio_pack.pack_pages(
+            ((page_num, audio_files[page_num]) for page_num in sorted(audio_files)),
+            pack_path, index_path
+        )
+        self.manifest.set_packed(index)
+        print(f"{self.log_prefix} Packed {len(index['pages'])} pages ({index['bytes']} bytes, {index['duration']:.0f}s) into {pack_path}")
+        
+        if app.config['AUDIO_OUTPUT_FORMAT'] == 'packed':
+            for paths in audio_files.values():
+                for path in paths:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        return [pack_path]
+
+    def synthesize_page(self, text, voice_engine, voice_settings, page_num, chunk_index=None):
+        """Synthesize one page (or chunk), retrying just that piece if the TTS call fails"""
+        audio_path = self.audio_path(page_num, chunk_index)
+        retries = max(0, app.config['TTS_PAGE_RETRIES'])
+        
+        # Identical text with the same voice was already synthesized: reuse the file
+        cache_key = TTSCache.make_key(text, voice_engine, voice_settings) if tts_cache else None
+        if cache_key and tts_cache.get(cache_key, audio_path):
+            return audio_path
+        
+        for attempt in range(retries + 1):
+            try:
+                with tts_semaphore:
+                    self.check_cancelled()
+                    self.generate_audio(text, voice_engine, voice_settings, page_num, audio_path)
+                self.check_cancelled(audio_path)
                 if not os.path.exists(audio_path):
                     print(f"{self.log_prefix} Audio file not created: {audio_path}")
                     raise Exception(f"Audio file not created for page {page_num}")
-                audio_files.append(audio_path)
-                self.emit_progress("converting", int(65 + 30*(i+1)/total_pages), f"Converted page {page_num}/{total_pages}")
-            self.emit_progress("completed", 100, "Conversion complete!")
-            return audio_files
-        except Exception as e:
-            print(f"{self.log_prefix} Audio conversion failed: {e}")
-            self.emit_progress("failed", 0, str(e))
-            raise
+                if cache_key:
+                    tts_cache.put(cache_key, audio_path)
+                return audio_path
+            except ConversionCancelled:
+                raise
+            except Exception as e:
+                if attempt >= retries:
+                    raise
+                delay = 2 ** attempt
+                print(f"{self.log_prefix} Page {page_num} failed ({e}), retrying in {delay}s")
+                self.cancel_event.wait(delay)
 
     def split_page_into_chunks(self, text, max_chunk_size=500):
         """Split text into smaller chunks at sentence boundaries for better audio streaming"""
@@ -350,16 +982,324 @@ class AudiobookConverter:
             if not text.strip():
                 print(f"{self.log_prefix} Empty text for page {page_number}, skipping audio generation.")
                 return
-            if voice_engine == 'gtts':
-                from gtts import gTTS
-                tts = gTTS(text, lang=voice_settings.get('language', 'en'))
-                tts.save(audio_path)
-                print(f"{self.log_prefix} Saved audio: {audio_path}")
-            # ...add pyttsx3/OpenAI support as needed...
+            audio = tts_engines.get(voice_engine).synthesize(text, voice_settings)
+            # Write aside and rename so a cached hard link to audio_path is never truncated
+            tmp_path = f"{audio_path}.part"
+            with open(tmp_path, 'wb') as file:
+                file.write(audio)
+            os.replace(tmp_path, audio_path)
+            print(f"{self.log_prefix} Saved audio: {audio_path}")
         except Exception as e:
             print(f"{self.log_prefix} Failed to generate audio for page {page_number}: {e}")
             raise
 
+def prepare_conversion(audiobook_id):
+    """
+    Load a claimed audiobook, build its converter and register it in
+    active_conversions; None if it was deleted or cancelled in the meantime.
+    """
+    audiobook = Audiobook.query.get(audiobook_id)
+    if not audiobook:
+        return None
+    previous = active_conversions.get(audiobook_id)
+    if previous:
+        # A cancelled run of this book may still be finishing its last chunk
+        previous.stopped.wait(60)
+    converter = AudiobookConverter(audiobook_id, socketio)
+    active_conversions[audiobook_id] = converter
+    # A cancel that came in before registration only changed the database
+    if get_audiobook_statuses([audiobook_id]).get(audiobook_id) != 'processing':
+        conversion_stopped(converter)
+        return None
+    return converter, audiobook.source_url, audiobook.voice_engine, audiobook.get_voice_settings()
+
+def conversion_stopped(converter):
+    """Take a finished converter out of active_conversions (unless a newer run replaced it)"""
+    if active_conversions.get(converter.audiobook_id) is converter:
+        active_conversions.pop(converter.audiobook_id, None)
+    converter.stopped.set()
+
+def run_conversion(audiobook_id):
+    """Run a full conversion for a queued audiobook (called by scheduler workers)"""
+    job = prepare_conversion(audiobook_id)
+    if not job:
+        return
+    converter, source_url, voice_engine, voice_settings = job
+    
+    try:
+        converter.emit_progress('processing', 0, 'Starting conversion...')
+        # Download PDF (or reuse the cached copy)
+        pdf_path = converter.download_pdf(source_url)
+        try:
+            # Extract text and convert to audio page by page
+            converter.check_cancelled()
+            converter.stream_to_audio(pdf_path, voice_engine, voice_settings)
+        finally:
+            # Leave the PDF in the cache for the next conversion of this book
+            source_cache.release(pdf_path)
+    except ConversionCancelled:
+        converter.conversion_cancelled()
+    except Exception as e:
+        # The one place a failed conversion is reported, whichever step failed
+        converter.emit_progress('failed', 0, str(e))
+    finally:
+        conversion_stopped(converter)
+
+async def run_conversion_async(audiobook_id):
+    """Event-loop version of run_conversion: blocking steps go to the async engine's executors"""
+    job = await async_engine.run_io(prepare_conversion, audiobook_id)
+    if not job:
+        return
+    converter, source_url, voice_engine, voice_settings = job
+    
+    try:
+        await async_engine.run_io(converter.emit_progress, 'processing', 0, 'Starting conversion...')
+        pdf_path = await async_engine.run_io(converter.download_pdf, source_url)
+        try:
+            converter.check_cancelled()
+            await async_engine.run_io(converter.emit_progress, "extracting", 40, f"Extracting text from {pdf_path}")
+            pages = async_engine.iterate(converter.iter_clean_pages(pdf_path))
+            await converter.convert_to_audio_async(pages, voice_engine, voice_settings)
+        finally:
+            source_cache.release(pdf_path)
+    except ConversionCancelled:
+        await async_engine.run_io(converter.conversion_cancelled)
+    except Exception as e:
+        await async_engine.run_io(converter.emit_progress, 'failed', 0, str(e))
+    finally:
+        conversion_stopped(converter)
+
+def start_async_conversion(audiobook_id):
+    """Scheduler job for the async engine: starts the conversion and returns its Future"""
+    return async_engine.submit(run_conversion_async, audiobook_id)
+
+def cancel_conversion(audiobook_id, delete_files=False):
+    """
+    Stop an audiobook's conversion in this process: drop it from the queue, or
+    tell its running converter to stop at the next page or chunk.
+    
+    The database status is changed by the caller (cancel_audiobook_conversion
+    or deleting the audiobook); worker nodes pick that up on their next poll.
+    
+    Args:
+        audiobook_id: Audiobook whose conversion to stop
+        delete_files: The audiobook is being deleted; the converter removes its audio once stopped
+    
+    Returns:
+        True if a queued or running job was found here
+    """
+    dequeued = conversion_scheduler.cancel(audiobook_id)
+    converter = active_conversions.get(audiobook_id)
+    if converter:
+        converter.cancel(delete_files)
+    return dequeued or converter is not None
+
+# Bounded worker pool for conversions; restores persisted 'queued' jobs (and
+# requeues 'processing' ones a crash interrupted) on start.
+# Web-only nodes just persist jobs, worker nodes pull them from the database.
+if app.config['NODE_ROLE'] == 'web':
+    conversion_scheduler = DatabaseQueue(app, max_queue=app.config['CONVERSION_QUEUE_SIZE'])
+elif async_engine:
+    # Books are coroutines; one dispatch thread hands them to the event loop
+    conversion_scheduler = ConversionScheduler(
+        app, start_async_conversion,
+        workers=app.config['ASYNC_MAX_BOOKS'],
+        max_queue=app.config['CONVERSION_QUEUE_SIZE'],
+        poll_interval=app.config['WORKER_POLL_INTERVAL'] if app.config['NODE_ROLE'] == 'worker' else 0,
+        dispatch_threads=1,
+        stale_after=app.config['CONVERSION_STALE_SECONDS'],
+        cancel_job=cancel_conversion
+    )
+else:
+    conversion_scheduler = ConversionScheduler(
+        app, run_conversion,
+        workers=app.config['CONVERSION_WORKERS'],
+        max_queue=app.config['CONVERSION_QUEUE_SIZE'],
+        poll_interval=app.config['WORKER_POLL_INTERVAL'] if app.config['NODE_ROLE'] == 'worker' else 0,
+        stale_after=app.config['CONVERSION_STALE_SECONDS'],
+        cancel_job=cancel_conversion
+    )
+
+# PDF extraction processes (forkserver/spawn) re-run the main script as
+# __mp_main__; only the real app process may restore and run queued jobs
+if __name__ != '__mp_main__':
+    conversion_scheduler.start()
+
+def global_stats_cached():
+    """Global library stats, recomputed at most once per STATS_CACHE_TTL"""
+    def compute():
+        # Stale entries are refreshed on a background thread, outside the request's app context
+        with app.app_context():
+            return get_global_stats()
+    return stats_cache.get_or_compute('global', compute)
+
+def enqueue_conversion(audiobook, voice_engine, voice_settings):
+    """
+    Persist an audiobook as queued and hand it to the conversion scheduler.
+    
+    Returns:
+        int: 1-based queue position
+    
+    Raises:
+        QueueFullError: if the queue is full (the audiobook keeps its previous status)
+    """
+    previous_status = audiobook.status
+    enqueue_audiobook(audiobook.id, voice_engine, voice_settings)
+    try:
+        return conversion_scheduler.submit(audiobook.id, audiobook.user_id)
+    except QueueFullError:
+        update_audiobook_progress(audiobook.id, status=previous_status)
+        raise
+
+def enqueue_conversions(jobs, voice_engine, voice_settings):
+    """
+    Queue many conversions with one UPDATE and one scheduler call.
+    
+    Jobs already queued or processing are reported with their current position.
+    Jobs that don't fit in the queue are left as they are; any the scheduler
+    still rejects (another request took the free slots) get their previous
+    status back.
+    
+    Args:
+        jobs: List of (audiobook_id, user_id, current_status)
+    
+    Returns:
+        Dictionary of audiobook ID -> {'status': 'queued' | 'in_progress' |
+        'queue_full' | 'failed', 'queue_position': int or None}
+    """
+    results = {}
+    pending = []
+    for audiobook_id, user_id, status in jobs:
+        if status in ('queued', 'processing'):
+            results[audiobook_id] = {'status': 'in_progress', 'queue_position': conversion_scheduler.position(audiobook_id)}
+        else:
+            pending.append((audiobook_id, user_id, status))
+    
+    slots = conversion_scheduler.free_slots()
+    accepted, overflow = pending[:slots], pending[slots:]
+    for audiobook_id, _, _ in overflow:
+        results[audiobook_id] = {'status': 'queue_full', 'queue_position': None}
+    if not accepted:
+        return results
+    
+    if not enqueue_audiobooks_bulk([job[0] for job in accepted], voice_engine, voice_settings):
+        for audiobook_id, _, _ in accepted:
+            results[audiobook_id] = {'status': 'failed', 'queue_position': None}
+        return results
+    
+    positions, rejected = conversion_scheduler.submit_many((job[0], job[1]) for job in accepted)
+    previous_status = {job[0]: job[2] for job in accepted}
+    restore = {}
+    for audiobook_id in rejected:
+        restore.setdefault(previous_status[audiobook_id], []).append(audiobook_id)
+        results[audiobook_id] = {'status': 'queue_full', 'queue_position': None}
+    for status, audiobook_ids in restore.items():
+        set_audiobooks_status(audiobook_ids, status)
+    for audiobook_id, position in positions.items():
+        results[audiobook_id] = {'status': 'queued', 'queue_position': position}
+    return results
+
+def unavailable_engine_response(voice_engine):
+    """Build a 400 response if a voice engine can't run here, otherwise None"""
+    if tts_engines.is_available(voice_engine):
+        return None
+    return jsonify({'success': False, 'message': f"Voice engine '{voice_engine}' is not available"}), 400
+
+def batch_too_large_response(count):
+    return jsonify({
+        'success': False,
+        'message': f"At most {app.config['BATCH_MAX_BOOKS']} books per request ({count} sent)"
+    }), 413
+
+def queue_full_response(error, audiobook_id=None):
+    """Build the 429 backpressure response for a full conversion queue"""
+    response = jsonify({
+        'success': False,
+        'message': 'Conversion queue is full, please try again shortly',
+        'queue_length': error.queue_length,
+        'queue_position': error.queue_length + 1,
+        'audiobook_id': audiobook_id
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = '30'
+    return response
+
+def audio_etag(path=None, data=None):
+    """Strong ETag from the SHA-256 of a file (cached per file version) or of in-memory audio"""
+    if data is not None:
+        return hashlib.sha256(data).hexdigest()[:32]
+    
+    stat = os.stat(path)
+    key = f"{path}:{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+    entry = audio_etags.get(key)
+    if entry:
+        return entry[0]
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    etag = digest.hexdigest()[:32]
+    audio_etags.set(key, etag, time.time())
+    return etag
+
+def send_audio(path=None, data=None, completed=False, private=True, as_attachment=False, download_name=None):
+    """
+    Send an MP3 file (or in-memory MP3 data) with Range and conditional request support.
+    
+    Range requests get 206 partial content, If-None-Match / If-Range are checked
+    against a strong content-hash ETag, and matching revalidations get 304.
+    Audio of completed books can't change, so it is cached by the browser for
+    AUDIO_CACHE_MAX_AGE; audio of books still converting must be revalidated.
+    
+    Args:
+        path: Audio file path
+        data: Audio bytes (instead of path)
+        completed: Whether the audiobook has finished converting
+        private: Only the requesting user may cache the response
+        as_attachment: Send as a download
+        download_name: File name for downloads and in-memory data
+    """
+    etag = audio_etag(path, data)
+    source = os.path.abspath(path) if path is not None else io.BytesIO(data)
+    try:
+        response = send_file(
+            source, mimetype='audio/mpeg', as_attachment=as_attachment, download_name=download_name,
+            conditional=True, etag=etag, max_age=app.config['AUDIO_CACHE_MAX_AGE'] if completed else None
+        )
+    except RequestedRangeNotSatisfiable as e:
+        return e.get_response()  # 416, so the routes' generic error handling doesn't turn it into a 500
+    
+    if completed:
+        response.cache_control.immutable = True
+        if private:
+            response.cache_control.public = False
+            response.cache_control.private = True
+    return response
+
+def send_packed_page(audiobook_id, page=None, seconds=None, completed=False, private=True, as_attachment=False):
+    """
+    Serve one page of a packed audiobook, optionally starting at a time position.
+    
+    Returns:
+        Response, or None if the audiobook has no packed output or no such page
+    """
+    pack_path, index_path = packed_audio_paths(audiobook_id)
+    index = audio_pack.load_index(index_path)
+    if not index or not os.path.exists(pack_path):
+        return None
+    
+    entry = audio_pack.find_page(index, page) if page is not None else audio_pack.find_time(index, seconds)
+    if not entry or not entry['length']:
+        return None
+    
+    data, start = audio_pack.read_page(pack_path, entry, seconds)
+    response = send_audio(data=data, completed=completed, private=private, as_attachment=as_attachment,
+                          download_name=f"{audiobook_id}_page_{entry['page']:03d}.mp3")
+    response.headers['X-Audio-Page'] = str(entry['page'])
+    response.headers['X-Audio-Start'] = str(start)
+    return response
+
 # Routes
 @app.route('/')
 def index():
@@ -379,8 +1319,11 @@ def register():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    audiobooks = get_user_audiobooks(current_user.id)
-    return render_template('dashboard.html', audiobooks=audiobooks)
+    # Only the first page is rendered; the rest is fetched by "Load more"
+    audiobooks, next_cursor = get_user_audiobooks_page(current_user.id, limit=app.config['AUDIOBOOKS_PAGE_SIZE'])
+    status_counts = count_by_status(current_user.id)
+    return render_template('dashboard.html', audiobooks=audiobooks, next_cursor=next_cursor,
+                           status_counts=status_counts, total_audiobooks=sum(status_counts.values()))
 
 @app.route('/api/register', methods=['POST'])
 def api_register():
@@ -458,7 +1401,15 @@ def start_conversion():
         voice_engine = data['voice_engine']
         voice_settings = data['voice_settings']
         
-        # Create audiobook record
+        unavailable = unavailable_engine_response(voice_engine)
+        if unavailable:
+            return unavailable
+        
+        # Reject early instead of creating a record we can't schedule
+        if conversion_scheduler.is_full():
+            return queue_full_response(QueueFullError(conversion_scheduler.queue_length()))
+        
+        # Create audiobook record (kept in the collection if the queue rejects it)
         audiobook = create_audiobook(
             user_id=current_user.id,
             title=book['title'],
@@ -466,38 +1417,21 @@ def start_conversion():
             voice_engine=voice_engine,
             voice_settings=voice_settings,
             source_type='search',  # Since we're using Open Library search
-            source_url=book.get('download_url')
+            source_url=book.get('download_url'),
+            status='saved'
         )
         
-        # Start conversion in background
-        def run_conversion():
-            from app_simple import app  # Ensure app is imported here if needed
-            with app.app_context():
-                converter = AudiobookConverter(audiobook.id, socketio)
-                try:
-                    converter.emit_progress('processing', 0, 'Starting conversion...')
-                    # Download PDF
-                    pdf_path = converter.download_pdf(book['download_url'])
-                    
-                    # Extract text
-                    text_pages = converter.extract_text(pdf_path)
-                    
-                    # Convert to audio
-                    audio_files = converter.convert_to_audio(text_pages, voice_engine, voice_settings)
-                    
-                    # Clean up
-                    if os.path.exists(pdf_path):
-                        os.remove(pdf_path)
-                        
-                except Exception as e:
-                    converter.emit_progress("failed", 0, str(e))
-        
-        threading.Thread(target=run_conversion).start()
+        # Queue conversion for the background workers
+        try:
+            position = enqueue_conversion(audiobook, voice_engine, voice_settings)
+        except QueueFullError as e:
+            return queue_full_response(e, audiobook.id)
         
         return jsonify({
             'success': True,
             'conversion_id': audiobook.id,
-            'message': 'Conversion started'
+            'queue_position': position,
+            'message': 'Conversion queued'
         })
         
     except Exception as e:
@@ -506,8 +1440,37 @@ def start_conversion():
 @app.route('/api/audiobooks')
 @login_required
 def get_audiobooks():
-    audiobooks = get_user_audiobooks(current_user.id)
-    return jsonify({'audiobooks': [book.to_dict() for book in audiobooks]})
+    """
+    List the user's audiobooks, newest first, one page at a time.
+    
+    Query parameters:
+        limit: Page size (default AUDIOBOOKS_PAGE_SIZE, at most AUDIOBOOKS_MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous response
+        status: Comma-separated statuses to include
+        fields: Comma-separated fields to return (default: all)
+    """
+    limit = request.args.get('limit', app.config['AUDIOBOOKS_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, app.config['AUDIOBOOKS_MAX_PAGE_SIZE']))
+    statuses = [status for status in request.args.get('status', '').split(',') if status] or None
+    fields = [field for field in request.args.get('fields', '').split(',') if field] or None
+    
+    unknown = [field for field in fields or [] if field not in AUDIOBOOK_FIELDS]
+    if unknown:
+        return jsonify({'success': False, 'message': f"Unknown fields: {', '.join(unknown)}"}), 400
+    
+    try:
+        audiobooks, next_cursor = get_user_audiobooks_page(
+            current_user.id, limit=limit, cursor=request.args.get('cursor'),
+            statuses=statuses, fields=fields
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    return jsonify({
+        'audiobooks': [book.to_dict(fields) for book in audiobooks],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    })
 
 @app.route('/api/audiobook/<audiobook_id>/download/<int:page>')
 @login_required
@@ -517,11 +1480,12 @@ def download_audio_page(audiobook_id, page):
         if not audiobook:
             return jsonify({'error': 'Audiobook not found'}), 404
         
+        completed = audiobook.status == 'completed'
         file_path = os.path.join(OUTPUT_FOLDER, f"{audiobook_id}_page_{page:03d}.mp3")
         if not os.path.exists(file_path):
-            return jsonify({'error': 'Audio file not found'}), 404
+            return send_packed_page(audiobook_id, page, completed=completed, as_attachment=True) or (jsonify({'error': 'Audio file not found'}), 404)
         
-        return send_file(file_path, as_attachment=True)
+        return send_audio(file_path, completed=completed, as_attachment=True)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -534,17 +1498,20 @@ def stream_audio_page(audiobook_id, page):
         if not audiobook:
             return jsonify({'error': 'Audiobook not found'}), 404
         
+        completed = audiobook.status == 'completed'
+        
         # Try to find the single page file first (for backward compatibility)
         file_path = os.path.join(OUTPUT_FOLDER, f"{audiobook_id}_page_{page:03d}.mp3")
         if os.path.exists(file_path):
-            return send_file(file_path, mimetype='audio/mpeg', as_attachment=False)
+            return send_audio(file_path, completed=completed)
         
         # If single file doesn't exist, look for chunked files and return the first chunk
         chunk_path = os.path.join(OUTPUT_FOLDER, f"{audiobook_id}_page_{page:03d}_chunk_00.mp3")
         if os.path.exists(chunk_path):
-            return send_file(chunk_path, mimetype='audio/mpeg', as_attachment=False)
+            return send_audio(chunk_path, completed=completed)
         
-        return jsonify({'error': 'Audio file not found'}), 404
+        # Packed output: the whole page from the single file
+        return send_packed_page(audiobook_id, page, completed=completed) or (jsonify({'error': 'Audio file not found'}), 404)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -562,7 +1529,7 @@ def stream_audio_chunk(audiobook_id, page, chunk):
         if not os.path.exists(file_path):
             return jsonify({'error': 'Audio chunk not found'}), 404
         
-        return send_file(file_path, mimetype='audio/mpeg', as_attachment=False)
+        return send_audio(file_path, completed=audiobook.status == 'completed')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -570,56 +1537,137 @@ def stream_audio_chunk(audiobook_id, page, chunk):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/audiobook/<audiobook_id>/packed')
+@login_required
+def stream_packed_audio(audiobook_id):
+    """
+    Stream a packed audiobook (AUDIO_OUTPUT_FORMAT 'packed' or 'both').
+    
+    Without parameters the whole file is served with Range support, so players
+    can seek anywhere. With ?page=N only that page is served, and with ?t=S
+    the page playing at S seconds from the frame playing then.
+    """
+    try:
+        audiobook = Audiobook.query.filter_by(id=audiobook_id, user_id=current_user.id).first()
+        if not audiobook:
+            return jsonify({'error': 'Audiobook not found'}), 404
+        
+        completed = audiobook.status == 'completed'
+        page = request.args.get('page', type=int)
+        seconds = request.args.get('t', type=float)
+        if page is not None or seconds is not None:
+            return send_packed_page(audiobook_id, page, seconds, completed=completed) or (jsonify({'error': 'Position not found'}), 404)
+        
+        pack_path, _ = packed_audio_paths(audiobook_id)
+        if not os.path.exists(pack_path):
+            return jsonify({'error': 'Packed audio not found'}), 404
+        return send_audio(pack_path, completed=completed)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/audiobook/<audiobook_id>/packed/index')
+@login_required
+def get_packed_index(audiobook_id):
+    """Get the page byte offsets and durations of a packed audiobook"""
+    audiobook = Audiobook.query.filter_by(id=audiobook_id, user_id=current_user.id).first()
+    if not audiobook:
+        return jsonify({'error': 'Audiobook not found'}), 404
+    
+    index = audio_pack.load_index(packed_audio_paths(audiobook_id)[1])
+    if not index:
+        return jsonify({'error': 'Packed audio not found'}), 404
+    return jsonify({'success': True, 'stream_url': f'/api/audiobook/{audiobook_id}/packed', **index})
+
+def load_audio_manifest(audiobook):
+    """
+    Get the audio manifest of an audiobook.
+    
+    Audiobooks converted before manifests existed get one built from their
+    files once; it is saved when the book is completed, so later listings
+    don't touch the filesystem either.
+    """
+    path = manifest_path(OUTPUT_FOLDER, audiobook.id)
+    manifest = AudioManifest.load(path)
+    if manifest or audiobook.status in ('queued', 'processing'):
+        return manifest or AudioManifest(path, audiobook.id)
+    
+    manifest = AudioManifest(path, audiobook.id)
+    for i in range(1, (audiobook.total_pages or 0) + 1):
+        file_path = os.path.join(OUTPUT_FOLDER, f"{audiobook.id}_page_{i:03d}.mp3")
+        if os.path.exists(file_path):
+            manifest.add_page(i, [file_path])
+            continue
+        
+        chunk_paths = []
+        while True:
+            chunk_path = os.path.join(OUTPUT_FOLDER, f"{audiobook.id}_page_{i:03d}_chunk_{len(chunk_paths):02d}.mp3")
+            if not os.path.exists(chunk_path):
+                break
+            chunk_paths.append(chunk_path)
+        if chunk_paths:
+            manifest.add_page(i, chunk_paths)
+    
+    index = audio_pack.load_index(packed_audio_paths(audiobook.id)[1])
+    if index:
+        manifest.set_packed(index)
+    if audiobook.status == 'completed':
+        manifest.save()
+    return manifest
+
+def page_listing(audiobook_id, manifest, page_number):
+    """Describe one page for the pages API from the manifest"""
+    entry = manifest.get_page(page_number)
+    if not entry:
+        return {'page': page_number, 'available': False, 'stream_url': None, 'chunks': None}
+    
+    if manifest.packed:
+        return {
+            'page': page_number,
+            'available': entry.get('length', 0) > 0,
+            'stream_url': f'/api/audiobook/{audiobook_id}/packed?page={page_number}',
+            'start': entry.get('start'),
+            'duration': entry.get('duration'),
+            'chunks': None
+        }
+    
+    chunks = None
+    if any('_chunk_' in chunk['file'] for chunk in entry['chunks']):
+        chunks = [{
+            'chunk': chunk_index,
+            'stream_url': f'/api/audiobook/{audiobook_id}/stream/{page_number}/chunk/{chunk_index}',
+            'duration': chunk['duration']
+        } for chunk_index, chunk in enumerate(entry['chunks'])]
+    return {
+        'page': page_number,
+        'available': True,
+        'stream_url': f'/api/audiobook/{audiobook_id}/stream/{page_number}',  # First chunk for chunked pages
+        'duration': entry.get('duration'),
+        'bytes': entry.get('bytes'),
+        'chunks': chunks
+    }
+
 @app.route('/api/audiobook/<audiobook_id>/pages')
 @login_required
 def get_audiobook_pages(audiobook_id):
+    """
+    List an audiobook's pages from its audio manifest.
+    
+    Optional ?offset=N&limit=M return a slice of the pages; without them every
+    page is listed.
+    """
     try:
         audiobook = Audiobook.query.filter_by(id=audiobook_id, user_id=current_user.id).first()
         if not audiobook:
             return jsonify({'error': 'Audiobook not found'}), 404
         
-        # Get all audio files for this audiobook
-        pages = []
-        for i in range(1, audiobook.total_pages + 1):
-            # Check for single page file first
-            file_path = os.path.join(OUTPUT_FOLDER, f"{audiobook_id}_page_{i:03d}.mp3")
-            
-            if os.path.exists(file_path):
-                pages.append({
-                    'page': i,
-                    'available': True,
-                    'stream_url': f'/api/audiobook/{audiobook_id}/stream/{i}',
-                    'chunks': None  # Single file, no chunks
-                })
-            else:
-                # Check for chunked files
-                chunks = []
-                chunk_index = 0
-                while True:
-                    chunk_path = os.path.join(OUTPUT_FOLDER, f"{audiobook_id}_page_{i:03d}_chunk_{chunk_index:02d}.mp3")
-                    if os.path.exists(chunk_path):
-                        chunks.append({
-                            'chunk': chunk_index,
-                            'stream_url': f'/api/audiobook/{audiobook_id}/stream/{i}/chunk/{chunk_index}'
-                        })
-                        chunk_index += 1
-                    else:
-                        break
-                
-                if chunks:
-                    pages.append({
-                        'page': i,
-                        'available': True,
-                        'stream_url': f'/api/audiobook/{audiobook_id}/stream/{i}',  # Default to first chunk
-                        'chunks': chunks
-                    })
-                else:
-                    pages.append({
-                        'page': i,
-                        'available': False,
-                        'stream_url': None,
-                        'chunks': None
-                    })
+        manifest = load_audio_manifest(audiobook)
+        total = max(audiobook.total_pages or 0, manifest.last_page())
+        offset = max(0, request.args.get('offset', 0, type=int))
+        limit = request.args.get('limit', type=int)
+        stop = total if limit is None else min(total, offset + max(0, limit))
+        
+        pages = [page_listing(audiobook_id, manifest, number) for number in range(offset + 1, stop + 1)]
         
         return jsonify({
             'success': True,
@@ -628,9 +1676,18 @@ def get_audiobook_pages(audiobook_id):
                 'title': audiobook.title,
                 'author': audiobook.author,
                 'total_pages': audiobook.total_pages,
-                'status': audiobook.status
+                'status': audiobook.status,
+                'packed': manifest.packed,
+                'total_duration': manifest.total_duration(),
+                'text_cleaning': manifest.text_stats
             },
-            'pages': pages
+            'pages': pages,
+            'pagination': {
+                'offset': offset,
+                'limit': limit,
+                'total': total,
+                'has_more': stop < total
+            }
         })
         
     except Exception as e:
@@ -650,22 +1707,26 @@ def handle_join_conversion(data):
 def get_stats():
     """Get user and global statistics"""
     try:
-        # Get user's audiobook stats
-        user_audiobooks = get_user_audiobooks(current_user.id)
-        user_stats = {
-            'total_audiobooks': len(user_audiobooks),
-            'completed': len([a for a in user_audiobooks if a.status == 'completed']),
-            'processing': len([a for a in user_audiobooks if a.status == 'processing']),
-            'failed': len([a for a in user_audiobooks if a.status == 'failed'])
-        }
-        
-        # Get global stats
-        global_stats = get_database_stats()
+        # One grouped query for the user; global stats come from the stats cache
+        user_stats = get_user_stats(current_user.id)
+        global_stats = global_stats_cached()
         
         return jsonify({
             'success': True,
             'user_stats': user_stats,
-            'global_stats': global_stats
+            'global_stats': global_stats,
+            'tts_cache': tts_cache.get_stats() if tts_cache else None,
+            'tts_engines': tts_engines.get_stats(),
+            'source_cache': source_cache.get_stats(),
+            'progress': get_progress_stats(),
+            'search_cache': search_cache.get_stats(),
+            'preview_cache': preview_cache.get_stats(),
+            'http': http_client.get_stats(),
+            'db_writer': db_writer.get_stats() if db_writer else None,
+            'conversion_queue': conversion_scheduler.get_stats(),
+            'async_engine': async_engine.get_stats() if async_engine else None,
+            'active_conversions': len(active_conversions),
+            'text_cleaning': get_cleaning_stats()
         })
         
     except Exception as e:
@@ -674,15 +1735,90 @@ def get_stats():
 @app.route('/api/audiobooks/<audiobook_id>', methods=['DELETE'])
 @login_required
 def api_delete_audiobook(audiobook_id):
-    """Delete an audiobook (user can only delete their own)"""
+    """Delete an audiobook (user can only delete their own), stopping its conversion and removing its audio"""
     try:
         if delete_audiobook(audiobook_id, current_user.id):
+            # A running converter removes whatever it writes before it stops
+            cancel_conversion(audiobook_id, delete_files=True)
+            remove_audiobook_files(audiobook_id)
             return jsonify({'success': True, 'message': 'Audiobook deleted successfully'})
         else:
             return jsonify({'success': False, 'message': 'Audiobook not found or unauthorized'})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
+@app.route('/api/conversions')
+@login_required
+def list_conversions():
+    """List the user's queued and running conversions in the order they will run"""
+    try:
+        audiobooks = Audiobook.query.filter(
+            Audiobook.user_id == current_user.id,
+            Audiobook.status.in_(('queued', 'processing'))
+        ).order_by(Audiobook.priority.desc(), Audiobook.queued_at.asc()).all()
+        
+        conversions = [{
+            'audiobook_id': audiobook.id,
+            'title': audiobook.title,
+            'status': audiobook.status,
+            'progress': audiobook.progress or 0,
+            'priority': audiobook.priority or 0,
+            'queue_position': conversion_scheduler.position(audiobook.id) if audiobook.status == 'queued' else None
+        } for audiobook in audiobooks]
+        conversions.sort(key=lambda job: (job['status'] != 'processing', job['queue_position'] or 0))
+        return jsonify({'success': True, 'conversions': conversions})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
+@app.route('/api/conversions/<audiobook_id>/cancel', methods=['POST'])
+@login_required
+def cancel_conversion_route(audiobook_id):
+    """Cancel a queued or running conversion; pages already synthesized are kept for a later resume"""
+    try:
+        audiobook = Audiobook.query.filter_by(id=audiobook_id, user_id=current_user.id).first()
+        if not audiobook:
+            return jsonify({'success': False, 'message': 'Audiobook not found'}), 404
+        
+        # The database first, so no worker claims the job once it leaves the queue
+        if not cancel_audiobook_conversion(audiobook_id):
+            return jsonify({'success': False, 'message': 'No conversion in progress'}), 409
+        cancel_conversion(audiobook_id)
+        return jsonify({'success': True, 'message': 'Conversion cancelled'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
+@app.route('/api/conversions/<audiobook_id>/priority', methods=['POST'])
+@login_required
+def reprioritize_conversion(audiobook_id):
+    """
+    Change the priority of a queued conversion.
+    
+    Body: {'priority': int from -100 to 100}. Conversions above 0 run before
+    everyone's regular queue (e.g. the book the user is listening to), below 0
+    after it.
+    """
+    try:
+        priority = (request.get_json(silent=True) or {}).get('priority')
+        if not isinstance(priority, int) or isinstance(priority, bool) or not -100 <= priority <= 100:
+            return jsonify({'success': False, 'message': "'priority' must be an integer from -100 to 100"}), 400
+        
+        audiobook = Audiobook.query.filter_by(id=audiobook_id, user_id=current_user.id).first()
+        if not audiobook:
+            return jsonify({'success': False, 'message': 'Audiobook not found'}), 404
+        if audiobook.status not in ('queued', 'processing'):
+            return jsonify({'success': False, 'message': 'No conversion in progress'}), 409
+        
+        set_audiobook_priority(audiobook_id, priority)
+        position = conversion_scheduler.reprioritize(audiobook_id, priority)
+        return jsonify({
+            'success': True,
+            'priority': priority,
+            'status': audiobook.status,
+            'queue_position': position
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
 @app.route('/api/audiobooks/<audiobook_id>')
 @login_required
 def api_get_audiobook(audiobook_id):
@@ -702,7 +1838,7 @@ def available_voices():
     try:
         engines = []
         
-        if GTTS_AVAILABLE:
+        if tts_engines.is_available('gtts'):
             engines.append({
                 'id': 'gtts',
                 'name': 'Google Text-to-Speech',
@@ -714,7 +1850,7 @@ def available_voices():
                 }
             })
         
-        if PYTTSX3_AVAILABLE:
+        if tts_engines.is_available('pyttsx3'):
             engines.append({
                 'id': 'pyttsx3',
                 'name': 'System Text-to-Speech',
@@ -727,7 +1863,7 @@ def available_voices():
                 }
             })
         
-        if OPENAI_AVAILABLE:
+        if tts_engines.is_available('openai'):
             engines.append({
                 'id': 'openai',
                 'name': 'OpenAI TTS',
@@ -739,10 +1875,21 @@ def available_voices():
                 }
             })
         
+        if tts_engines.is_available('fake'):
+            engines.append({
+                'id': 'fake',
+                'name': 'Silent test engine',
+                'description': 'Local silent audio for tests and benchmarks',
+                'languages': ['en'],
+                'settings': {
+                    'latency': {'type': 'range', 'min': 0.0, 'max': 5.0, 'default': 0.0}
+                }
+            })
+        
         return jsonify({
             'success': True,
             'engines': engines,
-            'default_engine': 'gtts' if GTTS_AVAILABLE else engines[0]['id'] if engines else None
+            'default_engine': 'gtts' if tts_engines.is_available('gtts') else engines[0]['id'] if engines else None
         })
         
     except Exception as e:
@@ -826,34 +1973,186 @@ def convert_from_collection():
         voice_engine = data.get('voice_engine', 'gtts')
         voice_settings = data.get('voice_settings', {'language': 'en'})
 
+        unavailable = unavailable_engine_response(voice_engine)
+        if unavailable:
+            return unavailable
+
         audiobook = Audiobook.query.filter_by(id=audiobook_id, user_id=current_user.id).first()
         if not audiobook:
             return jsonify({'success': False, 'message': 'Audiobook not found'}), 404
 
-        # Start conversion in background thread with app context
-        def run_conversion():
-            from app_simple import app
-            with app.app_context():
-                converter = AudiobookConverter(audiobook.id, socketio)
-                try:
-                    converter.emit_progress('processing', 0, 'Starting conversion...')
-                    # Download PDF
-                    pdf_path = converter.download_pdf(audiobook.source_url)
-                    # Extract text
-                    text_pages = converter.extract_text(pdf_path)
-                    # Convert to audio
-                    audio_files = converter.convert_to_audio(text_pages, voice_engine, voice_settings)
-                    # Clean up
-                    if os.path.exists(pdf_path):
-                        os.remove(pdf_path)
-                except Exception as e:
-                    converter.emit_progress('failed', 0, str(e))
+        if audiobook.status in ('queued', 'processing'):
+            return jsonify({
+                'success': False,
+                'message': 'Conversion already in progress',
+                'queue_position': conversion_scheduler.position(audiobook.id)
+            })
 
-        threading.Thread(target=run_conversion).start()
-        return jsonify({'success': True, 'message': 'Conversion started'})
+        try:
+            position = enqueue_conversion(audiobook, voice_engine, voice_settings)
+        except QueueFullError as e:
+            return queue_full_response(e, audiobook.id)
+
+        return jsonify({'success': True, 'queue_position': position, 'message': 'Conversion queued'})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
+@app.route('/api/book/batch-add', methods=['POST'])
+@login_required
+def batch_add_to_collection():
+    """
+    Add many books to the user's collection in one request, optionally converting them.
+    
+    Body: {'books': [{title, author, download_url}, ...], 'keys': [Open Library
+    work keys], 'convert': bool, 'voice_engine': str, 'voice_settings': dict}.
+    Open Library keys are resolved with batched search requests, duplicates are
+    found with one query, new books are inserted in one transaction and
+    conversions are queued with one call. Results come back per item, books
+    first then keys, each with a status of 'added', 'exists', 'invalid',
+    'not_found' or 'lookup_failed' (plus a 'conversion' result when converting).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        books = data.get('books') or []
+        keys = data.get('keys') or []
+        if not isinstance(books, list) or not isinstance(keys, list):
+            return jsonify({'success': False, 'message': "'books' and 'keys' must be lists"}), 400
+        if not books and not keys:
+            return jsonify({'success': False, 'message': 'Books or Open Library keys required'}), 400
+        if len(books) + len(keys) > app.config['BATCH_MAX_BOOKS']:
+            return batch_too_large_response(len(books) + len(keys))
+        if data.get('convert'):
+            unavailable = unavailable_engine_response(data.get('voice_engine', 'gtts'))
+            if unavailable:
+                return unavailable
+        
+        results = []
+        candidates = []  # (result, book) for items that resolved to a book
+        for index, book in enumerate(books):
+            result = {'index': index}
+            results.append(result)
+            if not isinstance(book, dict) or not str(book.get('title') or '').strip():
+                result['status'] = 'invalid'
+                continue
+            candidates.append((result, book))
+        
+        if keys:
+            resolved, failed = OpenLibraryAPI.fetch_books_by_keys(keys)
+            for index, key in enumerate(keys, start=len(books)):
+                work_key = normalize_work_key(key)
+                result = {'index': index, 'key': work_key}
+                results.append(result)
+                if work_key in failed:
+                    result['status'] = 'lookup_failed'
+                elif not resolved.get(work_key):
+                    result['status'] = 'not_found'  # Unknown work, or no scan to convert
+                else:
+                    candidates.append((result, resolved[work_key]))
+        
+        # Normalize the way create_audiobook stores them so the duplicate check matches
+        for result, book in candidates:
+            result['title'] = str(book['title']).strip()
+            result['author'] = str(book.get('author') or '').strip() or 'Unknown'
+        existing = find_existing_audiobooks(current_user.id, [(r['title'], r['author']) for r, _ in candidates])
+        
+        new_books = {}
+        statuses = {}
+        for result, book in candidates:
+            pair = (result['title'], result['author'])
+            if pair in existing:
+                result['status'] = 'exists'
+                result['audiobook_id'], statuses[result['audiobook_id']] = existing[pair]
+            elif pair in new_books:
+                result['status'] = 'exists'  # Listed twice in this request
+            else:
+                result['status'] = 'added'
+                new_books[pair] = {'title': pair[0], 'author': pair[1], 'download_url': book.get('download_url', '')}
+        
+        if new_books:
+            audiobook_ids = create_audiobooks_bulk(
+                current_user.id, list(new_books.values()),
+                voice_engine='gtts',  # Default engine, as for a single add
+                voice_settings={'language': 'en'},
+                source_type='search',
+                status='saved'
+            )
+            if audiobook_ids is None:
+                return jsonify({'success': False, 'message': 'Failed to add books'}), 500
+            created = dict(zip(new_books, audiobook_ids))
+            for result, _ in candidates:
+                pair = (result['title'], result['author'])
+                if pair in created:
+                    result['audiobook_id'] = created[pair]
+                    statuses.setdefault(created[pair], 'saved')
+        
+        if data.get('convert'):
+            conversions = enqueue_conversions(
+                [(audiobook_id, current_user.id, status) for audiobook_id, status in statuses.items()],
+                data.get('voice_engine', 'gtts'),
+                data.get('voice_settings', {'language': 'en'})
+            )
+            for result in results:
+                if result.get('audiobook_id') in conversions:
+                    result['conversion'] = conversions[result['audiobook_id']]
+        
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+        return jsonify({'success': True, 'summary': summary, 'results': results})
+        
+    except Exception as e:
+        print(f"Batch add error: {e}")
+        return jsonify({'success': False, 'message': f'Failed to add books: {str(e)}'}), 500
+
+@app.route('/api/book/batch-convert', methods=['POST'])
+@login_required
+def batch_convert_from_collection():
+    """
+    Queue conversions for many books already in the user's collection.
+    
+    Body: {'audiobook_ids': [...], 'voice_engine': str, 'voice_settings': dict}.
+    Results come back per ID with a status of 'queued', 'in_progress',
+    'queue_full', 'not_found' or 'failed' and the queue position if waiting.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        audiobook_ids = data.get('audiobook_ids') or []
+        if not isinstance(audiobook_ids, list) or not audiobook_ids:
+            return jsonify({'success': False, 'message': 'audiobook_ids required'}), 400
+        if len(audiobook_ids) > app.config['BATCH_MAX_BOOKS']:
+            return batch_too_large_response(len(audiobook_ids))
+        unavailable = unavailable_engine_response(data.get('voice_engine', 'gtts'))
+        if unavailable:
+            return unavailable
+        
+        audiobook_ids = list(dict.fromkeys(str(audiobook_id) for audiobook_id in audiobook_ids))
+        owned = db.session.query(Audiobook.id, Audiobook.user_id, Audiobook.status).filter(
+            Audiobook.user_id == current_user.id,
+            Audiobook.id.in_(audiobook_ids)
+        ).all()
+        conversions = enqueue_conversions(
+            [tuple(row) for row in owned],
+            data.get('voice_engine', 'gtts'),
+            data.get('voice_settings', {'language': 'en'})
+        )
+        
+        results = []
+        summary = {}
+        for audiobook_id in audiobook_ids:
+            result = {'audiobook_id': audiobook_id}
+            result.update(conversions.get(audiobook_id, {'status': 'not_found', 'queue_position': None}))
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+            results.append(result)
+        
+        response = jsonify({'success': True, 'summary': summary, 'results': results})
+        if summary.get('queue_full'):
+            response.headers['Retry-After'] = '30'
+        return response
+        
+    except Exception as e:
+        print(f"Batch convert error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/api/auth-status')
 def auth_status():
     """Check if user is authenticated"""
@@ -873,10 +2172,18 @@ def auth_status():
 @app.route('/stream/<audiobook_id>/<int:page_number>')
 def stream_audio(audiobook_id, page_number):
     """Stream the audio file for a specific page of an audiobook."""
-    audio_path = os.path.join(OUTPUT_FOLDER, f"{audiobook_id}_page_{page_number}.mp3")
-    if not os.path.exists(audio_path):
-        return abort(404, description="Audio not found")
-    return send_file(audio_path, mimetype='audio/mpeg')
+    audiobook = Audiobook.query.get(audiobook_id)
+    completed = audiobook is not None and audiobook.status == 'completed'
+    candidates = [
+        f"{audiobook_id}_page_{page_number:03d}.mp3",
+        f"{audiobook_id}_page_{page_number:03d}_chunk_00.mp3",  # Chunked page: first chunk
+        f"{audiobook_id}_page_{page_number}.mp3"  # Files written by older versions
+    ]
+    for filename in candidates:
+        audio_path = os.path.join(OUTPUT_FOLDER, filename)
+        if os.path.exists(audio_path):
+            return send_audio(audio_path, completed=completed, private=False)
+    return send_packed_page(audiobook_id, page_number, completed=completed, private=False) or abort(404, description="Audio not found")
 
 if __name__ == '__main__':
     print("🚀 Starting AudioGen server...")
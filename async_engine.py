@@ -0,0 +1,257 @@
+"""
+Async Conversion Engine
+=======================
+
+Runs conversions as coroutines on one asyncio event loop instead of one OS
+thread per book plus a page pool per book (CONVERSION_ENGINE=async).
+
+A conversion spends nearly all its time waiting: on the PDF download and on
+the TTS service. Here a waiting book is a suspended coroutine rather than
+parked threads, so one process can keep hundreds of books in flight. The
+blocking clients (requests, gTTS, OpenAI) and database/progress bookkeeping
+run on one shared I/O thread pool, PDF extraction on a pool of its own, and
+short CPU-bound steps (hashing, packing) on a small separate pool, so none
+of them ever stalls the loop.
+
+Features:
+- One event-loop thread; conversions can be submitted from any thread
+- Shared I/O executor (downloads, TTS calls, progress and manifest writes),
+  extraction executor (PyPDF2 pages, so a slow PDF holds up only its own
+  thread) and CPU executor (hashing, packing); all run callables inside the
+  app context
+- submit() returns a concurrent.futures.Future, which ConversionScheduler
+  tracks without holding a thread for the whole conversion
+- Benchmark: python async_engine.py --books 200 compares concurrent books per
+  GB of RAM with the thread-per-book model
+"""
+
+import asyncio
+import functools
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncConversionEngine:
+    """Event loop plus the executors conversions offload blocking work to"""
+
+    def __init__(self, app=None, io_threads=16, cpu_threads=2, extract_threads=8):
+        """
+        Args:
+            app: Flask application (executor calls run inside its app context)
+            io_threads: Threads for blocking network calls and bookkeeping, shared by all books
+            cpu_threads: Threads for short CPU-bound steps, shared by all books
+            extract_threads: Threads advancing PDF page iterators, shared by all books
+        """
+        self.app = app
+        self.io_executor = ThreadPoolExecutor(max_workers=max(1, io_threads), thread_name_prefix='async-io')
+        self.cpu_executor = ThreadPoolExecutor(max_workers=max(1, cpu_threads), thread_name_prefix='async-cpu')
+        self.extract_executor = ThreadPoolExecutor(max_workers=max(1, extract_threads), thread_name_prefix='async-extract')
+        self.stats = Counter()
+        self.loop = None
+
+        self._lock = threading.Lock()
+        self._running = 0
+
+    def start(self):
+        """Start the event-loop thread (idempotent)"""
+        with self._lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(ready.set)
+                self.loop.run_forever()
+
+            threading.Thread(target=run, name='async-conversions', daemon=True).start()
+        ready.wait()
+        print(f"✅ Async conversion engine started ({self.io_executor._max_workers} I/O threads, "
+              f"{self.cpu_executor._max_workers} CPU threads, {self.extract_executor._max_workers} extraction threads)")
+
+    def submit(self, coroutine_fn, *args):
+        """
+        Run coroutine_fn(*args) on the loop.
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._track(coroutine_fn(*args)), self.loop)
+
+    async def run_io(self, fn, *args):
+        """Run a blocking I/O call (network, database, files) on the shared I/O threads"""
+        return await self._run_in(self.io_executor, fn, *args)
+
+    async def run_cpu(self, fn, *args):
+        """Run a short CPU-bound call (hashing, packing) on the CPU threads"""
+        return await self._run_in(self.cpu_executor, fn, *args)
+
+    async def iterate(self, iterator):
+        """
+        Advance a blocking iterator (PDF extraction) on the extraction threads,
+        yielding its items on the loop.
+
+        Extraction gets its own threads: a PDF that takes seconds per page
+        would otherwise hold the CPU threads every other book hashes and
+        packs on.
+        """
+        done = object()
+        while True:
+            item = await self._run_in(self.extract_executor, next, iterator, done)
+            if item is done:
+                return
+            yield item
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'running': self._running,
+                'peak_running': self.stats['peak_running'],
+                'started': self.stats['started'],
+                'finished': self.stats['finished'],
+                'io_threads': self.io_executor._max_workers,
+                'cpu_threads': self.cpu_executor._max_workers,
+                'extract_threads': self.extract_executor._max_workers
+            }
+
+    async def _track(self, coroutine):
+        with self._lock:
+            self._running += 1
+            self.stats['started'] += 1
+            self.stats['peak_running'] = max(self.stats['peak_running'], self._running)
+        try:
+            return await coroutine
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.stats['finished'] += 1
+
+    async def _run_in(self, executor, fn, *args):
+        call = functools.partial(fn, *args)
+        if self.app is not None:
+            call = functools.partial(self._in_app_context, call)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    def _in_app_context(self, call):
+        with self.app.app_context():
+            return call()
+
+
+def _rss_bytes():
+    """Resident memory of this process (Linux), or None"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def benchmark(books=200, pages=20, page_concurrency=4, io_threads=16, latency=0.05):
+    """
+    Compare how much memory each model needs to keep books in flight.
+
+    Every simulated book synthesizes its pages through an I/O wait of
+    `latency` seconds, page_concurrency at a time, like a real conversion
+    against a network TTS service. Each model runs in a fresh process so
+    neither inherits the other's memory.
+
+    Returns:
+        Dictionary of model -> {'books', 'seconds', 'threads', 'rss_mb', 'books_per_gb'}
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = {}
+    for model in ('threads', 'async'):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results[model] = pool.submit(_benchmark_model, model, books, pages, page_concurrency, io_threads, latency).result()
+    return results
+
+
+def _benchmark_model(model, books, pages, page_concurrency, io_threads, latency):
+    import time
+
+    def io_call():
+        time.sleep(latency)
+        return b'\x00' * 1024
+
+    def measure(run):
+        before = _rss_bytes()
+        threads_before = threading.active_count()
+        peak = {'rss': before or 0, 'threads': threads_before}
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(0.02):
+                peak['rss'] = max(peak['rss'], _rss_bytes() or 0)
+                peak['threads'] = max(peak['threads'], threading.active_count())
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        started = time.monotonic()
+        run()
+        seconds = time.monotonic() - started
+        stop.set()
+        sampler.join()
+        used = max(1, peak['rss'] - (before or 0))
+        return {
+            'books': books,
+            'seconds': round(seconds, 2),
+            'threads': peak['threads'] - threads_before,
+            'rss_mb': round(used / 1048576, 1),
+            'books_per_gb': round(books / (used / 1024 ** 3)) if before else None
+        }
+
+    def threads_model():
+        shared = threading.BoundedSemaphore(io_threads)  # Global TTS limit
+
+        def book():
+            with ThreadPoolExecutor(max_workers=page_concurrency) as pool:
+                def page(_):
+                    with shared:
+                        return io_call()
+                list(pool.map(page, range(pages)))
+
+        workers = [threading.Thread(target=book) for _ in range(books)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def async_model():
+        engine = AsyncConversionEngine(io_threads=io_threads, cpu_threads=1, extract_threads=1)
+
+        async def book():
+            slots = asyncio.Semaphore(page_concurrency)
+
+            async def page():
+                async with slots:
+                    return await engine.run_io(io_call)
+
+            await asyncio.gather(*(page() for _ in range(pages)))
+
+        futures = [engine.submit(book) for _ in range(books)]
+        for future in futures:
+            future.result()
+
+    return measure(threads_model if model == 'threads' else async_model)
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Concurrent books per GB of RAM: thread-per-book vs event loop')
+    parser.add_argument('--books', type=int, default=200)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--page-concurrency', type=int, default=4)
+    parser.add_argument('--io-threads', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per simulated TTS call')
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.books, args.pages, args.page_concurrency, args.io_threads, args.latency), indent=2))
@@ -0,0 +1,216 @@
+"""
+Packed Audiobook Output
+=======================
+
+Single-file audiobook output: the MP3 frames of every page concatenated into
+one file, plus a small JSON index with each page's byte offset, length, start
+time and duration.
+
+Features:
+- Minimal MPEG audio (Layer III) frame parser, no external dependencies
+- ID3 tags and Xing/Info/VBRI header frames are stripped from page files, so
+  the packed file is one continuous stream a player can seek in
+- Page and time-position lookups that resolve to byte ranges, aligned to
+  frame boundaries
+"""
+
+import json
+import os
+
+# Layer III bitrates in kbps by bitrate index
+_BITRATES = {
+    'mpeg1': [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    'mpeg2': [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+}
+_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+INDEX_VERSION = 1
+
+
+def parse_frame_header(data, offset):
+    """
+    Parse the MPEG Layer III frame header at offset.
+
+    Returns:
+        (frame_length, samples, sample_rate), or None if there is no valid header
+    """
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+
+    version = (data[offset + 1] >> 3) & 0x03  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer = (data[offset + 1] >> 1) & 0x03    # 1 = Layer III
+    bitrate_index = data[offset + 2] >> 4
+    rate_index = (data[offset + 2] >> 2) & 0x03
+    padding = (data[offset + 2] >> 1) & 0x01
+
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = _BITRATES['mpeg1' if version == 3 else 'mpeg2'][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    samples = 1152 if version == 3 else 576
+    frame_length = (samples // 8) * bitrate // sample_rate + padding
+    return frame_length, samples, sample_rate
+
+
+def iter_frames(data):
+    """
+    Yield (offset, length, duration) for each audio frame in MP3 data.
+
+    Leading ID3v2 tags are skipped, and bytes between frames (trailing ID3v1
+    tags, junk) are skipped by resynchronising on the next valid header.
+    """
+    offset = _skip_id3v2(data)
+    synced = True
+    while offset < len(data):
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header[0] > len(data):
+            offset += 1
+            synced = False
+            continue
+        frame_length, samples, sample_rate = header
+        following = offset + frame_length
+        if not synced and following != len(data) and parse_frame_header(data, following) is None:
+            # A lone 0xFF in junk looks like a header; real frames are followed by another
+            offset += 1
+            continue
+        synced = True
+        yield offset, frame_length, samples / sample_rate
+        offset = following
+
+
+def read_audio_frames(path):
+    """
+    Read the playable frames of an MP3 file.
+
+    Returns:
+        (frame_bytes, duration_seconds) with tags and VBR header frames removed
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    parts = []
+    duration = 0.0
+    for index, (offset, length, frame_duration) in enumerate(iter_frames(data)):
+        if index == 0 and _is_vbr_header(data[offset:offset + length]):
+            continue  # Describes this file only; wrong once concatenated
+        parts.append(data[offset:offset + length])
+        duration += frame_duration
+    return b''.join(parts), duration
+
+
+def pack_pages(pages, pack_path, index_path):
+    """
+    Concatenate page audio into one MP3 and write its page index.
+
+    Args:
+        pages: Iterable of (page_number, [audio paths in chunk order])
+        pack_path: Output MP3 path
+        index_path: Output JSON index path
+
+    Returns:
+        The index dictionary
+    """
+    entries = []
+    offset = 0
+    start = 0.0
+    tmp_path = f"{pack_path}.part"
+    with open(tmp_path, 'wb') as pack:
+        for page_number, paths in pages:
+            length = 0
+            duration = 0.0
+            for path in paths:
+                frames, frames_duration = read_audio_frames(path)
+                pack.write(frames)
+                length += len(frames)
+                duration += frames_duration
+            entries.append({
+                'page': page_number,
+                'offset': offset,
+                'length': length,
+                'start': round(start, 3),
+                'duration': round(duration, 3)
+            })
+            offset += length
+            start += duration
+
+    index = {
+        'version': INDEX_VERSION,
+        'bytes': offset,
+        'duration': round(start, 3),
+        'pages': entries
+    }
+    _write_json(index_path, index)
+    os.replace(tmp_path, pack_path)
+    return index
+
+
+def load_index(index_path):
+    """Load a pack index, or None if there is none"""
+    try:
+        with open(index_path) as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def find_page(index, page_number):
+    """Get the index entry for a page number, or None"""
+    for entry in index['pages']:
+        if entry['page'] == page_number:
+            return entry
+    return None
+
+
+def find_time(index, seconds):
+    """Get the index entry of the page playing at a time position, or None past the end"""
+    for entry in index['pages']:
+        if seconds < entry['start'] + entry['duration']:
+            return entry if entry['length'] else None
+    return None
+
+
+def read_page(pack_path, entry, seconds=None):
+    """
+    Read a page's bytes from a packed file, optionally starting at a time position.
+
+    Args:
+        pack_path: Packed MP3 path
+        entry: Page entry from the index
+        seconds: Absolute time position; the page is cut at the frame playing then
+
+    Returns:
+        (data, start_seconds) where start_seconds is the actual start of data
+    """
+    with open(pack_path, 'rb') as file:
+        file.seek(entry['offset'])
+        data = file.read(entry['length'])
+
+    if seconds is None or seconds <= entry['start']:
+        return data, entry['start']
+
+    position = entry['start']
+    for offset, _, frame_duration in iter_frames(data):
+        if position + frame_duration > seconds:
+            return data[offset:], round(position, 3)
+        position += frame_duration
+    return b'', round(position, 3)
+
+
+def _skip_id3v2(data):
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]  # Syncsafe integer
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_vbr_header(frame):
+    return b'Xing' in frame[:48] or b'Info' in frame[:48] or frame[36:40] == b'VBRI'
+
+
+def _write_json(path, value):
+    tmp_path = f"{path}.part"
+    with open(tmp_path, 'w') as file:
+        json.dump(value, file)
+    os.replace(tmp_path, path)
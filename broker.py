@@ -0,0 +1,174 @@
+"""
+Stand-in Message Broker
+=======================
+
+Minimal publish/subscribe broker for running web and conversion worker nodes
+as separate processes without Redis or RabbitMQ (local development, tests).
+
+Web nodes and workers connect with SOCKETIO_MESSAGE_QUEUE=broker://host:port;
+progress events emitted on a worker are relayed to every web node, which
+delivers them to the clients in the audiobook's room. For production use a
+real queue (redis://, amqp://), which Flask-SocketIO supports directly.
+
+Features:
+- Newline-delimited JSON over TCP, one thread per connection
+- Channels: messages go to every subscriber of the channel they were published on
+- BrokerManager: python-socketio client manager using the broker, with
+  automatic reconnects
+- Run standalone: python broker.py --host 127.0.0.1 --port 5055
+"""
+
+import json
+import socket
+import socketserver
+import threading
+import time
+from urllib.parse import urlparse
+
+import socketio
+
+DEFAULT_PORT = 5055
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    """One client connection: publishes and subscriptions"""
+
+    def handle(self):
+        broker = self.server
+        try:
+            for line in self.rfile:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if message.get('op') == 'sub':
+                    broker.subscribe(message['channel'], self)
+                elif message.get('op') == 'pub':
+                    broker.publish(message['channel'], line)
+        except OSError:
+            pass
+        finally:
+            broker.unsubscribe(self)
+
+    def send(self, line):
+        with self.server.send_lock(self):
+            self.wfile.write(line)
+            self.wfile.flush()
+
+
+class MessageBroker(socketserver.ThreadingTCPServer):
+    """TCP server relaying published messages to channel subscribers"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT):
+        super().__init__((host, port), _BrokerHandler)
+        self._lock = threading.Lock()
+        self._subscribers = {}   # channel -> set of handlers
+        self._send_locks = {}    # handler -> lock serializing writes to it
+        self.published = 0
+
+    def subscribe(self, channel, handler):
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(handler)
+            self._send_locks.setdefault(handler, threading.Lock())
+
+    def unsubscribe(self, handler):
+        with self._lock:
+            for handlers in self._subscribers.values():
+                handlers.discard(handler)
+            self._send_locks.pop(handler, None)
+
+    def send_lock(self, handler):
+        with self._lock:
+            return self._send_locks.get(handler) or threading.Lock()
+
+    def publish(self, channel, line):
+        with self._lock:
+            handlers = list(self._subscribers.get(channel, ()))
+            self.published += 1
+        for handler in handlers:
+            try:
+                handler.send(line)
+            except OSError:
+                self.unsubscribe(handler)
+
+    def start(self):
+        """Serve on a daemon thread (for tests and single-machine setups)"""
+        thread = threading.Thread(target=self.serve_forever, name='message-broker', daemon=True)
+        thread.start()
+        return thread
+
+
+class BrokerManager(socketio.PubSubManager):
+    """
+    Socket.IO client manager that shares rooms and events through a MessageBroker.
+
+    Use it like RedisManager: every web node and worker points at the same URL,
+    workers as write-only emitters.
+    """
+
+    name = 'broker'
+
+    def __init__(self, url='broker://127.0.0.1:5055', channel='flask-socketio', write_only=False, logger=None, json=None):
+        parsed = urlparse(url)
+        self.address = (parsed.hostname or '127.0.0.1', parsed.port or DEFAULT_PORT)
+        self._publish_socket = None
+        self._publish_lock = threading.Lock()
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+
+    def _publish(self, data):
+        line = (json.dumps({'op': 'pub', 'channel': self.channel, 'data': data}) + '\n').encode()
+        with self._publish_lock:
+            for attempt in range(2):
+                try:
+                    if self._publish_socket is None:
+                        self._publish_socket = socket.create_connection(self.address, timeout=5)
+                    self._publish_socket.sendall(line)
+                    return
+                except OSError:
+                    self._close_publish_socket()
+                    if attempt:
+                        raise
+
+    def _close_publish_socket(self):
+        if self._publish_socket is not None:
+            try:
+                self._publish_socket.close()
+            except OSError:
+                pass
+            self._publish_socket = None
+
+    def _listen(self):
+        delay = 1
+        while True:
+            try:
+                with socket.create_connection(self.address) as connection:
+                    connection.sendall((json.dumps({'op': 'sub', 'channel': self.channel}) + '\n').encode())
+                    delay = 1
+                    for line in connection.makefile('rb'):
+                        try:
+                            yield json.loads(line)['data']
+                        except (ValueError, KeyError):
+                            continue
+            except OSError as e:
+                self._get_logger().error(f'Message broker connection error: {e}, retrying in {delay}s')
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stand-in Socket.IO message broker')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    broker = MessageBroker(args.host, args.port)
+    print(f"✅ Message broker listening on broker://{args.host}:{args.port}")
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        broker.shutdown()
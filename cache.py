@@ -0,0 +1,217 @@
+"""
+TTL Cache
+=========
+
+Small caching layer for slow upstream lookups (Open Library search, previews).
+
+Features:
+- Time-to-live with stale-while-revalidate: expired entries are still served
+  for a grace period while a background thread refreshes them
+- Single-flight: concurrent misses for the same key share one upstream call
+- Pluggable storage: bounded in-memory LRU, or a SQLite file shared by all
+  worker processes on the host
+- Hit/miss/stale/coalesced counters
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+
+class MemoryBackend:
+    """In-process LRU storage bounded by entry count"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskBackend:
+    """SQLite-file storage shared across processes, bounded by entry count (LRU)"""
+
+    def __init__(self, path, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed ON cache_entries (accessed_at)')
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, stored_at FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), stored_at, time.time())
+            )
+            self._conn.execute(
+                'DELETE FROM cache_entries WHERE key IN ('
+                'SELECT key FROM cache_entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+
+
+class _Call:
+    """An in-flight computation that concurrent callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """TTL cache with stale-while-revalidate and single-flight computation"""
+
+    def __init__(self, backend=None, ttl=300, stale_ttl=3600):
+        """
+        Args:
+            backend: MemoryBackend or DiskBackend (in-memory if None)
+            ttl: Seconds an entry is fresh
+            stale_ttl: Extra seconds an expired entry is served while it refreshes
+        """
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = Counter()
+
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call
+
+    def get_or_compute(self, key, compute):
+        """
+        Get the value for key, calling compute() on a miss.
+
+        Exceptions from compute() propagate to callers waiting on a miss and are
+        never cached; a failed background refresh keeps the stale entry.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self.stats['hits'] += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stats['stale'] += 1
+                self._refresh_in_background(key, compute)
+                return value
+
+        self.stats['misses'] += 1
+        return self._compute_once(key, compute)
+
+    def invalidate(self, key):
+        self.backend.delete(key)
+
+    def get_stats(self):
+        lookups = self.stats['hits'] + self.stats['stale'] + self.stats['misses']
+        return {
+            'hits': self.stats['hits'],
+            'stale': self.stats['stale'],
+            'misses': self.stats['misses'],
+            'coalesced': self.stats['coalesced'],
+            'refresh_errors': self.stats['refresh_errors'],
+            'hit_rate': f"{((self.stats['hits'] + self.stats['stale'])/lookups*100):.1f}%" if lookups else "0%",
+            'entries': len(self.backend)
+        }
+
+    def _compute_once(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            self.stats['coalesced'] += 1
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+            self.backend.set(key, call.value, time.time())
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _refresh_in_background(self, key, compute):
+        with self._lock:
+            if key in self._calls:
+                return  # Already being refreshed
+
+        def refresh():
+            try:
+                self._compute_once(key, compute)
+            except Exception as e:
+                self.stats['refresh_errors'] += 1
+                print(f"⚠️ Background cache refresh failed for {key}: {e}")
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+def make_backend(kind, path=None, max_entries=1000):
+    """Build a cache backend from configuration ('memory' or 'disk')"""
+    if kind == 'disk':
+        return DiskBackend(path, max_entries=max_entries)
+    return MemoryBackend(max_entries=max_entries)
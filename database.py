@@ -19,6 +19,7 @@ from datetime import datetime
 import uuid
 import json
 import os
+import base64
 from werkzeug.security import generate_password_hash, check_password_hash
 
 # Initialize SQLAlchemy
@@ -49,13 +50,21 @@ class User(UserMixin, db.Model):
             'email': self.email,
             'name': self.name,
             'created_at': self.created_at.isoformat(),
-            'audiobook_count': len(self.audiobooks)
+            'audiobook_count': Audiobook.query.filter_by(user_id=self.id).count()  # Doesn't load the relationship
         }
     
     def __repr__(self):
         return f'<User {self.email}>'
 
 
+# Fields Audiobook.to_dict() can return; each is also a column
+AUDIOBOOK_FIELDS = (
+    'id', 'title', 'author', 'source_type', 'source_url', 'voice_engine', 'voice_settings',
+    'status', 'progress', 'total_pages', 'error_message', 'created_at', 'queued_at',
+    'started_at', 'completed_at', 'user_id', 'priority'
+)
+
+
 class Audiobook(db.Model):
     """Audiobook model with minimal essential fields"""
     __tablename__ = 'audiobooks'
@@ -74,19 +83,29 @@ class Audiobook(db.Model):
     voice_settings = db.Column(db.Text, default='{}')
     
     # Status and progress
-    status = db.Column(db.String(20), default='pending')  # pending, processing, completed, failed
+    status = db.Column(db.String(20), default='pending', index=True)  # pending, saved, queued, processing, completed, failed
     progress = db.Column(db.Integer, default=0)  # Percentage (0-100)
     total_pages = db.Column(db.Integer, default=0)
     error_message = db.Column(db.Text)
+    priority = db.Column(db.Integer, default=0, nullable=False)  # Queue priority: above 0 runs first, below 0 last
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    queued_at = db.Column(db.DateTime)
     started_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # Last progress write of a running conversion
     
     # Relationship
     user = db.relationship('User', backref=db.backref('audiobooks', lazy=True, cascade='all, delete-orphan'))
     
+    # Library listing: a user's books newest first (see get_user_audiobooks_page)
+    # Duplicate check when adding books to a collection (see find_existing_audiobooks)
+    __table_args__ = (
+        db.Index('ix_audiobooks_user_created', 'user_id', 'created_at'),
+        db.Index('ix_audiobooks_user_title_author', 'user_id', 'title', 'author'),
+    )
+    
     def get_voice_settings(self):
         """Get voice settings as dictionary"""
         try:
@@ -116,26 +135,35 @@ class Audiobook(db.Model):
         """Set voice settings from dictionary (backward compatibility)"""
         self.set_voice_settings(value)
     
-    def to_dict(self):
-        """Convert to dictionary for JSON serialization"""
+    def to_dict(self, fields=None):
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Args:
+            fields: Optional list of AUDIOBOOK_FIELDS to include (all if None);
+                    other columns are not touched, so they can be left unloaded
+        """
         # Handle potential None values safely
-        return {
-            'id': str(self.id) if self.id else '',
-            'title': str(self.title) if self.title else 'Unknown Title',
-            'author': str(self.author) if self.author else 'Unknown Author',
-            'source_type': str(self.source_type) if hasattr(self, 'source_type') and self.source_type else 'upload',
-            'source_url': str(self.source_url) if self.source_url else '',
-            'voice_engine': str(self.voice_engine) if self.voice_engine else 'gtts',
-            'voice_settings': self.get_voice_settings(),
-            'status': str(self.status) if self.status else 'pending',
-            'progress': int(self.progress) if self.progress is not None else 0,
-            'total_pages': int(self.total_pages) if self.total_pages is not None else 0,
-            'error_message': str(self.error_message) if self.error_message else '',
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'user_id': str(self.user_id) if self.user_id else ''
+        serializers = {
+            'id': lambda: str(self.id) if self.id else '',
+            'title': lambda: str(self.title) if self.title else 'Unknown Title',
+            'author': lambda: str(self.author) if self.author else 'Unknown Author',
+            'source_type': lambda: str(self.source_type) if hasattr(self, 'source_type') and self.source_type else 'upload',
+            'source_url': lambda: str(self.source_url) if self.source_url else '',
+            'voice_engine': lambda: str(self.voice_engine) if self.voice_engine else 'gtts',
+            'voice_settings': lambda: self.get_voice_settings(),
+            'status': lambda: str(self.status) if self.status else 'pending',
+            'progress': lambda: int(self.progress) if self.progress is not None else 0,
+            'total_pages': lambda: int(self.total_pages) if self.total_pages is not None else 0,
+            'error_message': lambda: str(self.error_message) if self.error_message else '',
+            'created_at': lambda: self.created_at.isoformat() if self.created_at else None,
+            'queued_at': lambda: self.queued_at.isoformat() if self.queued_at else None,
+            'started_at': lambda: self.started_at.isoformat() if self.started_at else None,
+            'completed_at': lambda: self.completed_at.isoformat() if self.completed_at else None,
+            'user_id': lambda: str(self.user_id) if self.user_id else '',
+            'priority': lambda: int(self.priority) if self.priority is not None else 0
         }
+        return {name: serializers[name]() for name in (fields or serializers)}
     
     def __repr__(self):
         return f'<Audiobook {self.title} ({self.status})>'
@@ -164,10 +192,16 @@ def init_database(app):
     # Create tables within app context
     with app.app_context():
         try:
+            # Pragmas must be in place before the first connection is opened
+            configure_sqlite_pragmas(app)
+            
             # Create all tables
             db.create_all()
             print("✅ Database tables created successfully")
             
+            # Add columns introduced after the tables were first created
+            upgrade_database_schema()
+            
             # Verify tables exist
             verify_database_schema()
             
@@ -210,6 +244,35 @@ def configure_database_uri(app):
         'pool_pre_ping': True,  # Verify connections before use
         'pool_recycle': 300,    # Recycle connections every 5 minutes
     }
+    
+    # SQLite tuned mode (on by default, SQLITE_TUNED=0 restores SQLite defaults):
+    # WAL lets readers run alongside the writer, NORMAL sync only fsyncs at
+    # checkpoints (safe in WAL mode), and writers wait for the lock instead of
+    # failing with "database is locked"
+    app.config['SQLITE_PRAGMAS'] = {}
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite') and os.getenv('SQLITE_TUNED', '1') == '1':
+        app.config['SQLITE_PRAGMAS'] = {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+            'mmap_size': int(os.getenv('SQLITE_MMAP_MB', 256)) * 1024 * 1024
+        }
+
+
+def configure_sqlite_pragmas(app):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection"""
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+    
+    @db.event.listens_for(db.engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+    
+    print(f"⚡ SQLite tuned mode: {', '.join(f'{name}={value}' for name, value in pragmas.items())}")
 
 
 def verify_database_schema():
@@ -226,6 +289,37 @@ def verify_database_schema():
     print(f"✅ Database schema verified: {tables}")
 
 
+# Columns added after the initial schema: (table, column, SQL type).
+# db.create_all() never alters existing tables, so these are applied by hand.
+SCHEMA_UPGRADES = [
+    ('audiobooks', 'queued_at', 'DATETIME'),
+    ('audiobooks', 'heartbeat_at', 'DATETIME'),
+    ('audiobooks', 'priority', 'INTEGER NOT NULL DEFAULT 0'),
+]
+
+
+def upgrade_database_schema():
+    """Add any missing columns from SCHEMA_UPGRADES and missing model indexes to existing tables"""
+    inspector = db.inspect(db.engine)
+    
+    for table, column, column_type in SCHEMA_UPGRADES:
+        existing = {col['name'] for col in inspector.get_columns(table)}
+        if column in existing:
+            continue
+        
+        db.session.execute(db.text(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}'))
+        db.session.commit()
+        print(f"✅ Added column {table}.{column}")
+    
+    # Indexes declared on the models after their tables were first created
+    for table in db.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=db.engine)
+                print(f"✅ Added index {index.name}")
+
+
 # ============================================================================
 # DATABASE HELPER FUNCTIONS
 # ============================================================================
@@ -299,6 +393,65 @@ def get_user_audiobooks(user_id, status=None):
     return query.order_by(Audiobook.created_at.desc()).all()
 
 
+def get_user_audiobooks_page(user_id, limit=50, cursor=None, statuses=None, fields=None):
+    """
+    Get one page of a user's audiobooks, newest first.
+    
+    Uses keyset pagination on (created_at, id), so every page is a single
+    index range scan on ix_audiobooks_user_created however deep the user
+    pages.
+    
+    Args:
+        user_id: User ID
+        limit: Maximum audiobooks to return
+        cursor: next_cursor from the previous page (None for the first page)
+        statuses: Optional list of statuses to include
+        fields: Optional list of AUDIOBOOK_FIELDS to load (all columns if None)
+    
+    Returns:
+        Tuple of (list of Audiobook objects, next_cursor or None on the last page)
+    
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    query = Audiobook.query.filter_by(user_id=user_id)
+    
+    if statuses:
+        query = query.filter(Audiobook.status.in_(statuses))
+    
+    if cursor:
+        created_at, audiobook_id = decode_page_cursor(cursor)
+        query = query.filter(db.or_(
+            Audiobook.created_at < created_at,
+            db.and_(Audiobook.created_at == created_at, Audiobook.id < audiobook_id)
+        ))
+    
+    if fields:
+        # id and created_at are always needed for the next cursor
+        columns = {'id', 'created_at', *fields}
+        query = query.options(db.load_only(*[getattr(Audiobook, name) for name in columns]))
+    
+    rows = query.order_by(Audiobook.created_at.desc(), Audiobook.id.desc()).limit(limit + 1).all()
+    audiobooks = rows[:limit]
+    next_cursor = encode_page_cursor(audiobooks[-1]) if len(rows) > limit else None
+    return audiobooks, next_cursor
+
+
+def encode_page_cursor(audiobook):
+    """Opaque cursor pointing just after an audiobook in (created_at, id) order"""
+    raw = json.dumps([audiobook.created_at.isoformat(), audiobook.id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_page_cursor(cursor):
+    """Decode a cursor from encode_page_cursor into (created_at, id)"""
+    try:
+        created_at, audiobook_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(audiobook_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
 def create_audiobook(user_id, title, author=None, voice_engine='gtts', voice_settings=None, 
                     source_type='upload', source_url=None, status='pending'):
     """
@@ -345,6 +498,80 @@ def create_audiobook(user_id, title, author=None, voice_engine='gtts', voice_set
         return None
 
 
+def find_existing_audiobooks(user_id, books):
+    """
+    Find which of several books are already in a user's collection, in one query.
+    
+    Args:
+        user_id: ID of the user
+        books: Iterable of (title, author) pairs
+    
+    Returns:
+        Dictionary of (title, author) -> (audiobook ID, status) for the pairs that exist
+    """
+    pairs = list(dict.fromkeys(books))
+    existing = {}
+    # Stay well under SQLite's bound-parameter limit on very large lists
+    for start in range(0, len(pairs), 400):
+        batch = pairs[start:start + 400]
+        rows = db.session.query(Audiobook.title, Audiobook.author, Audiobook.id, Audiobook.status).filter(
+            Audiobook.user_id == user_id,
+            db.tuple_(Audiobook.title, Audiobook.author).in_(batch)
+        ).all()
+        for title, author, audiobook_id, status in rows:
+            existing.setdefault((title, author), (audiobook_id, status))
+    return existing
+
+
+def create_audiobooks_bulk(user_id, books, voice_engine='gtts', voice_settings=None,
+                           source_type='search', status='saved'):
+    """
+    Create many audiobook entries in a single transaction.
+    
+    Args:
+        user_id: ID of the user creating the audiobooks
+        books: List of dictionaries with 'title', 'author' and optional 'download_url'
+        voice_engine: Voice engine to use
+        voice_settings: Dictionary of voice settings (optional)
+        source_type: 'search' or 'upload'
+        status: Initial status for every entry
+    
+    Returns:
+        List of new audiobook IDs in the order of books, or None if the insert failed
+    """
+    settings = json.dumps(voice_settings or {})
+    now = datetime.utcnow()
+    try:
+        audiobooks = [
+            Audiobook(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                title=book['title'],
+                author=book.get('author') or 'Unknown',
+                voice_engine=voice_engine,
+                voice_settings=settings,
+                source_type=source_type,
+                source_url=book.get('download_url', ''),
+                status=status,
+                created_at=now
+            )
+            for book in books
+        ]
+        # Read IDs before committing: the commit expires every object, and touching
+        # them afterwards would reload each one with its own SELECT
+        audiobook_ids = [audiobook.id for audiobook in audiobooks]
+        db.session.add_all(audiobooks)
+        db.session.commit()
+        
+        print(f"✅ Created {len(audiobooks)} audiobooks for user {user_id}")
+        return audiobook_ids
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to create {len(books)} audiobooks: {e}")
+        return None
+
+
 def update_audiobook_progress(audiobook_id, status=None, progress=None, total_pages=None, error_message=None):
     """
     Update audiobook progress and status.
@@ -381,6 +608,7 @@ def update_audiobook_progress(audiobook_id, status=None, progress=None, total_pa
         if error_message:
             audiobook.error_message = error_message
         
+        audiobook.heartbeat_at = datetime.utcnow()
         db.session.commit()
         return audiobook
         
@@ -390,6 +618,251 @@ def update_audiobook_progress(audiobook_id, status=None, progress=None, total_pa
         return None
 
 
+def enqueue_audiobook(audiobook_id, voice_engine=None, voice_settings=None):
+    """
+    Mark an audiobook as queued for conversion with the given voice settings.
+    
+    The queued state is persisted so that pending jobs survive a process restart.
+    
+    Args:
+        audiobook_id: Audiobook ID
+        voice_engine: Voice engine to convert with (optional, keeps current if None)
+        voice_settings: Dictionary of voice settings (optional, keeps current if None)
+    
+    Returns:
+        Audiobook object if successful, None otherwise
+    """
+    try:
+        audiobook = Audiobook.query.get(audiobook_id)
+        if not audiobook:
+            return None
+        
+        if voice_engine:
+            audiobook.voice_engine = voice_engine
+        if voice_settings is not None:
+            audiobook.set_voice_settings(voice_settings)
+        
+        audiobook.status = 'queued'
+        audiobook.queued_at = datetime.utcnow()
+        audiobook.progress = 0
+        audiobook.priority = 0
+        audiobook.error_message = None
+        
+        db.session.commit()
+        return audiobook
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to enqueue audiobook {audiobook_id}: {e}")
+        return None
+
+
+def enqueue_audiobooks_bulk(audiobook_ids, voice_engine=None, voice_settings=None):
+    """
+    Mark several audiobooks as queued with one UPDATE and one commit.
+    
+    Audiobooks already queued or processing are left untouched.
+    
+    Args:
+        audiobook_ids: Audiobook IDs
+        voice_engine: Voice engine to convert with (optional, keeps current if None)
+        voice_settings: Dictionary of voice settings (optional, keeps current if None)
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    values = {
+        'status': 'queued',
+        'queued_at': datetime.utcnow(),
+        'progress': 0,
+        'priority': 0,
+        'error_message': None
+    }
+    if voice_engine:
+        values['voice_engine'] = voice_engine
+    if voice_settings is not None:
+        values['voice_settings'] = json.dumps(voice_settings)
+    
+    try:
+        audiobook_ids = list(audiobook_ids)
+        for start in range(0, len(audiobook_ids), 500):
+            Audiobook.query.filter(
+                Audiobook.id.in_(audiobook_ids[start:start + 500]),
+                Audiobook.status.notin_(('queued', 'processing'))
+            ).update(values, synchronize_session=False)
+        db.session.commit()
+        return True
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to enqueue {len(audiobook_ids)} audiobooks: {e}")
+        return False
+
+
+def set_audiobooks_status(audiobook_ids, status):
+    """Set the status of several audiobooks with one UPDATE (e.g. to undo a bulk enqueue)"""
+    try:
+        audiobook_ids = list(audiobook_ids)
+        for start in range(0, len(audiobook_ids), 500):
+            Audiobook.query.filter(Audiobook.id.in_(audiobook_ids[start:start + 500])).update(
+                {'status': status}, synchronize_session=False
+            )
+        db.session.commit()
+        return True
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to update status of {len(audiobook_ids)} audiobooks: {e}")
+        return False
+
+
+def claim_queued_audiobook(audiobook_id):
+    """
+    Atomically move a queued audiobook to 'processing'.
+    
+    The conditional UPDATE guarantees that only one worker (in this or any other
+    process sharing the database) runs a given job.
+    
+    Args:
+        audiobook_id: Audiobook ID
+    
+    Returns:
+        True if this caller claimed the job, False otherwise
+    """
+    try:
+        claimed = Audiobook.query.filter_by(id=audiobook_id, status='queued').update(
+            {'status': 'processing', 'started_at': datetime.utcnow(), 'heartbeat_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return claimed == 1
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to claim audiobook {audiobook_id}: {e}")
+        return False
+
+
+def requeue_interrupted_audiobooks(stale_before=None):
+    """
+    Put conversions left 'processing' by a process that died back in the queue.
+    
+    They keep their original queued_at, so they run before newer jobs, and
+    resume from the pages already synthesized (see the audio manifest).
+    
+    Args:
+        stale_before: Only requeue jobs whose last heartbeat is older than this
+                      datetime (None = every processing job, for a single node
+                      that has just started and so can't be running any)
+    
+    Returns:
+        Number of audiobooks requeued
+    """
+    try:
+        query = Audiobook.query.filter(Audiobook.status == 'processing')
+        if stale_before is not None:
+            last_seen = db.func.coalesce(Audiobook.heartbeat_at, Audiobook.started_at, Audiobook.created_at)
+            query = query.filter(last_seen < stale_before)
+        requeued = query.update({'status': 'queued', 'error_message': None}, synchronize_session=False)
+        db.session.commit()
+        return requeued
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to requeue interrupted audiobooks: {e}")
+        return 0
+
+
+def get_queued_audiobooks():
+    """
+    Get all audiobooks waiting for conversion, oldest first.
+    
+    Returns:
+        List of Audiobook objects with status 'queued'
+    """
+    return Audiobook.query.filter_by(status='queued').order_by(
+        Audiobook.queued_at.asc(), Audiobook.created_at.asc()
+    ).all()
+
+
+def get_queued_jobs(limit=None):
+    """
+    Get (audiobook ID, user ID, priority) of audiobooks waiting for conversion,
+    highest priority first, then oldest.
+    
+    Lighter than get_queued_audiobooks for pollers and queue position lookups.
+    
+    Args:
+        limit: Maximum number of jobs (all if None)
+    """
+    query = db.session.query(Audiobook.id, Audiobook.user_id, Audiobook.priority).filter(Audiobook.status == 'queued').order_by(
+        Audiobook.priority.desc(), Audiobook.queued_at.asc(), Audiobook.created_at.asc(), Audiobook.id.asc()
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [tuple(row) for row in query.all()]
+
+
+def get_audiobook_statuses(audiobook_ids):
+    """
+    Get the status of several audiobooks with one query.
+    
+    Returns:
+        Dictionary of audiobook ID -> status (deleted audiobooks are missing)
+    """
+    audiobook_ids = list(audiobook_ids)
+    statuses = {}
+    for start in range(0, len(audiobook_ids), 500):
+        rows = db.session.query(Audiobook.id, Audiobook.status).filter(
+            Audiobook.id.in_(audiobook_ids[start:start + 500])
+        ).all()
+        statuses.update(rows)
+    return statuses
+
+
+def set_audiobook_priority(audiobook_id, priority):
+    """
+    Set the queue priority of an audiobook.
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        updated = Audiobook.query.filter_by(id=audiobook_id).update({'priority': priority}, synchronize_session=False)
+        db.session.commit()
+        return updated == 1
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to set priority of audiobook {audiobook_id}: {e}")
+        return False
+
+
+def cancel_audiobook_conversion(audiobook_id):
+    """
+    Take an audiobook out of conversion: a queued or processing audiobook goes
+    back to 'saved'.
+    
+    The conditional UPDATE keeps workers from claiming the job afterwards, and
+    worker nodes running it see the status change and stop.
+    
+    Returns:
+        True if a conversion was cancelled, False otherwise
+    """
+    try:
+        cancelled = Audiobook.query.filter(
+            Audiobook.id == audiobook_id,
+            Audiobook.status.in_(('queued', 'processing'))
+        ).update({'status': 'saved', 'progress': 0, 'priority': 0}, synchronize_session=False)
+        db.session.commit()
+        return cancelled == 1
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Failed to cancel conversion of audiobook {audiobook_id}: {e}")
+        return False
+
+
 def delete_audiobook(audiobook_id, user_id=None):
     """
     Delete an audiobook (with optional user verification).
@@ -430,17 +903,5 @@ def get_database_stats():
     Returns:
         Dictionary with user and audiobook counts
     """
-    try:
-        user_count = User.query.count()
-        audiobook_count = Audiobook.query.count()
-        completed_count = Audiobook.query.filter_by(status='completed').count()
-        
-        return {
-            'users': user_count,
-            'audiobooks': audiobook_count,
-            'completed': completed_count,
-            'success_rate': f"{(completed_count/audiobook_count*100):.1f}%" if audiobook_count > 0 else "0%"
-        }
-    except Exception as e:
-        print(f"❌ Failed to get database stats: {e}")
-        return {'users': 0, 'audiobooks': 0, 'completed': 0, 'success_rate': '0%'}
+    from stats import get_global_stats  # stats imports this module
+    return get_global_stats()
@@ -0,0 +1,275 @@
+"""
+Database Write Queue
+====================
+
+Single-writer queue for background database writes (conversion progress,
+page counts).
+
+SQLite allows one writer at a time. With every converter thread committing
+on its own, writers queue up on the database lock, hit busy timeouts
+("database is locked"), and hold up web requests that need to write. Routing
+background writes through one thread means at most one of them holds the
+lock at any moment, and a burst of progress updates for the same audiobook
+collapses into a single write.
+
+Features:
+- One daemon thread runs writes in submission order, inside the app context
+- Keyed writes coalesce: a newer write replaces a pending one with the same key
+- Optional wait for writes that must land before the caller continues
+- Bounded backlog: submit() blocks when too many writes are pending
+- Benchmark: python db_writer.py --books 8 compares tuned SQLite plus the
+  writer queue against SQLite defaults with every thread committing
+"""
+
+import itertools
+import threading
+import time
+from collections import Counter, OrderedDict
+
+
+class _Write:
+    """A pending write and the callers waiting for it"""
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.replaced = None  # Older write with the same key that this one superseded
+
+
+class DatabaseWriter:
+    """Runs database writes on one background thread"""
+
+    def __init__(self, app, max_pending=10000):
+        """
+        Args:
+            app: Flask application (writes run inside its app context)
+            max_pending: Pending writes before submit() blocks
+        """
+        self.app = app
+        self.max_pending = max_pending
+        self.stats = Counter()
+
+        self._pending = OrderedDict()  # key -> _Write, oldest first
+        self._condition = threading.Condition()
+        self._ids = itertools.count()
+        self._thread = None
+
+    def start(self):
+        """Start the writer thread (idempotent)"""
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, fn, *args, key=None, wait=False, **kwargs):
+        """
+        Queue fn(*args, **kwargs) to run on the writer thread.
+
+        Args:
+            fn: Function performing (and committing) the write
+            key: Optional coalescing key; a pending write with the same key is
+                 replaced by this one (it keeps its place in the queue)
+            wait: Block until the write has run and return its result
+
+        Returns:
+            The function's result if wait is set, otherwise None
+
+        Raises:
+            The function's exception if wait is set
+        """
+        self.start()
+        with self._condition:
+            while len(self._pending) >= self.max_pending and key not in self._pending:
+                self.stats['backpressure_waits'] += 1
+                self._condition.wait()
+
+            write = _Write(fn, args, kwargs)
+            if key is None:
+                key = ('write', next(self._ids))
+            replaced = self._pending.get(key)
+            if replaced is not None:
+                # Whoever waited on the old write now waits on this one
+                write.done = replaced.done
+                write.replaced = replaced
+                self.stats['coalesced'] += 1
+            self._pending[key] = write
+            self.stats['submitted'] += 1
+            self._condition.notify_all()
+
+        if wait:
+            write.done.wait()
+            if write.error:
+                raise write.error
+            return write.result
+        return None
+
+    def flush(self, timeout=None):
+        """
+        Wait until every write submitted so far has run.
+
+        Returns:
+            False if the timeout expired first
+        """
+        marker = _Write(lambda: None, (), {})
+        self.start()
+        with self._condition:
+            self._pending[('flush', next(self._ids))] = marker
+            self._condition.notify_all()
+        return marker.done.wait(timeout)
+
+    def get_stats(self):
+        with self._condition:
+            return {
+                'submitted': self.stats['submitted'],
+                'written': self.stats['written'],
+                'coalesced': self.stats['coalesced'],
+                'errors': self.stats['errors'],
+                'backpressure_waits': self.stats['backpressure_waits'],
+                'pending': len(self._pending)
+            }
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                _, write = self._pending.popitem(last=False)
+                self._condition.notify_all()  # Room for blocked submitters
+
+            try:
+                with self.app.app_context():
+                    write.result = write.fn(*write.args, **write.kwargs)
+                self.stats['written'] += 1
+            except Exception as e:
+                write.error = e
+                self.stats['errors'] += 1
+                print(f"❌ Background database write failed: {e}")
+            finally:
+                superseded = write.replaced
+                while superseded is not None:
+                    superseded.result, superseded.error = write.result, write.error
+                    superseded = superseded.replaced
+                write.done.set()
+
+
+def benchmark(books=8, updates=200, web_requests=100, tuned=True):
+    """
+    Converters writing progress while a web thread serves reads and writes.
+
+    Baseline (tuned=False): SQLite defaults, every converter thread commits on
+    its own. Tuned: WAL pragmas, converter writes go through one DatabaseWriter.
+
+    Args:
+        books: Converter threads, one audiobook each
+        updates: Progress writes per converter
+        web_requests: Web reads and writes, timed while converters run
+        tuned: Run the tuned setup instead of the baseline
+
+    Returns:
+        Dictionary with converter write throughput, failed writes and web
+        latencies. Throughput counts writes that reached the database in both
+        modes; the writer queue's submitted and coalesced counts are reported
+        separately under 'writer_queue'
+    """
+    import os
+    import statistics
+    import tempfile
+
+    from flask import Flask
+
+    from database import create_audiobook, get_user_audiobooks, init_database, update_audiobook_progress
+
+    tmp_dir = tempfile.mkdtemp(prefix='db-writer-bench-')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['DB_PATH'] = os.path.join(tmp_dir, 'bench.db')
+    os.environ['SQLITE_TUNED'] = '1' if tuned else '0'
+    app = Flask(__name__)
+    if not init_database(app):
+        raise RuntimeError('Database initialization failed')
+
+    with app.app_context():
+        audiobook_ids = [create_audiobook('bench-user', f"Book {i}", status='processing').id for i in range(books + 1)]
+    web_audiobook_id = audiobook_ids.pop()
+    writer = DatabaseWriter(app) if tuned else None
+    failed = Counter()
+    persisted = Counter()
+    counts_lock = threading.Lock()
+
+    def write_progress(audiobook_id, progress):
+        """Write one progress update, counting whether it reached the database"""
+        written = update_audiobook_progress(audiobook_id, progress=progress) is not None
+        with counts_lock:
+            (persisted if written else failed)['converter'] += 1
+
+    def convert(audiobook_id):
+        for update in range(updates):
+            progress = update * 100 // updates
+            if writer:
+                writer.submit(write_progress, audiobook_id, progress, key=('progress', audiobook_id))
+                continue
+            with app.app_context():
+                write_progress(audiobook_id, progress)
+
+    latencies = {'read': [], 'write': []}
+
+    def serve():
+        for request in range(web_requests):
+            kind = 'read' if request % 2 else 'write'
+            started = time.perf_counter()
+            with app.app_context():
+                if kind == 'read':
+                    get_user_audiobooks('bench-user')
+                elif update_audiobook_progress(web_audiobook_id, progress=request % 100) is None:
+                    with counts_lock:
+                        failed['web'] += 1
+            latencies[kind].append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=convert, args=(audiobook_id,)) for audiobook_id in audiobook_ids]
+    threads.append(threading.Thread(target=serve))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if writer:
+        writer.flush()
+    seconds = time.perf_counter() - started
+
+    def percentile(values, fraction):
+        return round(sorted(values)[min(len(values) - 1, int(len(values) * fraction))], 2) if values else None
+
+    writer_stats = writer.get_stats() if writer else None
+    return {
+        'mode': 'tuned + writer queue' if tuned else 'baseline',
+        'converter_updates': books * updates,
+        'persisted_writes': persisted['converter'],
+        'failed_writes': failed['converter'] + failed['web'],
+        'seconds': round(seconds, 2),
+        # Writes that reached the database; coalesced updates never do, so they don't count
+        'converter_writes_per_second': round(persisted['converter'] / seconds, 1),
+        'writer_queue': {
+            'submitted': writer_stats['submitted'],
+            'coalesced': writer_stats['coalesced']
+        } if writer_stats else None,
+        'web_read_ms_median': round(statistics.median(latencies['read']), 2) if latencies['read'] else None,
+        'web_read_ms_p95': percentile(latencies['read'], 0.95),
+        'web_write_ms_median': round(statistics.median(latencies['write']), 2) if latencies['write'] else None,
+        'web_write_ms_p95': percentile(latencies['write'], 0.95)
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Progress writes and web latency: SQLite defaults vs tuned SQLite plus writer queue')
+    parser.add_argument('--books', type=int, default=8, help='Concurrent converters')
+    parser.add_argument('--updates', type=int, default=200, help='Progress writes per converter')
+    parser.add_argument('--web-requests', type=int, default=100)
+    args = parser.parse_args()
+    results = [benchmark(args.books, args.updates, args.web_requests, tuned=tuned) for tuned in (False, True)]
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,171 @@
+"""
+Outbound HTTP Client
+====================
+
+Shared, thread-safe HTTP client for all upstream traffic (Open Library,
+archive.org).
+
+Features:
+- One requests.Session with per-host keep-alive connection pools
+- Retries with exponential backoff on 429 and 5xx (honouring Retry-After)
+- Per-host concurrency limits
+- Metrics: requests, new connections (TCP/TLS handshakes) and pool reuse per host
+"""
+
+import threading
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = 'AudioGen/1.0 (https://github.com/audiobook-app)'
+
+
+class HTTPMetrics:
+    """Thread-safe per-host request and connection counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = defaultdict(Counter)
+
+    def record(self, host, name, amount=1):
+        with self._lock:
+            self._hosts[host][name] += amount
+
+    def get_stats(self):
+        with self._lock:
+            stats = {}
+            for host, counters in self._hosts.items():
+                requests_made = counters['requests']
+                opened = counters['connections_opened']
+                stats[host] = {
+                    'requests': requests_made,
+                    'errors': counters['errors'],
+                    'handshakes': opened,
+                    'reused': max(0, requests_made - opened),
+                    'reuse_rate': f"{(max(0, requests_made - opened)/requests_made*100):.1f}%" if requests_made else "0%",
+                    'waited_for_slot': counters['waited_for_slot']
+                }
+            return stats
+
+
+def _counting_pool(base, metrics):
+    """Connection pool class that records every socket connect (i.e. every handshake)"""
+
+    class CountingConnection(base.ConnectionCls):
+        def connect(self):
+            metrics.record(self.host, 'connections_opened')
+            return super().connect()
+
+    class CountingConnectionPool(base):
+        ConnectionCls = CountingConnection
+
+    return CountingConnectionPool
+
+
+class _InstrumentedAdapter(HTTPAdapter):
+    def __init__(self, metrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self.metrics),
+            'https': _counting_pool(HTTPSConnectionPool, self.metrics)
+        }
+
+
+class HTTPClient:
+    """Pooled keep-alive HTTP client with retries and per-host concurrency limits"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=20, retries=3, backoff_factor=0.5,
+                 host_concurrency=8, host_limits=None, user_agent=DEFAULT_USER_AGENT):
+        """
+        Args:
+            pool_connections: Number of per-host pools kept open
+            pool_maxsize: Keep-alive connections kept per host
+            retries: Retries for connection errors, 429 and 5xx responses
+            backoff_factor: Exponential backoff base in seconds between retries
+            host_concurrency: Default limit of simultaneous requests per host
+            host_limits: Optional dict of host -> concurrency limit overrides
+            user_agent: Default User-Agent header
+        """
+        self.metrics = HTTPMetrics()
+        self.host_concurrency = host_concurrency
+        self.host_limits = host_limits or {}
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = _InstrumentedAdapter(
+            self.metrics,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self._host_slots = {}
+
+    def get(self, url, **kwargs):
+        """
+        Same as requests.get, through the shared pools.
+
+        Streamed responses hold their host slot until they are closed, so use
+        them as context managers.
+        """
+        host = urlsplit(url).hostname or ''
+        slot = self._host_slot(host)
+        if not slot.acquire(blocking=False):
+            self.metrics.record(host, 'waited_for_slot')
+            slot.acquire()
+
+        try:
+            self.metrics.record(host, 'requests')
+            response = self.session.get(url, **kwargs)
+        except Exception:
+            self.metrics.record(host, 'errors')
+            slot.release()
+            raise
+
+        if not kwargs.get('stream'):
+            slot.release()
+            return response
+
+        released = threading.Event()
+        original_close = response.close
+
+        def close():
+            try:
+                original_close()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    slot.release()
+
+        response.close = close
+        return response
+
+    def get_stats(self):
+        return self.metrics.get_stats()
+
+    def _host_slot(self, host):
+        with self._lock:
+            if host not in self._host_slots:
+                limit = self.host_limits.get(host, self.host_concurrency)
+                self._host_slots[host] = threading.BoundedSemaphore(max(1, limit))
+            return self._host_slots[host]
@@ -0,0 +1,196 @@
+"""
+Audio Manifest
+==============
+
+Per-audiobook record of the audio the converter has produced, written next to
+the audio in the output folder as <audiobook_id>.manifest.json.
+
+Features:
+- Pages with their chunk files, durations, byte sizes and SHA-256 hashes
+- Updated by the converter as pages finish, so page listings never need to
+  probe the filesystem
+- Records packed output (byte offset and start time of every page)
+- Text cleaning stats (characters saved before synthesis)
+- Checkpoints: the text hash of every extracted page and the voice settings
+  the audio was made with, so an interrupted conversion resumes from the
+  first page that is missing or no longer matches
+- Atomic writes: readers never see a half-written manifest
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import audio_pack
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(output_folder, audiobook_id):
+    return os.path.join(output_folder, f"{audiobook_id}.manifest.json")
+
+
+def describe_audio(path):
+    """Get the file name, duration, size and SHA-256 hash of an MP3 file"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    duration = sum(frame_duration for _, _, frame_duration in audio_pack.iter_frames(data))
+    return {
+        'file': os.path.basename(path),
+        'duration': round(duration, 3),
+        'bytes': len(data),
+        'sha256': hashlib.sha256(data).hexdigest()
+    }
+
+
+class AudioManifest:
+    """Pages of synthesized audio for one audiobook"""
+
+    def __init__(self, path, audiobook_id, pages=None, packed=False, text_stats=None,
+                 synthesis_key=None, extracted=None):
+        """
+        Args:
+            path: Manifest file path
+            audiobook_id: Audiobook the audio belongs to
+            pages: Dictionary of page number -> page entry
+            packed: Whether the pages live in a single packed file
+            text_stats: Text cleaning stats (see text_cleaning.TextCleaner.get_stats)
+            synthesis_key: Identifies the voice settings the pages were synthesized with
+            extracted: Dictionary of page number -> SHA-256 of the page's text
+        """
+        self.path = path
+        self.audiobook_id = audiobook_id
+        self.pages = pages or {}
+        self.packed = packed
+        self.text_stats = text_stats
+        self.synthesis_key = synthesis_key
+        self.extracted = extracted or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load a manifest, or None if there is none"""
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        pages = {int(number): entry for number, entry in data.get('pages', {}).items()}
+        extracted = {int(number): digest for number, digest in data.get('extracted', {}).items()}
+        return cls(path, data.get('audiobook_id'), pages, data.get('packed', False), data.get('text_cleaning'),
+                   data.get('synthesis_key'), extracted)
+
+    def begin(self, synthesis_key):
+        """
+        Start (or resume) a conversion. Pages made with other voice settings, or
+        whose files are gone (packed output), are discarded.
+
+        Returns:
+            Number of pages kept as checkpoints
+        """
+        with self._lock:
+            if synthesis_key != self.synthesis_key:
+                self.pages = {}
+                self.extracted = {}
+                self.synthesis_key = synthesis_key
+            self.packed = False  # Packed output is rebuilt when the conversion finishes
+            folder = os.path.dirname(self.path)
+            self.pages = {
+                number: entry for number, entry in self.pages.items()
+                if entry.get('chunks') and all(os.path.exists(os.path.join(folder, chunk['file'])) for chunk in entry['chunks'])
+            }
+            return len(self.pages)
+
+    def set_extracted(self, page_number, text_sha256):
+        """Record the text hash of an extracted page"""
+        with self._lock:
+            self.extracted[page_number] = text_sha256
+
+    def reusable_page(self, page_number, text_sha256, chunk_count):
+        """
+        Get the audio of a page synthesized before, if it can be reused as is.
+
+        The page must have been made from the same text with the same number of
+        chunks, and its chunk files must still be on disk with the recorded hashes.
+
+        Returns:
+            List of chunk paths, or None if the page has to be synthesized
+        """
+        with self._lock:
+            entry = self.pages.get(page_number)
+        if not entry or entry.get('text_sha256') != text_sha256 or len(entry.get('chunks', ())) != chunk_count:
+            return None
+
+        folder = os.path.dirname(self.path)
+        paths = []
+        for chunk in entry['chunks']:
+            path = os.path.join(folder, chunk['file'])
+            try:
+                with open(path, 'rb') as file:
+                    if hashlib.sha256(file.read()).hexdigest() != chunk['sha256']:
+                        return None
+            except OSError:
+                return None
+            paths.append(path)
+        return paths
+
+    def add_page(self, page_number, paths, text_sha256=None):
+        """Record a finished page from its chunk files (in chunk order) and the hash of its text"""
+        chunks = [describe_audio(path) for path in paths]
+        with self._lock:
+            self.pages[page_number] = {
+                'chunks': chunks,
+                'duration': round(sum(chunk['duration'] for chunk in chunks), 3),
+                'bytes': sum(chunk['bytes'] for chunk in chunks),
+                'text_sha256': text_sha256
+            }
+
+    def set_packed(self, index):
+        """Record where every page is in a packed file (see audio_pack.pack_pages)"""
+        with self._lock:
+            for entry in index['pages']:
+                page = self.pages.setdefault(entry['page'], {'chunks': []})
+                page.update({
+                    'offset': entry['offset'],
+                    'length': entry['length'],
+                    'start': entry['start'],
+                    'duration': entry['duration']
+                })
+            self.packed = True
+
+    def set_text_stats(self, stats):
+        """Record how much text cleaning removed before synthesis"""
+        with self._lock:
+            self.text_stats = stats
+
+    def get_page(self, page_number):
+        return self.pages.get(page_number)
+
+    def last_page(self):
+        return max(self.pages) if self.pages else 0
+
+    def total_duration(self):
+        return round(sum(page.get('duration', 0) for page in self.pages.values()), 3)
+
+    def save(self):
+        with self._lock:
+            data = self.to_dict()
+        tmp_path = f"{self.path}.part"
+        with open(tmp_path, 'w') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+
+    def to_dict(self):
+        return {
+            'version': MANIFEST_VERSION,
+            'audiobook_id': self.audiobook_id,
+            'packed': self.packed,
+            'total_duration': self.total_duration(),
+            'total_bytes': sum(page.get('bytes', page.get('length', 0)) for page in self.pages.values()),
+            'text_cleaning': self.text_stats,
+            'synthesis_key': self.synthesis_key,
+            'extracted': {str(number): digest for number, digest in sorted(self.extracted.items())},
+            'pages': {str(number): entry for number, entry in sorted(self.pages.items())}
+        }
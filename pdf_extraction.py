@@ -0,0 +1,151 @@
+"""
+PDF Text Extraction
+===================
+
+Page text extraction for the converter, either in-process or sharded across a
+pool of worker processes for large books.
+
+This module only depends on PyPDF2 so that worker processes can import it
+without loading the Flask application.
+
+Worker processes start from a forkserver (spawn where there is none), so they
+never inherit the threads and locks of the running web app. Those start
+methods re-run the main script in every worker, so entry points (app_simple.py,
+worker.py) must not start background work when imported as __mp_main__.
+"""
+
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2
+
+# Workers start from a clean server process rather than forking the threaded web app
+_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def count_pages(pdf_path):
+    """Get the number of pages in a PDF"""
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def extract_page_range(pdf_path, start, stop):
+    """
+    Extract the text of pages [start, stop) (0-based).
+
+    Runs inside worker processes, so errors are returned rather than raised:
+    a page that fails to extract doesn't lose the rest of its shard.
+
+    Returns:
+        List of (page_number, text, error) tuples with 1-based page numbers
+    """
+    results = []
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for i in range(start, stop):
+            try:
+                results.append((i + 1, pdf_reader.pages[i].extract_text(), None))
+            except Exception as e:
+                results.append((i + 1, None, str(e)))
+    return results
+
+
+def get_process_pool(workers):
+    """Get the shared extraction process pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(_START_METHOD))
+        return _pool
+
+
+def reset_process_pool(broken_pool):
+    """
+    Drop a pool whose worker crashed, so the next get_process_pool() builds a
+    new one. Books that hit the same broken pool only replace it once.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is broken_pool:
+            _pool = None
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_page_texts(pdf_path, total_pages, workers=1, shard_size=25):
+    """
+    Yield (page_number, text, error) for every page, in page order.
+
+    With more than one worker the page range is split into shards of
+    shard_size pages that are extracted in parallel processes. Only a few
+    shards per worker are in flight at a time, so results stream out in order
+    without holding the whole book in memory.
+
+    If a worker process dies, the pool is replaced and the unfinished shards
+    are retried once; if the new pool breaks too, the rest of the book is
+    extracted in-process.
+
+    Args:
+        pdf_path: Path to the PDF file
+        total_pages: Number of pages in the PDF
+        workers: Number of extraction processes (1 = extract in-process)
+        shard_size: Pages per shard sent to a worker process
+    """
+    if workers <= 1:
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for i, page in enumerate(pdf_reader.pages):
+                try:
+                    yield (i + 1, page.extract_text(), None)
+                except Exception as e:
+                    yield (i + 1, None, str(e))
+        return
+
+    pool = None
+    shard_starts = iter(range(0, total_pages, shard_size))
+    pending = deque()  # [shard start, future], in page order
+
+    def submit(entry):
+        start = entry[0]
+        entry[1] = pool.submit(extract_page_range, pdf_path, start, min(start + shard_size, total_pages))
+
+    def submit_next():
+        start = next(shard_starts, None)
+        if start is None:
+            return False
+        pending.append([start, None])  # Recorded first, so a failed submit doesn't lose the shard
+        submit(pending[-1])
+        return True
+
+    try:
+        for attempt in range(2):  # The shared pool, then one new pool if a worker crashed
+            pool = get_process_pool(workers)
+            try:
+                for entry in pending:  # Shards a crashed pool never finished
+                    submit(entry)
+                while len(pending) < workers * 2 and submit_next():
+                    pass
+                while pending:
+                    shard = pending[0][1].result()
+                    submit_next()  # Before the shard leaves pending, so a crash here retries it
+                    pending.popleft()
+                    yield from shard
+                return
+            except BrokenProcessPool:
+                reset_process_pool(pool)
+                print(f"⚠️ PDF extraction worker crashed while extracting {pdf_path}")
+
+        print(f"⚠️ Extracting the rest of {pdf_path} in-process")
+        starts = [entry[0] for entry in pending] + list(shard_starts)
+        pending.clear()
+        for start in starts:
+            yield from extract_page_range(pdf_path, start, min(start + shard_size, total_pages))
+    finally:
+        for entry in pending:
+            if entry[1] is not None:
+                entry[1].cancel()
@@ -0,0 +1,139 @@
+"""
+Conversion Progress Reporting
+=============================
+
+Coalesces conversion progress updates before they hit the database and
+Socket.IO.
+
+A long book reports progress for every page (and every download chunk), but
+listeners only need a few updates per second and the database only needs the
+latest whole percent every few seconds. Terminal states ('completed',
+'failed', 'cancelled') and status changes are always delivered.
+
+Running jobs also write at least once a minute: the database row's
+heartbeat_at tells worker nodes which 'processing' jobs are still alive.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from database import update_audiobook_progress
+
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+# Totals across every reporter in this process
+totals = Counter()
+_totals_lock = threading.Lock()
+
+
+class ProgressReporter:
+    """Rate-limited progress updates for one audiobook conversion"""
+
+    def __init__(self, app, socketio, audiobook_id, db_interval=2.0, emit_interval=0.5, log_prefix='', writer=None,
+                 heartbeat_interval=60.0):
+        """
+        Args:
+            app: Flask application (database writes run inside its app context)
+            socketio: SocketIO instance used for 'conversion_progress' events
+            audiobook_id: Audiobook being converted (also the Socket.IO room)
+            db_interval: Minimum seconds between progress writes to the database
+            emit_interval: Minimum seconds between Socket.IO events with the same status
+            log_prefix: Prefix for log lines
+            writer: Optional DatabaseWriter; progress writes are queued on it
+                    (terminal writes wait until they are stored)
+            heartbeat_interval: Write at least this often, even if the percent is
+                                unchanged, so the job isn't mistaken for a crashed one
+        """
+        self.app = app
+        self.socketio = socketio
+        self.audiobook_id = audiobook_id
+        self.db_interval = db_interval
+        self.emit_interval = emit_interval
+        self.log_prefix = log_prefix
+        self.writer = writer
+        self.heartbeat_interval = heartbeat_interval
+        self.counters = Counter()
+
+        self._lock = threading.Lock()
+        self._last_status = None
+        self._last_emit = 0.0
+        self._last_write = 0.0
+        self._last_percent = None
+
+    def report(self, status, progress=None, message=""):
+        now = time.monotonic()
+        terminal = status in TERMINAL_STATUSES
+        percent = int(progress) if progress is not None else None
+
+        with self._lock:
+            should_emit = terminal or status != self._last_status or now - self._last_emit >= self.emit_interval
+            self._last_status = status
+            if should_emit:
+                self._last_emit = now
+
+            should_write = terminal or now - self._last_write >= self.heartbeat_interval or (
+                percent is not None
+                and percent != self._last_percent
+                and now - self._last_write >= self.db_interval
+            )
+            if should_write:
+                self._last_write = now
+                if percent is not None:
+                    self._last_percent = percent
+
+            self._count('emits' if should_emit else 'emits_skipped')
+            if should_write:
+                self._count('db_writes')
+            elif percent is not None:
+                self._count('db_writes_skipped')
+
+        if should_emit:
+            print(f"{self.log_prefix} {status}: {message}")
+            self.socketio.emit('conversion_progress', {
+                'status': status,
+                'progress': progress,
+                'message': message,
+                'audiobook_id': self.audiobook_id
+            }, room=self.audiobook_id)
+
+        if should_write:
+            if status == 'completed':
+                changes = {'status': 'completed', 'progress': 100}
+            elif status == 'failed':
+                changes = {'status': 'failed', 'error_message': message}
+            elif status == 'cancelled':
+                changes = None  # Whoever cancelled already changed (or deleted) the row
+            else:
+                changes = {'progress': progress}
+            
+            if changes is None:
+                pass
+            elif self.writer:
+                # Newer progress for this book replaces a write still waiting in the queue
+                self.writer.submit(update_audiobook_progress, self.audiobook_id, key=(self.audiobook_id, 'progress'),
+                                   wait=terminal, **changes)
+            else:
+                with self.app.app_context():
+                    update_audiobook_progress(self.audiobook_id, **changes)
+
+        if terminal:
+            print(f"{self.log_prefix} Progress: {self.counters['db_writes']} DB writes "
+                  f"({self.counters['db_writes_skipped']} avoided), {self.counters['emits']} events "
+                  f"({self.counters['emits_skipped']} avoided)")
+
+    def _count(self, name):
+        self.counters[name] += 1
+        with _totals_lock:
+            totals[name] += 1
+
+
+def get_progress_stats():
+    """Get process-wide counts of progress writes and events sent and avoided"""
+    with _totals_lock:
+        return {
+            'db_writes': totals['db_writes'],
+            'db_writes_skipped': totals['db_writes_skipped'],
+            'emits': totals['emits'],
+            'emits_skipped': totals['emits_skipped']
+        }
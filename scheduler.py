@@ -0,0 +1,563 @@
+"""
+Conversion Scheduler
+====================
+
+Bounded worker pool that runs audiobook conversions in the background.
+
+Features:
+- Fixed number of worker threads instead of one thread per request
+- FIFO queue per user, served round-robin so one user can't starve the others
+- Backpressure: submissions are rejected once the queue is full
+- Queued jobs are persisted in the audiobooks table and restored on startup
+- Worker-node mode: jobs queued by web nodes are pulled from the database as
+  workers go idle and claimed atomically, so several nodes can share a queue
+- DatabaseQueue: submission-only queue for web nodes that run no conversions;
+  its positions use the same per-user fairness as the workers
+- Jobs may run on an event loop instead of a worker thread: run_job returns a
+  Future and the job's slot stays taken until it completes
+- Crash recovery: jobs left 'processing' by a dead process are requeued (all of
+  them on a single node's startup, stale ones when worker nodes poll)
+- Priorities: jobs with a priority above 0 run before the round-robin, jobs
+  below 0 after it; queued jobs can be reprioritized or cancelled
+- Worker nodes stop running jobs that were cancelled or deleted elsewhere
+"""
+
+import functools
+import threading
+import time
+from datetime import datetime, timedelta
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from database import (
+    claim_queued_audiobook, get_audiobook_statuses, get_queued_audiobooks, get_queued_jobs,
+    requeue_interrupted_audiobooks
+)
+
+
+class QueueFullError(Exception):
+    """Raised when the conversion queue has no room for another job"""
+
+    def __init__(self, queue_length):
+        super().__init__(f"Conversion queue is full ({queue_length} jobs waiting)")
+        self.queue_length = queue_length
+
+
+def fair_order(jobs):
+    """
+    Order queued jobs the way ConversionScheduler serves them.
+
+    Args:
+        jobs: (audiobook_id, user_id, priority) tuples, highest priority first,
+              then oldest (as returned by get_queued_jobs)
+
+    Returns:
+        List of audiobook IDs: jobs with a priority above 0, then one job per
+        user in turn, then jobs with a priority below 0
+    """
+    boosted, user_queues, lowered = [], OrderedDict(), []
+    for audiobook_id, user_id, priority in jobs:
+        if priority:
+            (boosted if priority > 0 else lowered).append(audiobook_id)
+        else:
+            user_queues.setdefault(user_id, []).append(audiobook_id)
+
+    ordered = boosted
+    queues = list(user_queues.values())
+    depth = 0
+    while True:
+        round_jobs = [q[depth] for q in queues if depth < len(q)]
+        if not round_jobs:
+            return ordered + lowered
+        ordered.extend(round_jobs)
+        depth += 1
+
+
+class ConversionScheduler:
+    """
+    Run conversion jobs on a fixed pool of worker threads.
+
+    Jobs are identified by audiobook ID. Each user has their own FIFO queue and
+    workers take the next job from each user in turn, so a burst from one user
+    only delays that user's own books. Prioritized jobs (priority above 0) skip
+    the round-robin, highest first; deprioritized ones (below 0) wait for it.
+    """
+
+    def __init__(self, app, run_job, workers=2, max_queue=100, poll_interval=0, dispatch_threads=None, stale_after=600,
+                 cancel_job=None):
+        """
+        Args:
+            app: Flask application (jobs run inside its app context)
+            run_job: Callable taking an audiobook ID, runs one conversion; it may
+                     instead start the conversion and return a Future
+            workers: Number of conversions allowed to run at the same time
+            max_queue: Maximum number of jobs waiting to run
+            poll_interval: Seconds between database polls for jobs queued by
+                           other processes (0 = only jobs submitted here)
+            dispatch_threads: Threads taking jobs off the queue (default: one
+                              per worker). Jobs returning a Future only hold a
+                              thread while starting, so one thread is enough.
+            stale_after: Seconds without a heartbeat after which a polling node
+                         treats another node's 'processing' job as crashed
+            cancel_job: Callable taking an audiobook ID and whether it was deleted;
+                        a polling node calls it for running jobs that were
+                        cancelled or deleted by another node
+        """
+        self.app = app
+        self.run_job = run_job
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.poll_interval = poll_interval
+        self.dispatch_threads = max(1, dispatch_threads or self.workers)
+        self.stale_after = stale_after
+        self.cancel_job = cancel_job
+
+        self._condition = threading.Condition()
+        self._user_queues = OrderedDict()  # user_id -> deque of audiobook IDs with priority 0
+        self._prioritized = {}             # audiobook_id -> (priority, sequence) for priority != 0
+        self._queued = {}                  # audiobook_id -> user_id
+        self._sequence = 0
+        self._running = set()
+        self._threads = []
+        self._wake_poller = threading.Event()
+        self._recovered_at = 0.0
+
+    def start(self):
+        """Start the worker threads and restore jobs left queued or running by a previous run"""
+        if self._threads:
+            return
+
+        # A polling node pulls jobs as workers free up instead of loading them all,
+        # and only takes over jobs other nodes have stopped reporting on
+        if not self.poll_interval:
+            self.recover()
+            self.restore()
+
+        for i in range(self.dispatch_threads):
+            thread = threading.Thread(target=self._worker_loop, name=f"conversion-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        if self.poll_interval:
+            thread = threading.Thread(target=self._poll_loop, name='conversion-poller', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        print(f"✅ Conversion scheduler started with {self.workers} workers"
+              + (f", polling for jobs every {self.poll_interval}s" if self.poll_interval else ""))
+
+    def recover(self, stale_after=None):
+        """
+        Requeue jobs a crashed process left 'processing'.
+
+        Args:
+            stale_after: Only jobs without a heartbeat for this many seconds
+                         (None = all of them; only safe before any job runs)
+
+        Returns:
+            Number of jobs requeued
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=stale_after) if stale_after is not None else None
+        with self.app.app_context():
+            requeued = requeue_interrupted_audiobooks(stale_before)
+        if requeued:
+            print(f"🔄 Requeued {requeued} interrupted conversions")
+        return requeued
+
+    def restore(self):
+        """Re-enqueue jobs persisted as 'queued' in the database"""
+        with self.app.app_context():
+            try:
+                queued = get_queued_audiobooks()
+            except Exception as e:
+                print(f"❌ Failed to restore queued conversions: {e}")
+                return
+
+        for audiobook in queued:
+            self.submit(audiobook.id, audiobook.user_id, force=True, priority=audiobook.priority or 0)
+
+        if queued:
+            print(f"🔄 Restored {len(queued)} queued conversions")
+
+    def submit(self, audiobook_id, user_id, force=False, priority=0):
+        """
+        Add a job to the end of the user's queue.
+
+        Args:
+            audiobook_id: Audiobook to convert (must already be persisted as 'queued')
+            user_id: Owner of the audiobook, used for fairness
+            force: Skip the queue size check (used when restoring jobs)
+            priority: Jobs above 0 run first, jobs below 0 last
+
+        Returns:
+            int: 1-based position in the queue (1 = next to run)
+
+        Raises:
+            QueueFullError: if the queue is full
+        """
+        with self._condition:
+            if audiobook_id in self._queued:
+                return self._position_locked(audiobook_id)
+
+            if not force and len(self._queued) >= self.max_queue:
+                raise QueueFullError(len(self._queued))
+
+            self._add_locked(audiobook_id, user_id, priority)
+            self._condition.notify()
+
+            return self._position_locked(audiobook_id)
+
+    def submit_many(self, jobs):
+        """
+        Add several jobs at once, taking as many as the queue has room for.
+
+        Args:
+            jobs: Iterable of (audiobook_id, user_id), each already persisted as 'queued'
+
+        Returns:
+            Tuple of (dict of audiobook_id -> 1-based position for accepted jobs,
+            list of audiobook IDs rejected because the queue is full)
+        """
+        accepted = []
+        rejected = []
+        with self._condition:
+            for audiobook_id, user_id in jobs:
+                if audiobook_id not in self._queued:
+                    if len(self._queued) >= self.max_queue:
+                        rejected.append(audiobook_id)
+                        continue
+                    self._add_locked(audiobook_id, user_id, 0)
+                accepted.append(audiobook_id)
+
+            if accepted:
+                self._condition.notify_all()
+
+            # One ordering pass for the whole batch instead of one per job
+            order = {job: i + 1 for i, job in enumerate(self._ordered_jobs_locked())}
+            return {audiobook_id: order[audiobook_id] for audiobook_id in accepted}, rejected
+
+    def position(self, audiobook_id):
+        """Get the 1-based queue position of a job, or None if it isn't waiting"""
+        with self._condition:
+            if audiobook_id not in self._queued:
+                return None
+            return self._position_locked(audiobook_id)
+
+    def cancel(self, audiobook_id):
+        """
+        Remove a waiting job from the queue.
+
+        Returns:
+            True if the job was waiting here, False otherwise (running jobs are
+            stopped by their converter, not by the scheduler)
+        """
+        with self._condition:
+            if audiobook_id not in self._queued:
+                return False
+            self._remove_locked(audiobook_id)
+            return True
+
+    def reprioritize(self, audiobook_id, priority):
+        """
+        Change the priority of a waiting job.
+
+        Returns:
+            int: New 1-based queue position, or None if the job isn't waiting here
+        """
+        with self._condition:
+            if audiobook_id not in self._queued:
+                return None
+            user_id = self._queued[audiobook_id]
+            self._remove_locked(audiobook_id)
+            self._add_locked(audiobook_id, user_id, priority)
+            return self._position_locked(audiobook_id)
+
+    def is_running(self, audiobook_id):
+        with self._condition:
+            return audiobook_id in self._running
+
+    def is_full(self):
+        """Check whether new submissions would be rejected"""
+        with self._condition:
+            return len(self._queued) >= self.max_queue
+
+    def free_slots(self):
+        """Number of jobs that can be submitted before the queue is full"""
+        with self._condition:
+            return max(0, self.max_queue - len(self._queued))
+
+    def queue_length(self):
+        """Number of jobs waiting to run"""
+        with self._condition:
+            return len(self._queued)
+
+    def poll(self):
+        """
+        Pull jobs queued in the database, up to the number of idle workers.
+
+        Jobs are pulled in fair_order, the order DatabaseQueue reports as queue
+        positions. Several worker nodes can poll the same database: a job pulled
+        by more than one of them still runs once, because workers claim it first.
+
+        Returns:
+            Number of jobs added to this node's queue
+        """
+        with self._condition:
+            idle = self.workers - len(self._running) - len(self._queued)
+            known = set(self._queued) | self._running
+        if idle <= 0:
+            return 0
+
+        with self.app.app_context():
+            jobs = get_queued_jobs()
+
+        # The whole queue is needed to know whose turn it is
+        owners = {audiobook_id: (user_id, priority) for audiobook_id, user_id, priority in jobs}
+        added = 0
+        for audiobook_id in fair_order(jobs):
+            if added >= idle:
+                break
+            if audiobook_id not in known:
+                user_id, priority = owners[audiobook_id]
+                self.submit(audiobook_id, user_id, force=True, priority=priority)
+                added += 1
+        return added
+
+    def reap_cancelled(self):
+        """
+        Stop running jobs whose audiobook is no longer 'processing' in the database
+        (cancelled or deleted through another node).
+
+        Returns:
+            Number of jobs told to stop
+        """
+        with self._condition:
+            running = list(self._running)
+        if not running or not self.cancel_job:
+            return 0
+
+        with self.app.app_context():
+            statuses = get_audiobook_statuses(running)
+
+        stopped = 0
+        for audiobook_id in running:
+            status = statuses.get(audiobook_id)
+            # 'queued' means another node took the job over as crashed: leave its status alone
+            if status not in ('processing', 'queued') and self.is_running(audiobook_id):
+                self.cancel_job(audiobook_id, status is None)
+                stopped += 1
+        return stopped
+
+    def get_stats(self):
+        """Get a snapshot of the scheduler state"""
+        with self._condition:
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'queued': len(self._queued),
+                'running': len(self._running),
+                'users_waiting': len(self._user_queues),
+                'prioritized': len(self._prioritized)
+            }
+
+    def _add_locked(self, audiobook_id, user_id, priority):
+        self._queued[audiobook_id] = user_id
+        if priority:
+            self._sequence += 1
+            self._prioritized[audiobook_id] = (priority, self._sequence)
+        else:
+            self._user_queues.setdefault(user_id, deque()).append(audiobook_id)
+
+    def _remove_locked(self, audiobook_id):
+        user_id = self._queued.pop(audiobook_id)
+        if self._prioritized.pop(audiobook_id, None) is None:
+            queue = self._user_queues[user_id]
+            queue.remove(audiobook_id)
+            if not queue:
+                del self._user_queues[user_id]
+
+    def _prioritized_locked(self, above_zero):
+        """Prioritized (or deprioritized) jobs, highest priority first, then oldest"""
+        jobs = [(-priority, sequence, audiobook_id) for audiobook_id, (priority, sequence) in self._prioritized.items()
+                if (priority > 0) == above_zero]
+        return [audiobook_id for _, _, audiobook_id in sorted(jobs)]
+
+    def _ordered_jobs_locked(self):
+        """List waiting jobs in the order workers will pick them up"""
+        ordered = self._prioritized_locked(True)
+        queues = [list(q) for q in self._user_queues.values()]
+        depth = 0
+        while True:
+            round_jobs = [q[depth] for q in queues if depth < len(q)]
+            if not round_jobs:
+                return ordered + self._prioritized_locked(False)
+            ordered.extend(round_jobs)
+            depth += 1
+
+    def _position_locked(self, audiobook_id):
+        return self._ordered_jobs_locked().index(audiobook_id) + 1
+
+    def _next_job_locked(self):
+        """Pop the next job, rotating the serving user to the back of the line"""
+        boosted = self._prioritized_locked(True)
+        if boosted or not self._user_queues:
+            audiobook_id = (boosted or self._prioritized_locked(False))[0]
+            self._remove_locked(audiobook_id)
+        else:
+            user_id, queue = next(iter(self._user_queues.items()))
+            audiobook_id = queue.popleft()
+
+            if queue:
+                self._user_queues.move_to_end(user_id)
+            else:
+                del self._user_queues[user_id]
+
+            del self._queued[audiobook_id]
+
+        self._running.add(audiobook_id)
+        return audiobook_id
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                while not self._queued or len(self._running) >= self.workers:
+                    self._condition.wait()
+                audiobook_id = self._next_job_locked()
+
+            result = None
+            try:
+                with self.app.app_context():
+                    # Another worker or process may have taken the job already
+                    if claim_queued_audiobook(audiobook_id):
+                        result = self.run_job(audiobook_id)
+            except Exception as e:
+                print(f"❌ Conversion job {audiobook_id} crashed: {e}")
+
+            if isinstance(result, Future):
+                # Runs elsewhere (async engine): the slot frees up when it finishes
+                result.add_done_callback(functools.partial(self._job_done, audiobook_id))
+            else:
+                self._job_done(audiobook_id)
+
+    def _job_done(self, audiobook_id, future=None):
+        if future is not None and future.exception() is not None:
+            print(f"❌ Conversion job {audiobook_id} crashed: {future.exception()}")
+        with self._condition:
+            self._running.discard(audiobook_id)
+            self._condition.notify()
+        self._wake_poller.set()
+
+    def _poll_loop(self):
+        while True:
+            try:
+                if self.stale_after and time.monotonic() - self._recovered_at >= min(60, self.stale_after):
+                    self._recovered_at = time.monotonic()
+                    self.recover(self.stale_after)
+                self.reap_cancelled()
+                self.poll()
+            except Exception as e:
+                print(f"❌ Failed to poll queued conversions: {e}")
+            # Poll again right away when a worker frees up
+            self._wake_poller.wait(self.poll_interval)
+            self._wake_poller.clear()
+
+
+class DatabaseQueue:
+    """
+    Submission side of the conversion queue for web nodes that run no conversions.
+
+    Jobs are persisted as 'queued' before they are submitted, and worker nodes
+    (a ConversionScheduler with poll_interval set) pick them up from the
+    database. Positions come from the database, in the fair_order workers pull
+    jobs in (prioritized jobs, then one job per user in turn, then
+    deprioritized ones). Which user a worker serves next isn't shared between
+    nodes, so positions within a round are approximate. Backpressure counts
+    every queued job, like ConversionScheduler: a user's first job lands near
+    the front of the order but still needs room in the queue.
+    Offers the same submission methods as ConversionScheduler.
+    """
+
+    def __init__(self, app, max_queue=100):
+        """
+        Args:
+            app: Flask application (queries run inside its app context)
+            max_queue: Maximum number of jobs waiting to run
+        """
+        self.app = app
+        self.max_queue = max(1, max_queue)
+
+    def start(self):
+        print("✅ Conversions run on worker nodes (web-only node)")
+
+    def _queued_jobs(self):
+        with self.app.app_context():
+            return get_queued_jobs()
+
+    @staticmethod
+    def _positions(jobs, exclude=()):
+        order = fair_order(job for job in jobs if job[0] not in exclude)
+        return {audiobook_id: i + 1 for i, audiobook_id in enumerate(order)}
+
+    def _order(self):
+        return self._positions(self._queued_jobs())
+
+    def submit(self, audiobook_id, user_id, force=False, priority=0):
+        """
+        Get the position of a job persisted as 'queued'.
+
+        Returns:
+            int: 1-based position, or None if a worker has already claimed it
+
+        Raises:
+            QueueFullError: if the job is beyond the queue's capacity
+        """
+        order = self._order()
+        position = order.get(audiobook_id)
+        # The job itself is already in the database, so the others must leave it room
+        if not force and position is not None and len(order) - 1 >= self.max_queue:
+            raise QueueFullError(len(order) - 1)
+        return position
+
+    def submit_many(self, jobs):
+        """Same contract as ConversionScheduler.submit_many"""
+        queued = self._queued_jobs()
+        waiting = {job[0] for job in queued}
+        batch = [audiobook_id for audiobook_id, _ in jobs]
+        # Jobs of this batch are already in the database: the rest of the queue decides how many fit
+        room = self.max_queue - len(waiting.difference(batch))
+        rejected = []
+        for audiobook_id in batch:
+            if audiobook_id in waiting:
+                if room > 0:
+                    room -= 1
+                else:
+                    rejected.append(audiobook_id)
+
+        order = self._positions(queued, exclude=set(rejected))
+        return {audiobook_id: order.get(audiobook_id) for audiobook_id in batch if audiobook_id not in rejected}, rejected
+
+    def position(self, audiobook_id):
+        return self._order().get(audiobook_id)
+
+    def cancel(self, audiobook_id):
+        """Nothing waits here: cancelling the job in the database is enough"""
+        return False
+
+    def reprioritize(self, audiobook_id, priority):
+        """Priorities live in the database; returns the job's position in it"""
+        return self.position(audiobook_id)
+
+    def is_running(self, audiobook_id):
+        return False
+
+    def queue_length(self):
+        return len(self._order())
+
+    def is_full(self):
+        return self.queue_length() >= self.max_queue
+
+    def free_slots(self):
+        return max(0, self.max_queue - self.queue_length())
+
+    def get_stats(self):
+        return {'mode': 'database', 'max_queue': self.max_queue, 'queued': self.queue_length()}
@@ -0,0 +1,284 @@
+"""
+Source PDF Cache
+================
+
+Shared on-disk cache of downloaded source PDFs, keyed by download URL.
+
+Features:
+- One download per URL: concurrent conversions of the same book wait for a
+  single in-flight download (single-flight locking), across threads and
+  across worker processes sharing the cache directory (file locks)
+- ETag / Last-Modified revalidation once a cached copy is older than
+  revalidate_after seconds
+- Size cap with least-recently-used eviction; files used by a running
+  conversion are pinned (a shared file lock, so pins hold across processes)
+  and never evicted
+- The size total is re-read from the cache directory before evicting, so
+  processes sharing it see each other's downloads
+- Downloads go through RangedDownloader, so they are segmented and resumable
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+import requests
+
+try:
+    import fcntl
+    FILE_LOCKS_AVAILABLE = True
+except ImportError:
+    FILE_LOCKS_AVAILABLE = False  # Windows: single-flight and pins within one process only
+
+from downloader import RangedDownloader
+
+
+class SourceCache:
+    """Size-bounded cache of source PDFs with conditional revalidation"""
+
+    def __init__(self, cache_dir, max_bytes, revalidate_after=3600, timeout=30, downloader=None):
+        """
+        Args:
+            cache_dir: Directory holding cached PDFs
+            max_bytes: Total size the cache is allowed to grow to
+            revalidate_after: Seconds before a cached copy is checked against the origin
+            timeout: Request timeout in seconds for revalidation
+            downloader: RangedDownloader used to fetch files (default settings if None)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.timeout = timeout
+        self.downloader = downloader or RangedDownloader(timeout=timeout)
+        self.stats = Counter()
+
+        self._lock = threading.Lock()
+        self._url_locks = {}  # key -> [lock, threads using it], dropped when no fetch needs it
+        self._in_use = Counter()
+        self._pin_files = {}  # key -> lock file holding a shared lock while the key is pinned here
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._lock:
+            self._evict_locked()
+
+    @staticmethod
+    def make_key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def acquire(self, url, on_progress=None):
+        """
+        Get a local path for the PDF at url, downloading or revalidating it if needed.
+
+        The file is pinned until release() is called with the returned path.
+
+        Args:
+            url: Download URL
+            on_progress: Optional callable(downloaded_bytes, total_bytes) for downloads
+        """
+        key = self.make_key(url)
+        path = self._path(key)
+
+        # Pin first so eviction (here or in another process) can't remove the file while it is being fetched
+        with self._lock:
+            if not self._in_use[key]:
+                self._pin_files[key] = self._open_lock(self._lock_path(key), fcntl.LOCK_SH if FILE_LOCKS_AVAILABLE else 0)
+            self._in_use[key] += 1
+
+        try:
+            # Only one thread or process fetches a given URL; the others wait and reuse its file
+            with self._fetch_lock(key):
+                meta = self._read_meta(key)
+                if meta and os.path.exists(path):
+                    if time.time() - meta.get('checked_at', 0) < self.revalidate_after:
+                        self.stats['hits'] += 1
+                    else:
+                        self._revalidate(url, key, meta, on_progress)
+                else:
+                    self.stats['misses'] += 1
+                    self._download(url, key, on_progress)
+
+                os.utime(path)  # Keeps LRU order across restarts and processes
+            with self._lock:
+                self._evict_locked()
+        except Exception:
+            self.release(path)
+            raise
+
+        return path
+
+    def release(self, path):
+        """Unpin a file returned by acquire() so it can be evicted again"""
+        key = os.path.splitext(os.path.basename(path))[0]
+        with self._lock:
+            self._in_use[key] -= 1
+            if self._in_use[key] <= 0:
+                del self._in_use[key]
+                self._pin_files.pop(key).close()  # Drops the shared lock
+            self._evict_locked()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'revalidated': self.stats['revalidated'],
+                'refreshed': self.stats['refreshed'],
+                'evictions': self.stats['evictions'],
+                'entries': len(self._entries),
+                'in_use': len(self._in_use),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    @contextmanager
+    def _fetch_lock(self, key):
+        """
+        Hold the single-flight lock for a URL: a thread lock within this process,
+        plus an exclusive flock on <key>.fetch.lock so worker processes sharing
+        the cache directory never write the same partial download at once.
+
+        Kept apart from <key>.lock, which pinned files hold shared, so a fetch
+        doesn't wait for every conversion using the file to finish.
+        """
+        with self._lock:
+            entry = self._url_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                with self._open_lock(self._fetch_lock_path(key), fcntl.LOCK_EX if FILE_LOCKS_AVAILABLE else 0):
+                    yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._url_locks[key]
+
+    def _revalidate(self, url, key, meta, on_progress=None):
+        """Check a cached copy against the origin, re-downloading only if it changed"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        if not headers:
+            # No validators to send, so the only way to refresh is a full download
+            self.stats['refreshed'] += 1
+            self._download(url, key, on_progress)
+            return
+
+        try:
+            with self.downloader.http.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                not_modified = response.status_code == 304
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Revalidation failed for {url}, using cached copy: {e}")
+            return
+
+        if not_modified:
+            self.stats['revalidated'] += 1
+            meta['checked_at'] = time.time()
+            self._write_meta(key, meta)
+            return
+
+        self.stats['refreshed'] += 1
+        self._download(url, key, on_progress)
+
+    def _download(self, url, key, on_progress=None):
+        """Fetch url into the cache (resuming a partial download) and record its validators"""
+        validators = self.downloader.download(url, self._path(key), on_progress)
+        self._write_meta(key, {
+            'url': url,
+            'etag': validators['etag'],
+            'last_modified': validators['last_modified'],
+            'checked_at': time.time()
+        })
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _meta_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _lock_path(self, key):
+        # Lock files are never removed: deleting one another process holds would break the lock
+        return os.path.join(self.cache_dir, f"{key}.lock")
+
+    def _fetch_lock_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.fetch.lock")
+
+    @staticmethod
+    def _open_lock(lock_path, operation):
+        """
+        Open a lock file and flock it (operation 0 = no file locks available).
+        The lock is released when the returned file is closed.
+
+        Raises:
+            BlockingIOError: if operation includes LOCK_NB and the lock is held
+        """
+        lock_file = open(lock_path, 'a')
+        try:
+            if operation:
+                fcntl.flock(lock_file, operation)
+        except OSError:
+            lock_file.close()
+            raise
+        return lock_file
+
+    def _read_meta(self, key):
+        try:
+            with open(self._meta_path(key)) as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self, key, meta):
+        tmp_path = f"{self._meta_path(key)}.part"
+        with open(tmp_path, 'w') as file:
+            json.dump(meta, file)
+        os.replace(tmp_path, self._meta_path(key))
+
+    def _scan_locked(self):
+        """
+        Rebuild the LRU index from the files on disk, oldest first. Other
+        processes sharing the directory add and evict files too, so this
+        process's own bookkeeping can't be trusted for the total.
+        """
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pdf'):
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue  # Evicted by another process meanwhile
+                found.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        self._entries = OrderedDict((key, size) for _, key, size in sorted(found))
+        self._total_bytes = sum(self._entries.values())
+
+    def _evict_locked(self):
+        self._scan_locked()
+        for key in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                return
+            if self._in_use[key]:
+                continue
+            try:
+                # Any process with the file pinned holds a shared lock on it
+                lock_file = self._open_lock(self._lock_path(key),
+                                            fcntl.LOCK_EX | fcntl.LOCK_NB if FILE_LOCKS_AVAILABLE else 0)
+            except BlockingIOError:
+                continue
+            with lock_file:
+                for path in (self._path(key), self._meta_path(key)):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            self._total_bytes -= self._entries.pop(key)
+            self.stats['evictions'] += 1
@@ -5,10 +5,16 @@ let currentAudiobook = null;
 let currentPage = 1;
 let totalPages = 1;
 
+// Library paging: only the fields the cards use, one page at a time
+const LIBRARY_FIELDS = 'id,title,author,status,progress,total_pages,created_at';
+let libraryStatus = 'all';
+let libraryBooks = [];
+let libraryCursor = null;
+
 // Check if user is authenticated
 async function checkAuth() {
     try {
-        const response = await fetch('/api/audiobooks');
+        const response = await fetch('/api/audiobooks?limit=1&fields=id');
         if (response.status === 302 || response.redirected) {
             window.location.href = '/login';
             return false;
@@ -77,15 +83,9 @@ function filterAudiobooks(status) {
     });
     event.target.classList.add('active');
     
-    // Filter audiobook cards
-    const cards = document.querySelectorAll('.audiobook-card');
-    cards.forEach(card => {
-        if (status === 'all' || card.dataset.status === status) {
-            card.style.display = 'block';
-        } else {
-            card.style.display = 'none';
-        }
-    });
+    // Filter on the server so paging stays correct
+    libraryStatus = status;
+    loadAudiobooks();
 }
 
 async function searchBooks() {
@@ -205,7 +205,8 @@ async function startConversion() {
             return;
         }
         
-        if (!response.ok) {
+        // 429 means the conversion queue is full; the body explains why
+        if (!response.ok && response.status !== 429) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
         }
         
@@ -256,20 +257,42 @@ function updateConversionProgress(data) {
     }
 }
 
-// Load user's audiobooks
+// Fetch one page of the user's audiobooks
+async function fetchAudiobooksPage(cursor) {
+    const params = new URLSearchParams({ fields: LIBRARY_FIELDS });
+    if (libraryStatus !== 'all') {
+        params.set('status', libraryStatus);
+    }
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    
+    const response = await fetch(`/api/audiobooks?${params}`);
+    if (response.status === 302 || response.redirected) {
+        window.location.href = '/login';
+        return null;
+    }
+    return response.json();
+}
+
+// Show the "Load more" button while there are more pages
+function updateLoadMore() {
+    const button = document.getElementById('load-more-audiobooks');
+    if (button) {
+        button.style.display = libraryCursor ? '' : 'none';
+    }
+}
+
+// Load the first page of the user's audiobooks
 async function loadAudiobooks() {
     try {
-        const response = await fetch('/api/audiobooks');
+        const data = await fetchAudiobooksPage(null);
         
-        if (response.status === 302 || response.redirected) {
-            window.location.href = '/login';
-            return;
-        }
-        
-        const data = await response.json();
-        
-        if (data.audiobooks) {
-            renderAudiobooks(data.audiobooks);
+        if (data && data.audiobooks) {
+            libraryBooks = data.audiobooks;
+            libraryCursor = data.next_cursor;
+            renderAudiobooks(libraryBooks);
+            updateLoadMore();
         }
         
     } catch (error) {
@@ -280,6 +303,27 @@ async function loadAudiobooks() {
     }
 }
 
+// Append the next page of audiobooks
+async function loadMoreAudiobooks() {
+    if (!libraryCursor) {
+        return;
+    }
+    
+    try {
+        const data = await fetchAudiobooksPage(libraryCursor);
+        
+        if (data && data.audiobooks) {
+            libraryBooks = libraryBooks.concat(data.audiobooks);
+            libraryCursor = data.next_cursor;
+            renderAudiobooks(libraryBooks);
+            updateLoadMore();
+        }
+        
+    } catch (error) {
+        console.error('Error loading more audiobooks:', error);
+    }
+}
+
 // Load dashboard stats
 async function loadStats() {
     try {
@@ -348,6 +392,10 @@ function renderAudiobooks(audiobooks) {
                         </svg>
                         Play
                     </button>
+                ` : audiobook.status === 'queued' ? `
+                    <button class="btn btn-secondary" disabled>
+                        Queued...
+                    </button>
                 ` : audiobook.status === 'processing' ? `
                     <button class="btn btn-secondary" disabled>
                         <svg class="animate-spin" viewBox="0 0 20 20" fill="currentColor">
@@ -522,7 +570,7 @@ async function startConversionForExisting(audiobookId) {
         const data = await response.json();
         
         if (data.success) {
-            showNotification('Conversion started!', 'success');
+            showNotification(`Conversion queued (position ${data.queue_position})`, 'success');
             loadAudiobooks(); // Refresh the list
         } else {
             showNotification(data.message || 'Failed to start conversion', 'error');
@@ -1091,6 +1139,10 @@ async function loadAudioPage(pageNumber) {
             return false;
         }
         
+        // Chunked pages play their chunks back to back (see the 'ended' handler)
+        state.pageChunks = page.chunks ? page.chunks.map(chunk => chunk.stream_url) : null;
+        state.currentChunk = 0;
+        
         // Check if page is already preloaded
         if (state.preloadedPages.has(pageNumber)) {
             const audioUrl = state.preloadedPages.get(pageNumber);
@@ -1307,9 +1359,13 @@ document.addEventListener('DOMContentLoaded', function() {
     const audioElement = document.getElementById('audio-element');
     if (audioElement) {
         audioElement.addEventListener('ended', function() {
-            // Auto-advance to next page when current page ends
+            // Auto-advance to the next chunk, then to the next page
             const state = window.audioPlayerState;
-            if (state.currentPage < state.totalPages) {
+            if (state.pageChunks && state.currentChunk < state.pageChunks.length - 1) {
+                state.currentChunk++;
+                audioElement.src = state.pageChunks[state.currentChunk];
+                audioElement.play();
+            } else if (state.currentPage < state.totalPages) {
                 nextPage();
             } else {
                 // End of audiobook
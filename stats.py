@@ -0,0 +1,73 @@
+"""
+Library Statistics
+==================
+
+Status breakdowns for the dashboard and /api/stats, computed in the database.
+
+Features:
+- One grouped COUNT query per breakdown (per user or global) instead of
+  loading rows into Python
+- Served from ix_audiobooks_status / ix_audiobooks_user_id, so cost stays
+  flat as the table grows
+- Global stats are cheap to cache: callers wrap get_global_stats() in a
+  short-TTL cache (see app_simple.global_stats_cached)
+"""
+
+from database import db, User, Audiobook
+
+
+def count_by_status(user_id=None):
+    """
+    Count audiobooks by status with one grouped query.
+
+    Args:
+        user_id: Only count this user's audiobooks (all users if None)
+
+    Returns:
+        Dictionary of status -> count
+    """
+    query = db.session.query(Audiobook.status, db.func.count(Audiobook.id))
+    if user_id is not None:
+        query = query.filter(Audiobook.user_id == user_id)
+
+    counts = {}
+    for status, count in query.group_by(Audiobook.status).all():
+        counts[status or 'pending'] = counts.get(status or 'pending', 0) + count
+    return counts
+
+
+def get_user_stats(user_id):
+    """Get a user's audiobook totals by status"""
+    counts = count_by_status(user_id)
+    return {
+        'total_audiobooks': sum(counts.values()),
+        'completed': counts.get('completed', 0),
+        'processing': counts.get('processing', 0),
+        'queued': counts.get('queued', 0),
+        'failed': counts.get('failed', 0),
+        'by_status': counts
+    }
+
+
+def get_global_stats():
+    """
+    Get user and audiobook totals across the whole database.
+
+    Returns:
+        Dictionary with user and audiobook counts
+    """
+    try:
+        counts = count_by_status()
+        audiobook_count = sum(counts.values())
+        completed_count = counts.get('completed', 0)
+
+        return {
+            'users': db.session.query(db.func.count(User.id)).scalar(),
+            'audiobooks': audiobook_count,
+            'completed': completed_count,
+            'success_rate': f"{(completed_count/audiobook_count*100):.1f}%" if audiobook_count > 0 else "0%",
+            'by_status': counts
+        }
+    except Exception as e:
+        print(f"❌ Failed to get database stats: {e}")
+        return {'users': 0, 'audiobooks': 0, 'completed': 0, 'success_rate': '0%', 'by_status': {}}
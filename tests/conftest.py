@@ -0,0 +1,182 @@
+"""Shared test setup: the app modules live at the repository root"""
+
+import functools
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """
+    The app_simple module, imported once with its database, caches, uploads
+    and output in a scratch directory.
+    """
+    work_dir = tmp_path_factory.mktemp('app')
+    os.chdir(work_dir)
+    os.environ['DB_PATH'] = str(work_dir / 'audiobooks.db')
+    os.environ['TTS_FAKE_ENGINE'] = '1'
+
+    import app_simple
+    return app_simple
+
+
+@pytest.fixture
+def new_client(app_module):
+    """new_client(): a test client logged in as a fresh user; the user's id is client.user_id"""
+    import uuid
+
+    from database import User
+
+    def make():
+        client = app_module.app.test_client()
+        email = f"{uuid.uuid4().hex[:12]}@example.com"
+        client.post('/api/register', json={'email': email, 'password': 'password', 'name': 'Test User'})
+        client.post('/api/login', json={'email': email, 'password': 'password'})
+        with app_module.app.app_context():
+            client.user_id = User.query.filter_by(email=email).first().id
+        return client
+
+    return make
+
+
+@pytest.fixture
+def client(new_client):
+    """Test client logged in as a fresh user; the user's id is client.user_id"""
+    return new_client()
+
+
+def _write_pdf(path, texts):
+    """Minimal PDF with one line of Helvetica text per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for i, text in enumerate(texts):
+        page_id = 4 + 2 * i
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        kids.append(f"{page_id} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {page_id + 1} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>".encode())
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode())
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(texts)} >>".encode()
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(data))
+
+
+@pytest.fixture
+def write_pdf():
+    """write_pdf(path, texts): a PDF with one line of text per page"""
+    return _write_pdf
+
+
+class _FileHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests[self.path] += 1
+        super().do_GET()
+
+
+@pytest.fixture
+def pdf_server(tmp_path):
+    """
+    Local HTTP server for source PDFs: pdf_server.add(name, texts) writes a PDF
+    and returns its URL; pdf_server.requests counts GETs per path.
+    """
+    root = tmp_path / 'served'
+    root.mkdir()
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_FileHandler, directory=str(root)))
+    httpd.requests = Counter()
+    httpd.lock = threading.Lock()
+
+    def add(name, texts):
+        _write_pdf(root / name, texts)
+        return f"http://127.0.0.1:{httpd.server_port}/{name}"
+
+    httpd.add = add
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class _OpenLibraryHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers /search.json with one scanned book titled after the query, and
+    other paths from the server's documents (404 for unknown ones)
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        path = urlparse(self.path).path
+        with server.lock:
+            server.requests += 1
+            server.paths[path] += 1
+        time.sleep(server.delay)
+
+        if path == '/search.json':
+            query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+            document = {'docs': [{
+                'key': '/works/OL1W',
+                'title': f"{query} #{server.requests}",
+                'author_name': ['Herman Melville'],
+                'ia': ['mobydick00melv']
+            }]}
+        else:
+            document = server.documents.get(path)
+        if document is None:
+            self.send_error(404)
+            return
+
+        body = json.dumps(document).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def open_library(app_module, monkeypatch):
+    """
+    Fake Open Library the app's requests are sent to: open_library.documents
+    maps paths to JSON documents, .requests and .paths count GETs.
+    """
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _OpenLibraryHandler)
+    httpd.requests = 0
+    httpd.paths = Counter()
+    httpd.documents = {}
+    httpd.delay = 0
+    httpd.lock = threading.Lock()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    # Send the app's Open Library traffic to the fake server
+    base_url = f"http://127.0.0.1:{httpd.server_port}"
+    real_get = app_module.http_client.get
+    monkeypatch.setattr(app_module.http_client, 'get',
+                        lambda url, **kwargs: real_get(url.replace('https://openlibrary.org', base_url), **kwargs))
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
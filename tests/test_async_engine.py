@@ -0,0 +1,51 @@
+"""Async conversion engine: slow PDF extraction must not stall other books"""
+
+import threading
+
+import pytest
+
+from async_engine import AsyncConversionEngine
+
+
+@pytest.fixture
+def engine():
+    return AsyncConversionEngine(io_threads=2, cpu_threads=1, extract_threads=2)
+
+
+def slow_pages(release, pages=('page 1', 'page 2')):
+    """A PDF whose extraction blocks until released"""
+    for page in pages:
+        release.wait(10)
+        yield page
+
+
+def test_slow_extraction_leaves_cpu_threads_free(engine):
+    release = threading.Event()
+
+    async def extract():
+        return [page async for page in engine.iterate(slow_pages(release))]
+
+    async def pack():
+        return await engine.run_cpu(sum, [1, 2, 3])
+
+    slow = engine.submit(extract)
+    assert engine.submit(pack).result(timeout=2) == 6  # Only 1 CPU thread, and extraction is stuck
+    assert not slow.done()
+
+    release.set()
+    assert slow.result(timeout=5) == ['page 1', 'page 2']
+
+
+def test_other_books_extract_while_one_is_stuck(engine):
+    stuck, free = threading.Event(), threading.Event()
+    free.set()
+
+    async def extract(release):
+        return [page async for page in engine.iterate(slow_pages(release))]
+
+    slow = engine.submit(extract, stuck)
+    assert engine.submit(extract, free).result(timeout=2) == ['page 1', 'page 2']
+
+    stuck.set()
+    assert slow.result(timeout=5) == ['page 1', 'page 2']
+    assert engine.get_stats()['extract_threads'] == 2
@@ -0,0 +1,117 @@
+"""Audio manifests and the page listing built from them"""
+
+import os
+
+import pytest
+
+from database import create_audiobook, update_audiobook_progress
+from manifest import AudioManifest, manifest_path
+from tts_engines import FakeEngine
+
+FRAME = FakeEngine.FRAME  # 96 bytes, 24 ms
+
+
+def add_audiobook(app_module, client, status, total_pages):
+    with app_module.app.app_context():
+        audiobook_id = create_audiobook(client.user_id, 'Moby Dick', 'Herman Melville', status=status).id
+        update_audiobook_progress(audiobook_id, total_pages=total_pages)
+    return audiobook_id
+
+
+def write_audio(app_module, name, frames):
+    path = os.path.join(app_module.OUTPUT_FOLDER, name)
+    with open(path, 'wb') as file:
+        file.write(FRAME * frames)
+    return path
+
+
+def pages_url(audiobook_id, **params):
+    query = '&'.join(f"{key}={value}" for key, value in params.items())
+    return f"/api/audiobook/{audiobook_id}/pages" + (f"?{query}" if query else '')
+
+
+def test_manifest_round_trip(tmp_path):
+    (tmp_path / 'a_page_001_chunk_00.mp3').write_bytes(FRAME * 10)
+    (tmp_path / 'a_page_001_chunk_01.mp3').write_bytes(FRAME * 5)
+    manifest = AudioManifest(manifest_path(str(tmp_path), 'a'), 'a')
+    manifest.add_page(1, [str(tmp_path / 'a_page_001_chunk_00.mp3'), str(tmp_path / 'a_page_001_chunk_01.mp3')], 'hash')
+    manifest.set_text_stats({'chars_saved': 12})
+    manifest.save()
+
+    loaded = AudioManifest.load(manifest_path(str(tmp_path), 'a'))
+
+    page = loaded.get_page(1)
+    assert [chunk['file'] for chunk in page['chunks']] == ['a_page_001_chunk_00.mp3', 'a_page_001_chunk_01.mp3']
+    assert page['duration'] == pytest.approx(0.36) and page['bytes'] == 15 * 96
+    assert page['text_sha256'] == 'hash'
+    assert loaded.text_stats == {'chars_saved': 12}
+    assert not os.path.exists(manifest_path(str(tmp_path), 'a') + '.part')
+
+
+def test_listing_comes_from_the_manifest(app_module, client):
+    audiobook_id = add_audiobook(app_module, client, 'completed', 3)
+    manifest = AudioManifest(manifest_path(app_module.OUTPUT_FOLDER, audiobook_id), audiobook_id)
+    manifest.add_page(1, [write_audio(app_module, f"{audiobook_id}_page_001.mp3", 50)])
+    manifest.add_page(3, [write_audio(app_module, f"{audiobook_id}_page_003_chunk_00.mp3", 25),
+                          write_audio(app_module, f"{audiobook_id}_page_003_chunk_01.mp3", 25)])
+    manifest.set_text_stats({'chars_saved': 40})
+    manifest.save()
+    # Files the manifest doesn't list are never looked at
+    write_audio(app_module, f"{audiobook_id}_page_002.mp3", 10)
+
+    data = client.get(pages_url(audiobook_id)).json
+
+    assert data['audiobook']['total_duration'] == pytest.approx(2.4)
+    assert data['audiobook']['text_cleaning'] == {'chars_saved': 40}
+    first, second, third = data['pages']
+    assert first['available'] and first['chunks'] is None and first['duration'] == pytest.approx(1.2)
+    assert second == {'page': 2, 'available': False, 'stream_url': None, 'chunks': None}
+    assert [chunk['stream_url'] for chunk in third['chunks']] == [
+        f"/api/audiobook/{audiobook_id}/stream/3/chunk/0", f"/api/audiobook/{audiobook_id}/stream/3/chunk/1"
+    ]
+
+
+def test_listing_is_paginated(app_module, client):
+    audiobook_id = add_audiobook(app_module, client, 'completed', 5)
+    manifest = AudioManifest(manifest_path(app_module.OUTPUT_FOLDER, audiobook_id), audiobook_id)
+    for page in range(1, 6):
+        manifest.add_page(page, [write_audio(app_module, f"{audiobook_id}_page_{page:03d}.mp3", 5)])
+    manifest.save()
+
+    first = client.get(pages_url(audiobook_id, offset=0, limit=2)).json
+    last = client.get(pages_url(audiobook_id, offset=4, limit=2)).json
+
+    assert [page['page'] for page in first['pages']] == [1, 2]
+    assert first['pagination'] == {'offset': 0, 'limit': 2, 'total': 5, 'has_more': True}
+    assert [page['page'] for page in last['pages']] == [5]
+    assert last['pagination']['has_more'] is False
+
+
+def test_book_without_manifest_gets_one_from_its_files(app_module, client):
+    audiobook_id = add_audiobook(app_module, client, 'completed', 2)
+    write_audio(app_module, f"{audiobook_id}_page_001.mp3", 10)
+    write_audio(app_module, f"{audiobook_id}_page_002_chunk_00.mp3", 10)
+    write_audio(app_module, f"{audiobook_id}_page_002_chunk_01.mp3", 10)
+
+    pages = client.get(pages_url(audiobook_id)).json['pages']
+
+    assert [page['available'] for page in pages] == [True, True]
+    assert len(pages[1]['chunks']) == 2
+    saved = AudioManifest.load(manifest_path(app_module.OUTPUT_FOLDER, audiobook_id))
+    assert sorted(saved.pages) == [1, 2]  # Saved, so the next listing reads only the manifest
+
+
+def test_book_still_converting_is_not_rebuilt_from_files(app_module, client):
+    audiobook_id = add_audiobook(app_module, client, 'processing', 2)
+    write_audio(app_module, f"{audiobook_id}_page_001.mp3", 10)
+
+    pages = client.get(pages_url(audiobook_id)).json['pages']
+
+    assert [page['available'] for page in pages] == [False, False]
+    assert not os.path.exists(manifest_path(app_module.OUTPUT_FOLDER, audiobook_id))
+
+
+def test_other_users_listing_is_not_found(app_module, client, new_client):
+    audiobook_id = add_audiobook(app_module, client, 'completed', 1)
+
+    assert new_client().get(pages_url(audiobook_id)).status_code == 404
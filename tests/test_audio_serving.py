@@ -0,0 +1,98 @@
+"""Range, conditional request and caching behaviour of the audio routes"""
+
+import os
+
+import pytest
+
+from database import create_audiobook
+
+AUDIO = bytes(range(256)) * 40
+
+
+def add_audiobook(app_module, client, status):
+    """An audiobook of the client's user with one page of audio on disk"""
+    with app_module.app.app_context():
+        audiobook = create_audiobook(client.user_id, 'Moby Dick', 'Herman Melville', status=status)
+        audiobook_id = audiobook.id
+    path = os.path.join(app_module.OUTPUT_FOLDER, f"{audiobook_id}_page_001.mp3")
+    with open(path, 'wb') as file:
+        file.write(AUDIO)
+    return audiobook_id, path
+
+
+@pytest.fixture
+def completed_page(app_module, client):
+    audiobook_id, path = add_audiobook(app_module, client, 'completed')
+    return f"/api/audiobook/{audiobook_id}/stream/1", path
+
+
+def test_full_response_has_etag_and_caching_headers(client, completed_page):
+    url, _ = completed_page
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.data == AUDIO
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['ETag']
+    cache_control = response.headers['Cache-Control']
+    assert 'immutable' in cache_control and 'private' in cache_control and 'max-age' in cache_control
+
+
+def test_range_request_gets_partial_content(client, completed_page):
+    url, _ = completed_page
+
+    response = client.get(url, headers={'Range': 'bytes=100-199'})
+
+    assert response.status_code == 206
+    assert response.data == AUDIO[100:200]
+    assert response.headers['Content-Range'] == f"bytes 100-199/{len(AUDIO)}"
+
+
+def test_range_past_the_end_is_not_satisfiable(client, completed_page):
+    url, _ = completed_page
+
+    response = client.get(url, headers={'Range': f"bytes={len(AUDIO) + 10}-"})
+
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f"bytes */{len(AUDIO)}"
+
+
+def test_matching_etag_gets_not_modified(client, completed_page):
+    url, _ = completed_page
+    etag = client.get(url).headers['ETag']
+
+    response = client.get(url, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_stale_if_range_gets_the_whole_file(client, completed_page):
+    url, _ = completed_page
+
+    response = client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': '"outdated"'})
+
+    assert response.status_code == 200
+    assert response.data == AUDIO
+
+
+def test_etag_follows_content_not_file_metadata(client, completed_page):
+    url, path = completed_page
+    etag = client.get(url).headers['ETag']
+
+    os.utime(path, (1, 1))  # Same bytes, new mtime
+    assert client.get(url).headers['ETag'] == etag
+
+    with open(path, 'wb') as file:
+        file.write(AUDIO[::-1])
+    assert client.get(url).headers['ETag'] != etag
+
+
+def test_audio_of_a_converting_book_is_revalidated(app_module, client):
+    audiobook_id, _ = add_audiobook(app_module, client, 'processing')
+
+    response = client.get(f"/api/audiobook/{audiobook_id}/stream/1")
+
+    assert response.status_code == 200
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
@@ -0,0 +1,86 @@
+"""Keyset pagination of the library: /api/audiobooks cursors, status filter and fields"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import Audiobook, create_audiobook, db
+
+STATUSES = ['completed', 'saved', 'completed', 'failed', 'completed', 'saved', 'completed']
+
+
+@pytest.fixture
+def library(app_module, client):
+    """Seven audiobooks of the client's user, newest first; the middle three share a created_at"""
+    base = datetime(2026, 1, 1)
+    created = [base + timedelta(minutes=m) for m in (60, 50, 40, 40, 40, 20, 10)]
+    with app_module.app.app_context():
+        ids = []
+        for number, (status, created_at) in enumerate(zip(STATUSES, created)):
+            audiobook = create_audiobook(client.user_id, f"Book {number}", 'Author', status=status)
+            audiobook.created_at = created_at
+            ids.append(audiobook.id)
+        db.session.commit()
+    # Ties are broken by id, descending
+    order = sorted(zip(created, ids, STATUSES), key=lambda row: (row[0], row[1]), reverse=True)
+    return [(audiobook_id, status) for _, audiobook_id, status in order]
+
+
+def read_all(client, **params):
+    """Follow next_cursor to the end, returning every page"""
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({'cursor': cursor} if cursor else {}))
+        response = client.get('/api/audiobooks', query_string=query)
+        assert response.status_code == 200
+        pages.append(response.json)
+        cursor = response.json['next_cursor']
+        assert response.json['has_more'] == (cursor is not None)
+        if not cursor:
+            return pages
+
+
+def test_cursor_walks_the_library_newest_first(client, library):
+    pages = read_all(client, limit=3)
+
+    assert [len(page['audiobooks']) for page in pages] == [3, 3, 1]
+    assert [book['id'] for page in pages for book in page['audiobooks']] == [audiobook_id for audiobook_id, _ in library]
+
+
+def test_books_added_while_paging_do_not_shift_later_pages(app_module, client, library):
+    first = client.get('/api/audiobooks', query_string={'limit': 3}).json
+    with app_module.app.app_context():
+        create_audiobook(client.user_id, 'Newer Book', 'Author', status='saved')
+
+    second = client.get('/api/audiobooks', query_string={'limit': 3, 'cursor': first['next_cursor']}).json
+
+    assert [book['id'] for book in second['audiobooks']] == [audiobook_id for audiobook_id, _ in library[3:6]]
+
+
+def test_status_filter(client, library):
+    pages = read_all(client, limit=2, status='completed,failed')
+
+    ids = [book['id'] for page in pages for book in page['audiobooks']]
+    assert ids == [audiobook_id for audiobook_id, status in library if status in ('completed', 'failed')]
+    assert {book['status'] for page in pages for book in page['audiobooks']} == {'completed', 'failed'}
+
+
+def test_fields_limit_the_response(client, library):
+    books = client.get('/api/audiobooks', query_string={'limit': 2, 'fields': 'title,status'}).json['audiobooks']
+
+    assert [set(book) for book in books] == [{'title', 'status'}] * 2
+
+
+def test_unknown_field_and_bad_cursor_are_rejected(client, library):
+    assert client.get('/api/audiobooks', query_string={'fields': 'title,password_hash'}).status_code == 400
+    assert client.get('/api/audiobooks', query_string={'cursor': 'not-a-cursor'}).status_code == 400
+
+
+def test_limit_is_clamped(app_module, client, library):
+    assert len(client.get('/api/audiobooks', query_string={'limit': 0}).json['audiobooks']) == 1
+    assert client.get('/api/audiobooks', query_string={'limit': 10 ** 6}).json['has_more'] is False
+
+
+def test_only_the_users_own_books_are_listed(client, library, new_client):
+    assert new_client().get('/api/audiobooks').json['audiobooks'] == []
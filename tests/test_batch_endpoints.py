@@ -0,0 +1,103 @@
+"""Reading-list endpoints: /api/book/batch-add and /api/book/batch-convert"""
+
+import pytest
+import requests
+
+from database import Audiobook, create_audiobook
+from scheduler import ConversionScheduler
+
+BOOKS = [
+    {'title': 'Moby Dick', 'author': 'Herman Melville', 'download_url': 'http://example.com/moby.pdf'},
+    {'title': 'Walden', 'author': 'Henry David Thoreau', 'download_url': 'http://example.com/walden.pdf'},
+    {'title': 'Emma', 'author': 'Jane Austen', 'download_url': 'http://example.com/emma.pdf'},
+]
+
+
+@pytest.fixture
+def scheduler(app_module, monkeypatch):
+    """A scheduler with room for two jobs that never runs them, so queued books stay queued"""
+    scheduler = ConversionScheduler(app_module.app, run_job=None, max_queue=2)
+    monkeypatch.setattr(app_module, 'conversion_scheduler', scheduler)
+    return scheduler
+
+
+def statuses(app_module, audiobook_ids):
+    with app_module.app.app_context():
+        return {row.id: row.status for row in Audiobook.query.filter(Audiobook.id.in_(audiobook_ids))}
+
+
+def test_batch_add_reports_each_item(client):
+    response = client.post('/api/book/batch-add', json={'books': BOOKS[:2] + [{'author': 'No Title'}, BOOKS[0]]})
+
+    data = response.json
+    assert [result['status'] for result in data['results']] == ['added', 'added', 'invalid', 'exists']
+    assert data['summary'] == {'added': 2, 'invalid': 1, 'exists': 1}
+    assert data['results'][0]['audiobook_id'] != data['results'][1]['audiobook_id']
+
+    again = client.post('/api/book/batch-add', json={'books': [dict(BOOKS[1], title='  Walden ')]}).json
+    assert again['results'][0]['status'] == 'exists'
+    assert again['results'][0]['audiobook_id'] == data['results'][1]['audiobook_id']
+
+
+def test_batch_add_resolves_open_library_keys(client, open_library):
+    data = client.post('/api/book/batch-add', json={'keys': ['OL1W', '/works/OL2W']}).json
+
+    assert [(result['key'], result['status']) for result in data['results']] == [
+        ('/works/OL1W', 'added'), ('/works/OL2W', 'not_found')
+    ]
+    assert open_library.paths['/search.json'] == 1  # Both keys in one lookup
+
+
+def test_batch_add_reports_failed_key_lookups(app_module, client, monkeypatch):
+    def unreachable(url, **kwargs):
+        raise requests.exceptions.ConnectionError('Open Library is down')
+    monkeypatch.setattr(app_module.http_client, 'get', unreachable)
+
+    data = client.post('/api/book/batch-add', json={'books': BOOKS[:1], 'keys': ['OL1W']}).json
+
+    assert [result['status'] for result in data['results']] == ['added', 'lookup_failed']
+
+
+def test_batch_add_and_convert_rejects_what_does_not_fit(app_module, client, scheduler):
+    data = client.post('/api/book/batch-add', json={
+        'books': BOOKS, 'convert': True, 'voice_engine': 'fake', 'voice_settings': {}
+    }).json
+
+    conversions = [result['conversion'] for result in data['results']]
+    assert [conversion['status'] for conversion in conversions] == ['queued', 'queued', 'queue_full']
+    assert [conversion['queue_position'] for conversion in conversions] == [1, 2, None]
+    ids = [result['audiobook_id'] for result in data['results']]
+    assert statuses(app_module, ids) == {ids[0]: 'queued', ids[1]: 'queued', ids[2]: 'saved'}
+
+
+def test_batch_convert_partial_rejection(app_module, client, new_client, scheduler):
+    with app_module.app.app_context():
+        ids = [create_audiobook(client.user_id, book['title'], book['author'], status='saved').id for book in BOOKS]
+        others = create_audiobook(new_client().user_id, 'Not Yours', 'Someone', status='saved').id
+
+    response = client.post('/api/book/batch-convert', json={
+        'audiobook_ids': ids + [ids[0], others, 'missing'], 'voice_engine': 'fake', 'voice_settings': {}
+    })
+
+    data = response.json
+    assert [(result['audiobook_id'], result['status']) for result in data['results']] == [
+        (ids[0], 'queued'), (ids[1], 'queued'), (ids[2], 'queue_full'), (others, 'not_found'), ('missing', 'not_found')
+    ]
+    assert data['summary'] == {'queued': 2, 'queue_full': 1, 'not_found': 2}
+    assert response.headers['Retry-After'] == '30'
+    assert statuses(app_module, ids + [others]) == {ids[0]: 'queued', ids[1]: 'queued', ids[2]: 'saved', others: 'saved'}
+
+    # Already queued books report their position instead of being queued twice
+    again = client.post('/api/book/batch-convert', json={'audiobook_ids': ids[:1], 'voice_engine': 'fake'}).json
+    assert again['results'] == [{'audiobook_id': ids[0], 'status': 'in_progress', 'queue_position': 1}]
+    assert scheduler.queue_length() == 2
+
+
+def test_batch_size_and_request_errors(app_module, client, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'BATCH_MAX_BOOKS', 2)
+
+    assert client.post('/api/book/batch-add', json={'books': BOOKS}).status_code == 413
+    assert client.post('/api/book/batch-convert', json={'audiobook_ids': ['a', 'b', 'c']}).status_code == 413
+    assert client.post('/api/book/batch-add', json={}).status_code == 400
+    assert client.post('/api/book/batch-add', json={'books': 'Moby Dick'}).status_code == 400
+    assert client.post('/api/book/batch-convert', json={'audiobook_ids': []}).status_code == 400
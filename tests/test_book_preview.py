@@ -0,0 +1,79 @@
+"""Book previews: one upstream request per document, then served from the preview cache"""
+
+import pytest
+
+from cache import MemoryBackend, TTLCache
+
+WORK = {
+    'key': '/works/OL1W',
+    'title': 'Moby Dick',
+    'description': {'type': '/type/text', 'value': 'A whaling voyage.'},
+    'subjects': ['Whales', 'Sea stories'],
+    'covers': [-1],
+}
+EDITION = {'key': '/books/OL1M', 'title': 'Moby Dick; or, The Whale', 'works': [{'key': '/works/OL1W'}], 'covers': [7]}
+EDITIONS = {'entries': [{'key': '/books/OL2M', 'covers': [-1]}, {'key': '/books/OL3M', 'covers': [42]}]}
+
+
+@pytest.fixture
+def preview_cache(app_module, monkeypatch):
+    cache = TTLCache(MemoryBackend(), ttl=60, stale_ttl=0)
+    monkeypatch.setattr(app_module, 'preview_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def documents(open_library):
+    open_library.documents.update({
+        '/works/OL1W.json': WORK,
+        '/books/OL1M.json': EDITION,
+        '/works/OL1W/editions.json': EDITIONS,
+    })
+    return open_library
+
+
+def preview(app_module, key):
+    response = app_module.app.test_client().post('/api/book/preview', json={'key': key})
+    return response.get_json()
+
+
+def test_edition_preview_fetches_its_work_once(app_module, documents, preview_cache):
+    book = preview(app_module, '/books/OL1M')['book']
+
+    assert book['title'] == 'Moby Dick; or, The Whale'
+    assert book['description'] == 'A whaling voyage.'  # From the work
+    assert book['cover_url'].endswith('/b/id/7-L.jpg')
+    assert documents.paths == {'/books/OL1M.json': 1, '/works/OL1W.json': 1}
+
+
+def test_work_without_cover_falls_back_to_an_edition_cover(app_module, documents, preview_cache):
+    book = preview(app_module, '/works/OL1W')['book']
+
+    assert book['cover_url'].endswith('/b/id/42-L.jpg')
+    assert book['subjects'] == ['Whales', 'Sea stories']
+    assert documents.paths == {'/works/OL1W.json': 1, '/works/OL1W/editions.json': 1}
+
+
+def test_work_with_cover_needs_one_request(app_module, documents, preview_cache):
+    documents.documents['/works/OL1W.json'] = dict(WORK, covers=[5])
+
+    assert preview(app_module, '/works/OL1W')['book']['cover_url'].endswith('/b/id/5-L.jpg')
+    assert documents.requests == 1
+
+
+def test_second_preview_is_served_from_cache(app_module, documents, preview_cache):
+    first = preview(app_module, '/books/OL1M')
+    requests = documents.requests
+
+    again = preview(app_module, '/books/OL1M')
+
+    assert again == first
+    assert documents.requests == requests
+    assert preview_cache.get_stats()['hits'] == 1
+
+
+def test_unknown_key_is_cached_as_not_found(app_module, documents, preview_cache):
+    assert preview(app_module, '/works/OL404W')['success'] is False
+    assert preview(app_module, '/works/OL404W')['success'] is False
+
+    assert documents.requests == 1
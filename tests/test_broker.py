@@ -0,0 +1,76 @@
+"""Stand-in message broker: publish and listen through BrokerManager"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+from broker import BrokerManager, MessageBroker
+
+
+@pytest.fixture
+def broker():
+    server = MessageBroker('127.0.0.1', 0)
+    server.start()
+    server.url = f"broker://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def listen(manager):
+    """Collect what manager._listen() yields on a background thread"""
+    received = queue.Queue()
+
+    def run():
+        for data in manager._listen():
+            received.put(data)
+
+    threading.Thread(target=run, daemon=True).start()
+    return received
+
+
+def wait_for_subscribers(broker, channel, count):
+    deadline = time.monotonic() + 5
+    while len(broker._subscribers.get(channel, ())) < count:
+        assert time.monotonic() < deadline, 'listener never subscribed'
+        time.sleep(0.01)
+
+
+def test_published_message_reaches_every_listener(broker):
+    listeners = [BrokerManager(broker.url) for _ in range(2)]
+    received = [listen(manager) for manager in listeners]
+    wait_for_subscribers(broker, 'flask-socketio', 2)
+
+    publisher = BrokerManager(broker.url, write_only=True)
+    publisher._publish({'method': 'emit', 'event': 'conversion_progress', 'room': 'book-1'})
+
+    for messages in received:
+        assert messages.get(timeout=5) == {'method': 'emit', 'event': 'conversion_progress', 'room': 'book-1'}
+    assert broker.published == 1
+
+
+def test_messages_stay_on_their_channel(broker):
+    other = listen(BrokerManager(broker.url, channel='other'))
+    mine = listen(BrokerManager(broker.url, channel='mine'))
+    wait_for_subscribers(broker, 'other', 1)
+    wait_for_subscribers(broker, 'mine', 1)
+
+    BrokerManager(broker.url, channel='mine', write_only=True)._publish('hello')
+
+    assert mine.get(timeout=5) == 'hello'
+    with pytest.raises(queue.Empty):
+        other.get(timeout=0.2)
+
+
+def test_publisher_reconnects_after_broker_drops_it(broker):
+    received = listen(BrokerManager(broker.url))
+    wait_for_subscribers(broker, 'flask-socketio', 1)
+    publisher = BrokerManager(broker.url, write_only=True)
+
+    publisher._publish('first')
+    publisher._publish_socket.close()  # Stale connection, as after a broker restart
+    publisher._publish('second')
+
+    assert [received.get(timeout=5), received.get(timeout=5)] == ['first', 'second']
@@ -0,0 +1,109 @@
+"""Interrupted conversions resume from the per-page checkpoints in the audio manifest"""
+
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from database import Audiobook, create_audiobook, get_audiobook_statuses, update_audiobook_progress
+from manifest import AudioManifest, manifest_path
+
+PAGES = [f"This is page {number} of the book." for number in range(1, 6)]
+
+
+@pytest.fixture
+def converter_setup(app_module, monkeypatch):
+    """
+    Conversions run one page at a time, without retries or the TTS cache.
+
+    Returns the texts synthesized and the page markers that make synthesis fail.
+    """
+    monkeypatch.setitem(app_module.app.config, 'TTS_PAGE_CONCURRENCY', 1)
+    monkeypatch.setitem(app_module.app.config, 'TTS_PAGE_RETRIES', 0)
+    monkeypatch.setitem(app_module.app.config, 'TEXT_CLEANING', False)
+    monkeypatch.setattr(app_module, 'tts_cache', None)
+
+    engine = app_module.tts_engines.get('fake')
+    real_synthesize = engine._synthesize
+    tts = SimpleNamespace(synthesized=[], fail_on=set())
+    lock = threading.Lock()
+
+    def synthesize(text, settings):
+        if any(marker in text for marker in tts.fail_on):
+            raise RuntimeError(f"TTS backend went away at {text!r}")
+        with lock:
+            tts.synthesized.append(text)
+        return real_synthesize(text, settings)
+
+    monkeypatch.setattr(engine, '_synthesize', synthesize)
+    return tts
+
+
+def convert(app_module, audiobook_id, voice_settings=None):
+    """Run one conversion attempt to the end, the way a scheduler worker does"""
+    with app_module.app.app_context():
+        audiobook = Audiobook.query.get(audiobook_id)
+        audiobook.voice_settings = json.dumps(voice_settings or {})
+        app_module.db.session.commit()
+        update_audiobook_progress(audiobook_id, status='processing')
+        app_module.run_conversion(audiobook_id)
+        return get_audiobook_statuses([audiobook_id])[audiobook_id]
+
+
+@pytest.fixture
+def audiobook_id(app_module, client, pdf_server):
+    url = pdf_server.add('book.pdf', PAGES)
+    with app_module.app.app_context():
+        return create_audiobook(client.user_id, 'Moby Dick', 'Herman Melville', voice_engine='fake',
+                                source_url=url, status='queued').id
+
+
+def spoken(tts):
+    return [text.split(' of ')[0] for text in tts.synthesized]
+
+
+def test_interrupted_conversion_resumes_from_checkpoints(app_module, audiobook_id, converter_setup):
+    converter_setup.fail_on = {'page 4'}
+    assert convert(app_module, audiobook_id) == 'failed'
+
+    manifest = AudioManifest.load(manifest_path(app_module.OUTPUT_FOLDER, audiobook_id))
+    assert sorted(manifest.pages) == [1, 2, 3]  # Finished pages are kept as checkpoints
+    assert spoken(converter_setup) == ['This is page 1', 'This is page 2', 'This is page 3']
+
+    converter_setup.synthesized.clear()
+    converter_setup.fail_on = set()
+    assert convert(app_module, audiobook_id) == 'completed'
+
+    assert spoken(converter_setup) == ['This is page 4', 'This is page 5']
+    manifest = AudioManifest.load(manifest_path(app_module.OUTPUT_FOLDER, audiobook_id))
+    assert sorted(manifest.pages) == [1, 2, 3, 4, 5]
+    assert all(os.path.exists(os.path.join(app_module.OUTPUT_FOLDER, chunk['file']))
+               for page in manifest.pages.values() for chunk in page['chunks'])
+
+
+def test_damaged_checkpoint_is_synthesized_again(app_module, audiobook_id, converter_setup):
+    converter_setup.fail_on = {'page 3'}
+    convert(app_module, audiobook_id)
+    manifest = AudioManifest.load(manifest_path(app_module.OUTPUT_FOLDER, audiobook_id))
+    damaged = os.path.join(app_module.OUTPUT_FOLDER, manifest.get_page(1)['chunks'][0]['file'])
+    with open(damaged, 'ab') as file:
+        file.write(b'garbage')
+
+    converter_setup.synthesized.clear()
+    converter_setup.fail_on = set()
+    assert convert(app_module, audiobook_id) == 'completed'
+
+    assert spoken(converter_setup) == ['This is page 1', 'This is page 3', 'This is page 4', 'This is page 5']
+
+
+def test_other_voice_settings_start_over(app_module, audiobook_id, converter_setup):
+    converter_setup.fail_on = {'page 3'}
+    assert convert(app_module, audiobook_id, {'voice': 'a'}) == 'failed'
+
+    converter_setup.synthesized.clear()
+    converter_setup.fail_on = set()
+    assert convert(app_module, audiobook_id, {'voice': 'b'}) == 'completed'
+
+    assert spoken(converter_setup) == [f"This is page {number}" for number in range(1, 6)]
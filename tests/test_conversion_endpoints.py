@@ -0,0 +1,93 @@
+"""Conversion queue endpoints: /api/conversions, cancel and priority"""
+
+import pytest
+
+from database import Audiobook, create_audiobook
+from scheduler import ConversionScheduler
+
+
+@pytest.fixture
+def scheduler(app_module, monkeypatch):
+    """A scheduler that never runs its jobs, so queued books stay queued"""
+    scheduler = ConversionScheduler(app_module.app, run_job=None, max_queue=10)
+    monkeypatch.setattr(app_module, 'conversion_scheduler', scheduler)
+    return scheduler
+
+
+@pytest.fixture
+def queue_book(app_module, scheduler):
+    """Persist a queued audiobook for a user and submit it, as /api/convert does"""
+    def queue_book(client, title):
+        with app_module.app.app_context():
+            audiobook_id = create_audiobook(client.user_id, title, 'Author', status='queued').id
+        scheduler.submit(audiobook_id, client.user_id)
+        return audiobook_id
+    return queue_book
+
+
+def status(app_module, audiobook_id):
+    with app_module.app.app_context():
+        return Audiobook.query.get(audiobook_id).status
+
+
+def listed(client):
+    return [(job['title'], job['queue_position']) for job in client.get('/api/conversions').json['conversions']]
+
+
+def test_conversions_are_listed_in_run_order(app_module, client, new_client, queue_book):
+    other = new_client()
+    queue_book(client, 'Moby Dick')
+    queue_book(other, 'Walden')
+    queue_book(client, 'Emma')
+    with app_module.app.app_context():
+        create_audiobook(client.user_id, 'Saved Only', status='saved')
+
+    # Users take turns, so the other user's book runs second; it isn't listed here
+    assert listed(client) == [('Moby Dick', 1), ('Emma', 3)]
+    assert listed(other) == [('Walden', 2)]
+
+
+def test_priority_moves_a_conversion_to_the_front(client, queue_book, scheduler):
+    queue_book(client, 'Moby Dick')
+    emma = queue_book(client, 'Emma')
+
+    response = client.post(f'/api/conversions/{emma}/priority', json={'priority': 10})
+
+    assert response.json == {'success': True, 'priority': 10, 'status': 'queued', 'queue_position': 1}
+    assert listed(client) == [('Emma', 1), ('Moby Dick', 2)]
+    assert scheduler.position(emma) == 1
+
+
+@pytest.mark.parametrize('priority', [None, 'high', True, 101, -101, 1.5])
+def test_invalid_priority_is_rejected(client, queue_book, priority):
+    audiobook_id = queue_book(client, 'Moby Dick')
+
+    response = client.post(f'/api/conversions/{audiobook_id}/priority', json={'priority': priority})
+
+    assert response.status_code == 400
+
+
+def test_cancel_removes_a_queued_conversion(app_module, client, queue_book, scheduler):
+    audiobook_id = queue_book(client, 'Moby Dick')
+
+    assert client.post(f'/api/conversions/{audiobook_id}/cancel').json['success']
+
+    assert status(app_module, audiobook_id) == 'saved'
+    assert scheduler.position(audiobook_id) is None
+    assert listed(client) == []
+    assert client.post(f'/api/conversions/{audiobook_id}/cancel').status_code == 409
+    assert client.post(f'/api/conversions/{audiobook_id}/priority', json={'priority': 5}).status_code == 409
+
+
+def test_other_users_conversions_are_not_found(app_module, client, new_client, queue_book, scheduler):
+    audiobook_id = queue_book(client, 'Moby Dick')
+    queue_book(client, 'Emma')
+    other = new_client()
+
+    assert other.post(f'/api/conversions/{audiobook_id}/cancel').status_code == 404
+    assert other.post(f'/api/conversions/{audiobook_id}/priority', json={'priority': 10}).status_code == 404
+    assert other.post('/api/conversions/no-such-book/cancel').status_code == 404
+
+    assert status(app_module, audiobook_id) == 'queued'
+    assert scheduler.position(audiobook_id) == 1
+    assert listed(client) == [('Moby Dick', 1), ('Emma', 2)]
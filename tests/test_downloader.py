@@ -0,0 +1,105 @@
+"""RangedDownloader against a local HTTP server with and without Range support"""
+
+import http.server
+import json
+import os
+import threading
+
+import pytest
+import requests
+
+from downloader import RangedDownloader
+
+DATA = os.urandom(2 * 1024 * 1024 + 123)
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves DATA; the server's settings decide whether Range is honoured or a response is cut short"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        start, end, status = 0, len(DATA) - 1, 200
+        range_header = self.headers.get('Range')
+        if range_header and server.honour_ranges:
+            first, _, last = range_header[len('bytes='):].partition('-')
+            start, end, status = int(first), int(last) if last else len(DATA) - 1, 206
+
+        body = DATA[start:end + 1]
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        if status == 206:
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(DATA)}")
+        self.end_headers()
+
+        with server.lock:
+            cut = server.cut_segment_at is not None and start == 0 and end > 0
+            if cut:
+                body = body[:server.cut_segment_at]
+                server.cut_segment_at = None  # Only the first attempt is cut short
+            server.bytes_sent += len(body)
+        self.wfile.write(body)
+        if cut:
+            self.close_connection = True
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    httpd.honour_ranges = True
+    httpd.cut_segment_at = None
+    httpd.bytes_sent = 0
+    httpd.lock = threading.Lock()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/book.pdf"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_downloader(retries=3):
+    return RangedDownloader(connections=2, chunk_size=64 * 1024, min_segment_size=1024 * 1024, timeout=5, retries=retries)
+
+
+def test_segmented_download(server, tmp_path):
+    dest = tmp_path / 'book.pdf'
+    progress = []
+
+    validators = make_downloader().download(server.url, str(dest), lambda done, total: progress.append((done, total)))
+
+    assert dest.read_bytes() == DATA
+    assert validators['etag'] == '"v1"'
+    assert progress[-1] == (len(DATA), len(DATA))
+    assert not os.path.exists(f"{dest}.part") and not os.path.exists(f"{dest}.part.json")
+
+
+def test_resume_after_partial_download(server, tmp_path):
+    dest = tmp_path / 'book.pdf'
+    server.cut_segment_at = 256 * 1024
+
+    with pytest.raises(requests.exceptions.RequestException):
+        make_downloader(retries=0).download(server.url, str(dest))
+
+    with open(f"{dest}.part.json") as file:
+        saved = sum(segment[2] for segment in json.load(file)['segments'])
+    assert 0 < saved < len(DATA)
+
+    server.bytes_sent = 0
+    make_downloader().download(server.url, str(dest))
+
+    assert dest.read_bytes() == DATA
+    # Only the missing bytes (plus the 1-byte probe) are fetched again
+    assert server.bytes_sent == len(DATA) - saved + 1
+
+
+def test_falls_back_when_server_ignores_range(server, tmp_path):
+    dest = tmp_path / 'book.pdf'
+    server.honour_ranges = False
+
+    make_downloader().download(server.url, str(dest))
+
+    assert dest.read_bytes() == DATA
+    assert not os.path.exists(f"{dest}.part.json")
@@ -0,0 +1,111 @@
+"""Packed MP3 output: page index, Range requests into the packed file and per-page seeking"""
+
+import os
+
+import pytest
+
+import audio_pack
+from database import create_audiobook, update_audiobook_progress
+from tts_engines import FakeEngine
+
+FRAME = FakeEngine.FRAME  # 96 bytes, 24 ms
+ID3_TAG = b'ID3\x03\x00\x00\x00\x00\x00\x0a' + b'\x00' * 10  # Empty ID3v2 tag, stripped when packing
+PAGE_FRAMES = {1: 50, 2: 100, 3: 25}
+
+
+@pytest.fixture
+def packed_book(app_module, client):
+    """A completed audiobook of the client's user, packed from three pages of audio"""
+    with app_module.app.app_context():
+        audiobook_id = create_audiobook(client.user_id, 'Moby Dick', 'Herman Melville', status='completed').id
+        update_audiobook_progress(audiobook_id, total_pages=len(PAGE_FRAMES))
+
+    pages = []
+    for page, frames in PAGE_FRAMES.items():
+        path = os.path.join(app_module.OUTPUT_FOLDER, f"{audiobook_id}_page_{page:03d}.mp3")
+        with open(path, 'wb') as file:
+            file.write(ID3_TAG + FRAME * frames)
+        pages.append((page, [path]))
+    pack_path, index_path = app_module.packed_audio_paths(audiobook_id)
+    index = audio_pack.pack_pages(pages, pack_path, index_path)
+    return audiobook_id, index
+
+
+def test_index_records_page_offsets_and_durations(packed_book):
+    _, index = packed_book
+
+    assert index['bytes'] == sum(PAGE_FRAMES.values()) * len(FRAME)
+    assert [(entry['page'], entry['offset'], entry['length']) for entry in index['pages']] == [
+        (1, 0, 50 * 96), (2, 50 * 96, 100 * 96), (3, 150 * 96, 25 * 96)
+    ]
+    assert [entry['start'] for entry in index['pages']] == [0.0, 1.2, 3.6]
+    assert index['duration'] == pytest.approx(4.2)
+
+
+def test_index_endpoint(client, packed_book):
+    audiobook_id, index = packed_book
+
+    response = client.get(f"/api/audiobook/{audiobook_id}/packed/index")
+
+    assert response.status_code == 200
+    assert response.json['pages'] == index['pages']
+    assert response.json['stream_url'] == f"/api/audiobook/{audiobook_id}/packed"
+
+
+def test_whole_packed_file_is_one_continuous_stream(client, packed_book):
+    audiobook_id, _ = packed_book
+
+    response = client.get(f"/api/audiobook/{audiobook_id}/packed")
+
+    assert response.status_code == 200
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.data == FRAME * sum(PAGE_FRAMES.values())  # No ID3 tags between pages
+
+
+def test_range_request_for_a_page_from_the_index(client, packed_book):
+    audiobook_id, index = packed_book
+    entry = audio_pack.find_page(index, 2)
+    first, last = entry['offset'], entry['offset'] + entry['length'] - 1
+
+    response = client.get(f"/api/audiobook/{audiobook_id}/packed", headers={'Range': f"bytes={first}-{last}"})
+
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == f"bytes {first}-{last}/{index['bytes']}"
+    assert response.data == FRAME * PAGE_FRAMES[2]
+
+
+def test_open_ended_range_and_unsatisfiable_range(client, packed_book):
+    audiobook_id, index = packed_book
+    url = f"/api/audiobook/{audiobook_id}/packed"
+
+    tail = client.get(url, headers={'Range': f"bytes={index['bytes'] - 96}-"})
+    beyond = client.get(url, headers={'Range': f"bytes={index['bytes']}-"})
+
+    assert tail.status_code == 206 and tail.data == FRAME
+    assert beyond.status_code == 416
+
+
+def test_single_page_and_time_position(client, packed_book):
+    audiobook_id, _ = packed_book
+    url = f"/api/audiobook/{audiobook_id}/packed"
+
+    page = client.get(f"{url}?page=3")
+    seek = client.get(f"{url}?t=2.0")  # 0.8 s into page 2, which starts at 1.2 s
+
+    assert page.data == FRAME * PAGE_FRAMES[3]
+    assert page.headers['X-Audio-Page'] == '3'
+    assert seek.headers['X-Audio-Page'] == '2'
+    assert float(seek.headers['X-Audio-Start']) == pytest.approx(1.992)  # Start of the frame playing at 2.0 s
+    assert seek.data == FRAME * (PAGE_FRAMES[2] - 33)
+
+
+def test_missing_positions_and_other_users_books_are_not_found(client, packed_book, new_client):
+    audiobook_id, _ = packed_book
+    url = f"/api/audiobook/{audiobook_id}/packed"
+
+    assert client.get(f"{url}?page=9").status_code == 404
+    assert client.get(f"{url}?t=60").status_code == 404
+
+    other = new_client()
+    assert other.get(url).status_code == 404
+    assert other.get(f"{url}/index").status_code == 404
@@ -0,0 +1,61 @@
+"""Sharded PDF extraction and recovery from crashed extraction workers"""
+
+import os
+
+import pytest
+
+import pdf_extraction
+
+
+def break_pool(pool):
+    """Kill a worker of the pool, as a crashing extraction would"""
+    with pytest.raises(Exception):
+        pool.submit(os._exit, 1).result()
+
+
+@pytest.fixture
+def book(tmp_path, write_pdf):
+    path = tmp_path / 'book.pdf'
+    write_pdf(path, [f"This is page {number}." for number in range(1, 41)])
+    return str(path)
+
+
+def texts(pages):
+    return [(number, text.strip(), error) for number, text, error in pages]
+
+
+EXPECTED = [(number, f"This is page {number}.", None) for number in range(1, 41)]
+
+
+def test_process_pool_extraction_matches_in_process(book):
+    assert texts(pdf_extraction.iter_page_texts(book, 40)) == EXPECTED
+    assert texts(pdf_extraction.iter_page_texts(book, 40, workers=2, shard_size=5)) == EXPECTED
+
+
+def test_broken_pool_is_replaced(book):
+    broken = pdf_extraction.get_process_pool(2)
+    break_pool(broken)
+
+    assert texts(pdf_extraction.iter_page_texts(book, 40, workers=2, shard_size=5)) == EXPECTED
+    assert pdf_extraction.get_process_pool(2) is not broken
+
+
+def test_crash_mid_book_retries_unfinished_shards(book):
+    pages = pdf_extraction.iter_page_texts(book, 40, workers=2, shard_size=5)
+    first = [next(pages) for _ in range(12)]
+    break_pool(pdf_extraction.get_process_pool(2))
+
+    assert texts(first + list(pages)) == EXPECTED
+
+
+def test_falls_back_to_in_process_when_new_pool_breaks_too(book, monkeypatch):
+    get_process_pool = pdf_extraction.get_process_pool
+
+    def always_broken(workers):
+        pool = get_process_pool(workers)
+        break_pool(pool)
+        return pool
+
+    monkeypatch.setattr(pdf_extraction, 'get_process_pool', always_broken)
+
+    assert texts(pdf_extraction.iter_page_texts(book, 40, workers=2, shard_size=5)) == EXPECTED
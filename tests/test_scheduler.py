@@ -0,0 +1,89 @@
+"""Queue positions reported by web nodes match the order workers serve jobs in"""
+
+from contextlib import nullcontext
+
+import scheduler
+from scheduler import ConversionScheduler, DatabaseQueue, fair_order
+
+# (audiobook_id, user_id, priority), highest priority first, then oldest, as the database lists them
+JOBS = [
+    (9, 'carol', 2),
+    (1, 'alice', 0), (2, 'alice', 0), (3, 'alice', 0),
+    (4, 'bob', 0), (5, 'carol', 0), (6, 'bob', 0),
+    (8, 'bob', -1), (7, 'alice', -3),
+]
+
+
+class FakeApp:
+    def app_context(self):
+        return nullcontext()
+
+
+def test_fair_order_serves_one_job_per_user_in_turn():
+    assert fair_order(JOBS) == [9, 1, 4, 5, 2, 6, 3, 8, 7]
+
+
+def test_fair_order_matches_the_worker_scheduler():
+    worker = ConversionScheduler(FakeApp(), run_job=None)
+    for audiobook_id, user_id, priority in JOBS:
+        worker.submit(audiobook_id, user_id, priority=priority)
+
+    served = []
+    while worker.queue_length():
+        served.append(worker._next_job_locked())
+
+    assert served == fair_order(JOBS)
+
+
+def test_database_queue_positions_use_fair_order(monkeypatch):
+    monkeypatch.setattr(scheduler, 'get_queued_jobs', lambda limit=None: list(JOBS))
+    queue = DatabaseQueue(FakeApp(), max_queue=100)
+
+    assert queue.submit(4, 'bob') == 3
+    assert queue.position(3) == 7
+    assert queue.position(7) == 9
+    assert queue.position(42) is None
+
+
+def test_worker_pulls_jobs_in_fair_order(monkeypatch):
+    monkeypatch.setattr(scheduler, 'get_queued_jobs', lambda limit=None: list(JOBS))
+    worker = ConversionScheduler(FakeApp(), run_job=None, workers=3, poll_interval=1)
+
+    assert worker.poll() == 3
+    assert sorted(worker._queued) == [1, 4, 9]
+
+
+def test_database_queue_rejects_new_users_once_full(monkeypatch):
+    database = []  # Jobs persisted as 'queued', oldest first
+    monkeypatch.setattr(scheduler, 'get_queued_jobs', lambda limit=None: list(database))
+    queue = DatabaseQueue(FakeApp(), max_queue=3)
+
+    def submit(audiobook_id, user_id):
+        job = (audiobook_id, user_id, 0)
+        database.append(job)  # The web node persists the job before submitting it
+        try:
+            return queue.submit(audiobook_id, user_id)
+        except scheduler.QueueFullError as error:
+            database.remove(job)  # The web node puts the job back as it was
+            return error
+
+    # One user fills the queue; every other user's first job would be second in the round-robin
+    assert [submit(number, 'alice') for number in range(3)] == [1, 2, 3]
+    for number in range(3, 10):
+        error = submit(number, f"user-{number}")
+        assert isinstance(error, scheduler.QueueFullError) and error.queue_length == 3
+
+    assert [job[0] for job in database] == [0, 1, 2]
+    assert queue.is_full() and queue.free_slots() == 0
+
+
+def test_database_queue_submit_many_takes_only_the_free_slots(monkeypatch):
+    database = [(1, 'alice', 0), (2, 'alice', 0)]
+    monkeypatch.setattr(scheduler, 'get_queued_jobs', lambda limit=None: list(database))
+    queue = DatabaseQueue(FakeApp(), max_queue=4)
+
+    database.extend((audiobook_id, f"user-{audiobook_id}", 0) for audiobook_id in (3, 4, 5))
+    positions, rejected = queue.submit_many([(3, 'user-3'), (4, 'user-4'), (5, 'user-5')])
+
+    assert rejected == [5]
+    assert positions == {3: 2, 4: 3}
@@ -0,0 +1,73 @@
+"""Open Library search caching against a fake Open Library server"""
+
+import threading
+import time
+
+from cache import MemoryBackend, TTLCache
+
+
+def use_search_cache(app_module, monkeypatch, ttl, stale_ttl):
+    cache = TTLCache(MemoryBackend(), ttl=ttl, stale_ttl=stale_ttl)
+    monkeypatch.setattr(app_module, 'search_cache', cache)
+    return cache
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_repeated_search_is_served_from_cache(app_module, open_library, monkeypatch):
+    cache = use_search_cache(app_module, monkeypatch, ttl=60, stale_ttl=0)
+
+    first = app_module.OpenLibraryAPI.search_books('Moby Dick')
+    again = app_module.OpenLibraryAPI.search_books('  moby   DICK ')  # Same query once normalized
+
+    assert first and again == first
+    assert open_library.requests == 1
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_expired_search_is_fetched_again(app_module, open_library, monkeypatch):
+    use_search_cache(app_module, monkeypatch, ttl=0.2, stale_ttl=0)
+
+    first = app_module.OpenLibraryAPI.search_books('Moby Dick')
+    time.sleep(0.3)
+    second = app_module.OpenLibraryAPI.search_books('Moby Dick')
+
+    assert open_library.requests == 2
+    assert second != first
+
+
+def test_stale_search_is_served_while_refreshing(app_module, open_library, monkeypatch):
+    cache = use_search_cache(app_module, monkeypatch, ttl=0.2, stale_ttl=60)
+
+    first = app_module.OpenLibraryAPI.search_books('Moby Dick')
+    time.sleep(0.3)
+    stale = app_module.OpenLibraryAPI.search_books('Moby Dick')
+
+    assert stale == first
+    assert cache.get_stats()['stale'] == 1
+    wait_for(lambda: open_library.requests == 2)  # Background refresh
+    wait_for(lambda: app_module.OpenLibraryAPI.search_books('Moby Dick') != first)
+
+
+def test_concurrent_searches_share_one_request(app_module, open_library, monkeypatch):
+    cache = use_search_cache(app_module, monkeypatch, ttl=60, stale_ttl=0)
+    open_library.delay = 0.3
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(app_module.OpenLibraryAPI.search_books('Moby Dick')))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert open_library.requests == 1
+    assert len(results) == 8 and all(result == results[0] for result in results)
+    assert cache.get_stats()['coalesced'] == 7
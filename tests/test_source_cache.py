@@ -0,0 +1,71 @@
+"""Source PDF cache shared by several processes (one SourceCache per process)"""
+
+import os
+
+import pytest
+
+import source_cache
+from source_cache import SourceCache
+
+pytestmark = pytest.mark.skipif(not source_cache.FILE_LOCKS_AVAILABLE, reason='needs file locks')
+
+
+class FakeDownloader:
+    """Writes size bytes for every download instead of fetching anything"""
+
+    http = None
+
+    def __init__(self, size=1000):
+        self.size = size
+        self.downloads = []
+
+    def download(self, url, dest_path, on_progress=None):
+        self.downloads.append(url)
+        with open(dest_path, 'wb') as file:
+            file.write(b'%' * self.size)
+        return {'etag': None, 'last_modified': None}
+
+
+def make_cache(cache_dir, max_bytes=2500):
+    return SourceCache(str(cache_dir), max_bytes, downloader=FakeDownloader())
+
+
+def test_file_pinned_by_another_process_is_not_evicted(tmp_path):
+    web = make_cache(tmp_path)
+    worker = make_cache(tmp_path)
+
+    pinned = worker.acquire('http://example.com/a.pdf')
+    for name in 'bcd':
+        web.release(web.acquire(f"http://example.com/{name}.pdf"))
+
+    # The web node's eviction had to skip a.pdf, the oldest file, because the worker still reads it
+    assert os.path.exists(pinned)
+    assert not os.path.exists(web._path(web.make_key('http://example.com/b.pdf')))
+
+    worker.release(pinned)
+    web.release(web.acquire('http://example.com/e.pdf'))
+    assert not os.path.exists(pinned)
+
+
+def test_size_total_includes_other_processes_downloads(tmp_path):
+    web = make_cache(tmp_path)
+    worker = make_cache(tmp_path)
+
+    worker.release(worker.acquire('http://example.com/a.pdf'))
+    worker.release(worker.acquire('http://example.com/b.pdf'))
+    web.release(web.acquire('http://example.com/c.pdf'))
+
+    assert web.get_stats()['bytes'] == 2000
+    assert web.get_stats()['evictions'] == 1
+
+
+def test_second_process_reuses_the_cached_file(tmp_path):
+    web = make_cache(tmp_path)
+    worker = make_cache(tmp_path)
+
+    web.release(web.acquire('http://example.com/a.pdf'))
+    worker.release(worker.acquire('http://example.com/a.pdf'))
+
+    assert len(web.downloader.downloads) == 1
+    assert worker.downloader.downloads == []
+    assert worker.get_stats()['hits'] == 1
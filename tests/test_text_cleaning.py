@@ -0,0 +1,111 @@
+"""Page text cleaning: headers and footers, page numbers, boilerplate and hyphenation"""
+
+import pytest
+
+from text_cleaning import TextCleaner
+
+
+def clean(texts, **kwargs):
+    cleaner = TextCleaner(**kwargs)
+    pages = [{'page_number': number, 'text': text} for number, text in enumerate(texts, 1)]
+    return [page['text'] for page in cleaner.clean_pages(pages)], cleaner.get_stats()
+
+
+BODY = ['Call me Ishmael, some years ago.', 'Having little or no money in my purse.',
+        'I thought I would sail about a little.', 'It is a way I have of driving off the spleen.',
+        'Whenever I find myself growing grim about the mouth.']
+
+
+def test_running_header_and_footer_are_removed():
+    texts = [f"MOBY DICK · Chapter 3 · {40 + i}\n{body}\nThe Whale Press" for i, body in enumerate(BODY)]
+
+    cleaned, stats = clean(texts)
+
+    assert cleaned == BODY
+    assert stats['header_footer_lines'] == 2 * len(BODY)
+    assert stats['page_number_lines'] == 0
+
+
+def test_chapter_headings_are_not_mistaken_for_a_running_header():
+    texts = [f"Chapter {number}\n{body}" for number, body in enumerate(BODY, 1)]
+
+    cleaned, _ = clean(texts)
+
+    assert cleaned == [f"Chapter {number} {body}" for number, body in enumerate(BODY, 1)]
+
+
+def test_one_line_pages_survive_even_when_they_repeat():
+    cleaned, _ = clean(['THE END'] * 4)
+
+    assert cleaned == ['THE END'] * 4
+
+
+@pytest.mark.parametrize('number', ['12', '- 12 -', 'Page 12', 'page xiv', '- xiv -', '[ix]', '— XII —', '(iv)'])
+def test_page_number_lines_are_removed(number):
+    cleaned, stats = clean([f"{number}\n{BODY[0]}", f"{BODY[1]}\n{number}"])
+
+    assert cleaned == BODY[:2]
+    assert stats['page_number_lines'] == 2
+
+
+@pytest.mark.parametrize('word', ['I', 'mix', 'mi', 'dix', 'i', 'Did', 'mild', 'civil', 'vivid', 'mix.'])
+def test_words_made_of_roman_numeral_letters_are_kept(word):
+    cleaned, stats = clean([f"{word}\n{BODY[0]}", f"{BODY[1]}\n{word}"])
+
+    assert cleaned == [f"{word} {BODY[0]}", f"{BODY[1]} {word}"]
+    assert stats['page_number_lines'] == 0
+
+
+def test_boilerplate_lines_are_removed():
+    texts = ['Digitized by the Internet Archive\nin 2008 with funding from\nMicrosoft Corporation\n'
+             'http://www.archive.org/details/mobydick00melv', 'This page intentionally left blank', BODY[0]]
+
+    cleaned, stats = clean(texts)
+
+    assert cleaned == ['in 2008 with funding from Microsoft Corporation', BODY[0]]
+    assert stats['pages_dropped'] == 1
+
+
+@pytest.mark.parametrize('sentence', [
+    'The scans were digitized by the Internet Archive in 2008, thanks to a grant.',
+    'He turned to a blank page and began to write.',
+    'See archive.org/details/mobydick00melv for the scans.',
+])
+def test_boilerplate_words_inside_a_sentence_are_kept(sentence):
+    cleaned, _ = clean([sentence])
+
+    assert cleaned == [sentence]
+
+
+def test_hyphenated_line_breaks_are_rejoined():
+    cleaned, stats = clean(['It was gene-\nrally agreed that the whale-\nboat was ready.'])
+
+    assert cleaned == ['It was generally agreed that the whaleboat was ready.']
+    assert stats['hyphenations_joined'] == 2
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('A well-\nknown sailor.', 'A well-known sailor.'),
+    ('His self-\nimportance grew.', 'His self-importance grew.'),
+    ('Some forty-\nfive men.', 'Some forty-five men.'),
+    # The page spells the compound with a hyphen elsewhere
+    ('The sperm-whale and another sperm-\nwhale.', 'The sperm-whale and another sperm-whale.'),
+    # ...or without one
+    ('The wellspring, a well-\nspring.', 'The wellspring, a wellspring.'),
+    # Upper-case continuations are names or sentences, never a broken word
+    ('Anglo-\nSaxon verse.', 'Anglo- Saxon verse.'),
+])
+def test_compounds_keep_their_hyphen(text, expected):
+    cleaned, _ = clean([text])
+
+    assert cleaned == [expected]
+
+
+def test_stats_count_characters_saved():
+    texts = [f"MOBY DICK\n{body}\n{number}" for number, body in enumerate(BODY, 1)]
+
+    _, stats = clean(texts)
+
+    assert stats['pages'] == len(BODY)
+    assert stats['chars_out'] == sum(len(body) for body in BODY)
+    assert stats['chars_saved'] == stats['chars_in'] - stats['chars_out'] > 0
@@ -0,0 +1,75 @@
+"""TTS engine batching and stats under many concurrent callers"""
+
+import threading
+from collections import Counter
+
+import pytest
+
+from tts_engines import FakeEngine, TTSEngineError
+
+
+class BatchingFakeEngine(FakeEngine):
+    """Fake engine that batches like pyttsx3 and returns each text as its audio"""
+
+    max_batch = 4
+
+    def __init__(self, concurrency=2):
+        super().__init__(concurrency)
+        self.produced = Counter()
+        self._produced_lock = threading.Lock()
+
+    def _synthesize(self, text, settings):
+        super()._synthesize(text, settings)
+        if text.startswith('fail'):
+            raise TTSEngineError(f"fake: cannot say {text!r}")
+        with self._produced_lock:
+            self.produced[text] += 1
+        return text.encode()
+
+
+def synthesize_concurrently(engine, texts, settings_for=lambda index: {'latency': 0.002}):
+    results = {}
+    errors = {}
+
+    def call(index, text):
+        try:
+            results[text] = engine.synthesize(text, settings_for(index))
+        except TTSEngineError as e:
+            errors[text] = e
+
+    threads = [threading.Thread(target=call, args=(index, text)) for index, text in enumerate(texts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    assert not any(thread.is_alive() for thread in threads), 'a caller never got its audio'
+    return results, errors
+
+
+@pytest.mark.parametrize('run', range(5))
+def test_every_chunk_is_produced_exactly_once(run):
+    engine = BatchingFakeEngine()
+    texts = [f"chunk {number}" for number in range(60)]
+
+    # Two voices, so batches only take requests with matching settings
+    results, errors = synthesize_concurrently(engine, texts, lambda index: {'latency': 0.002, 'voice': index % 2})
+
+    assert not errors
+    assert results == {text: text.encode() for text in texts}
+    assert engine.produced == Counter(texts)
+    stats = engine.get_stats()
+    assert stats['requests'] == 60 and stats['characters'] == sum(len(text) for text in texts)
+    assert 15 <= stats['batches'] < 60
+    assert stats['waiting'] == 0
+
+
+def test_failed_batch_is_counted_once_per_batch():
+    engine = BatchingFakeEngine(concurrency=1)
+    texts = [f"fail {number}" for number in range(12)]
+
+    results, errors = synthesize_concurrently(engine, texts)
+
+    assert not results and set(errors) == set(texts)
+    stats = engine.get_stats()
+    assert stats['requests'] == 0
+    assert stats['errors'] >= 3  # At most max_batch callers share a failed batch
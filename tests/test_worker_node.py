@@ -0,0 +1,70 @@
+"""Web and worker node split: a web node only queues, worker.py runs the job"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs as the web node: queue one conversion through the API and print the response
+WEB_NODE = """
+import json
+import app_simple
+
+client = app_simple.app.test_client()
+client.post('/api/register', json={'email': 'web@example.com', 'password': 'password', 'name': 'Web'})
+client.post('/api/login', json={'email': 'web@example.com', 'password': 'password'})
+response = client.post('/api/convert', json={
+    'book': {'title': 'Moby Dick', 'author': 'Herman Melville', 'download_url': %r},
+    'voice_engine': 'fake', 'voice_settings': {}
+})
+print('RESULT ' + json.dumps({'json': response.get_json(), 'stats': client.get('/api/stats').get_json()['conversion_queue']}))
+"""
+
+
+def node_env(tmp_path, role=None):
+    env = dict(os.environ, PYTHONPATH=REPO, DB_PATH=str(tmp_path / 'audiobooks.db'), TTS_FAKE_ENGINE='1',
+               WORKER_POLL_INTERVAL='0.2', SOCKETIO_MESSAGE_QUEUE='')
+    env.pop('NODE_ROLE', None)
+    if role:
+        env['NODE_ROLE'] = role
+    return env
+
+
+def audiobook_status(tmp_path, audiobook_id):
+    with sqlite3.connect(tmp_path / 'audiobooks.db') as connection:
+        return connection.execute('SELECT status FROM audiobooks WHERE id = ?', (audiobook_id,)).fetchone()[0]
+
+
+def test_web_node_queues_and_worker_node_converts(tmp_path, pdf_server):
+    url = pdf_server.add('book.pdf', [f"This is page {number}." for number in range(1, 4)])
+
+    web = subprocess.run([sys.executable, '-c', WEB_NODE % url], cwd=tmp_path, env=node_env(tmp_path, 'web'),
+                         capture_output=True, text=True, timeout=60)
+    result = json.loads(web.stdout.split('RESULT ', 1)[1])
+    audiobook_id = result['json']['conversion_id']
+
+    # Nothing runs conversions on the web node: the job waits in the database
+    assert result['json']['success'] and result['json']['queue_position'] == 1
+    assert result['stats']['mode'] == 'database'
+    assert audiobook_status(tmp_path, audiobook_id) == 'queued'
+    assert pdf_server.requests['/book.pdf'] == 0
+
+    worker = subprocess.Popen([sys.executable, os.path.join(REPO, 'worker.py')], cwd=tmp_path,
+                              env=node_env(tmp_path), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        deadline = time.monotonic() + 60
+        while audiobook_status(tmp_path, audiobook_id) not in ('completed', 'failed'):
+            assert time.monotonic() < deadline, 'worker never finished the job'
+            time.sleep(0.2)
+    finally:
+        worker.terminate()
+        output = worker.communicate(timeout=10)[0]
+
+    assert audiobook_status(tmp_path, audiobook_id) == 'completed', output
+    assert f"[AudiobookConverter:{audiobook_id}] processing" in output
+    assert pdf_server.requests['/book.pdf'] >= 1
+    assert os.path.exists(tmp_path / 'output' / f"{audiobook_id}.manifest.json")
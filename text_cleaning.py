@@ -0,0 +1,253 @@
+"""
+Text Cleaning
+=============
+
+Normalizes extracted page text before it is synthesized.
+
+Scanned Internet Archive PDFs repeat running headers, footers and page
+numbers on every page, break words with hyphens at line ends and carry
+scanner boilerplate pages. All of it costs TTS time and characters and
+none of it belongs in an audiobook.
+
+Features:
+- Repeated header/footer lines detected across pages (digits ignored, so
+  "Chapter 3 · 41" and "Chapter 3 · 42" count as the same line, but chapter
+  numbers kept, so chapter headings survive), using a short look-ahead
+  window so pages still stream to synthesis
+- Page-number lines removed ("12", "- 12 -", "Page 12", "- xiv -", "[ix]");
+  roman numerals need a label or marks around them, so "I" or "mix" alone
+  on a line is kept
+- Hyphenated line breaks rejoined ("gene-\nrally"); compounds keep their
+  hyphen ("well-\nknown") when the first part is a common compound word or
+  the page spells the compound with a hyphen elsewhere
+- Whitespace collapsed
+- Empty and boilerplate pages dropped; boilerplate lines ("Digitized by the
+  Internet Archive", "This page intentionally left blank") are removed only
+  when they stand on a line of their own
+- Characters saved reported per book and per process
+"""
+
+import re
+import threading
+from collections import Counter, deque
+
+# Valid roman numerals only, so words made of the same letters ("did", "mild", "civil") are not page numbers.
+# Words like "mix" or "I" still are valid numerals, so a bare one is never taken for a page number
+_ROMAN = r'(?=[ivxlcdm])m{0,3}(?:cm|cd|d?c{0,3})(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3})'
+_DIGITS = re.compile(r'^\d{1,4}$')
+_ROMAN_NUMBER = re.compile(rf'^{_ROMAN}$', re.IGNORECASE)
+_PAGE_LABEL = re.compile(rf'^page\s*(?:\d{{1,4}}|{_ROMAN})$', re.IGNORECASE)
+_PAGE_NUMBER_MARKS = ' \t-–—.[]()|·'
+_ROMAN_MARKS = '-–—[]()|·'  # Must open and close a roman numeral; a trailing "." doesn't count
+_HEADING_NUMBER = re.compile(r'(\b(?:chapter|part|book|section|act|scene|volume)\s+\d+)|\d+')
+_HYPHEN_BREAK = re.compile(r'(\b\w+)([-­])\s*\n\s*([a-z]\w*)')
+# First parts of compounds that are words of their own, so "well-\nknown" keeps its hyphen
+_COMPOUND_WORDS = frozenset((
+    'all', 'ex', 'half', 'ill', 'non', 'self', 'well',
+    'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety',
+))
+# Whole lines only: the same words inside a sentence are left alone
+_BOILERPLATE = [
+    re.compile(r'^\s*digitized by (?:the )?internet archive\s*$', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'^\s*https?://(?:www\.)?archive\.org/details/\S*\s*$', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'^\s*(?:this page (?:is |was )?(?:intentionally )?left )?blank(?: page)?\s*$', re.IGNORECASE | re.MULTILINE),
+]
+
+# Totals across every book cleaned in this process
+totals = Counter()
+_totals_lock = threading.Lock()
+
+
+def _normalize_line(line):
+    """
+    Comparison key for header/footer detection: lowercase, digits masked.
+
+    Chapter numbers are kept, so "Chapter 1" and "Chapter 4" stay different
+    headings while "Chapter 3 · 41" and "Chapter 3 · 42" are one running header.
+    """
+    line = ' '.join(line.lower().split())
+    return _HEADING_NUMBER.sub(lambda match: match.group(1) or '#', line)
+
+
+def _is_page_number(line):
+    """
+    Whether a line is only a page number. Roman numerals count only with a
+    label ("Page xiv") or marks on both sides ("- xiv -", "[IX]"), so a lone
+    "I", "mix" or "mi" is kept.
+    """
+    line = line.strip()
+    bare = line.strip(_PAGE_NUMBER_MARKS)
+    if _DIGITS.match(bare) or _PAGE_LABEL.match(bare):
+        return True
+    enclosed = len(line) > 2 and line[0] in _ROMAN_MARKS and line[-1] in _ROMAN_MARKS
+    return enclosed and bool(_ROMAN_NUMBER.match(bare))
+
+
+def _rejoin_hyphenation(text):
+    """
+    Rejoin words broken across lines with a hyphen.
+
+    Returns:
+        Tuple of (text, number of words joined); compounds keep their hyphen
+        and aren't counted
+    """
+    lowered = text.lower()
+    joined = 0
+
+    def rejoin(match):
+        nonlocal joined
+        first, hyphen, rest = match.groups()
+        compound = f"{first}-{rest}".lower()
+        if hyphen == '-' and f"{first}{rest}".lower() not in lowered and (
+                first.lower() in _COMPOUND_WORDS or compound in lowered):
+            return f"{first}-{rest}"
+        joined += 1
+        return first + rest
+
+    return _HYPHEN_BREAK.sub(rejoin, text), joined
+
+
+class TextCleaner:
+    """Cleans the pages of one book, in order"""
+
+    def __init__(self, window=6, min_repeats=3, edge_lines=2, min_letters=3):
+        """
+        Args:
+            window: Pages read ahead before a page is cleaned, so headers that
+                    start on the first pages are recognized there too
+            min_repeats: Pages a header/footer line must appear on to be removed
+            edge_lines: Lines at the top and bottom of a page that may be headers/footers
+            min_letters: Pages with fewer letters left after cleaning are dropped
+        """
+        self.window = max(0, window)
+        self.min_repeats = min_repeats
+        self.edge_lines = edge_lines
+        self.min_letters = min_letters
+        self.stats = Counter()
+
+        self._edge_counts = Counter()  # ('top' | 'bottom', normalized line) -> pages it appeared on
+
+    def clean_pages(self, pages):
+        """
+        Clean pages as they stream in.
+
+        Args:
+            pages: Iterable of {'page_number', 'text'} dictionaries
+
+        Yields:
+            The same dictionaries with cleaned text; dropped pages are skipped
+        """
+        buffer = deque()
+        for page in pages:
+            # Rejoin hyphenated words first so a split word never looks like two lines
+            text, joined = _rejoin_hyphenation(page['text'])
+            self.stats['hyphenations_joined'] += joined
+            lines = [line.strip() for line in text.splitlines() if line.strip()]
+            self._edge_counts.update(self._edge_keys(lines))
+            buffer.append((page, lines))
+            if len(buffer) > self.window:
+                cleaned = self._clean(*buffer.popleft())
+                if cleaned:
+                    yield cleaned
+        while buffer:
+            cleaned = self._clean(*buffer.popleft())
+            if cleaned:
+                yield cleaned
+
+    def get_stats(self):
+        chars_in = self.stats['chars_in']
+        return {
+            'pages': self.stats['pages'],
+            'pages_dropped': self.stats['pages_dropped'],
+            'header_footer_lines': self.stats['header_footer_lines'],
+            'page_number_lines': self.stats['page_number_lines'],
+            'hyphenations_joined': self.stats['hyphenations_joined'],
+            'chars_in': chars_in,
+            'chars_out': self.stats['chars_out'],
+            'chars_saved': chars_in - self.stats['chars_out'],
+            'percent_saved': round(100 * (chars_in - self.stats['chars_out']) / chars_in, 1) if chars_in else 0.0
+        }
+
+    def _edge_keys(self, lines):
+        """Headers are counted separately from footers: a line must repeat in the same place"""
+        keys = {('top', _normalize_line(line)) for line in lines[:self.edge_lines]}
+        keys.update(('bottom', _normalize_line(line)) for line in lines[-self.edge_lines:])
+        return keys
+
+    def _strip_edges(self, lines):
+        """
+        Remove the header from the top and the footer from the bottom.
+
+        Each edge loses at most one repeated line plus page-number lines, so
+        body text that happens to repeat (short pages, refrains) survives.
+        A page that would be left empty keeps its repeated lines: one-line
+        pages such as chapter titles look like headers to the counts.
+        """
+        kept = self._edge_bounds(lines, skip_repeated=False)
+        if kept[0] >= kept[1]:
+            kept = self._edge_bounds(lines, skip_repeated=True)
+
+        start, end = kept
+        for line in lines[:start] + lines[end:]:
+            if _is_page_number(line):
+                self.stats['page_number_lines'] += 1
+            else:
+                self.stats['header_footer_lines'] += 1
+        return lines[start:end]
+
+    def _edge_bounds(self, lines, skip_repeated):
+        """Get the (start, end) of the lines left once headers/footers are removed"""
+        def removable(line, edge, repeated):
+            if _is_page_number(line):
+                return True
+            if not skip_repeated and not repeated[0] and self._edge_counts[(edge, _normalize_line(line))] >= self.min_repeats:
+                repeated[0] = True
+                return True
+            return False
+
+        start = 0
+        repeated = [False]
+        while start < min(self.edge_lines, len(lines)) and removable(lines[start], 'top', repeated):
+            start += 1
+        end = len(lines)
+        repeated = [False]
+        while end > max(start, len(lines) - self.edge_lines) and removable(lines[end - 1], 'bottom', repeated):
+            end -= 1
+        return start, end
+
+    def _clean(self, page, lines):
+        self.stats['pages'] += 1
+        self.stats['chars_in'] += len(page['text'])
+
+        text = '\n'.join(self._strip_edges(lines))
+        for pattern in _BOILERPLATE:
+            text = pattern.sub(' ', text)
+        text = ' '.join(text.split())
+
+        if sum(char.isalpha() for char in text) < self.min_letters:
+            self.stats['pages_dropped'] += 1
+            return None
+
+        self.stats['chars_out'] += len(text)
+        return dict(page, text=text)
+
+
+def record_totals(stats):
+    """Add one book's cleaning stats to the process totals"""
+    with _totals_lock:
+        for key in ('pages', 'pages_dropped', 'chars_in', 'chars_out', 'chars_saved'):
+            totals[key] += stats[key]
+        totals['books'] += 1
+
+
+def get_cleaning_stats():
+    """Totals across every book cleaned in this process"""
+    with _totals_lock:
+        chars_in = totals['chars_in']
+        return {
+            'books': totals['books'],
+            'pages': totals['pages'],
+            'pages_dropped': totals['pages_dropped'],
+            'chars_saved': totals['chars_saved'],
+            'percent_saved': round(100 * totals['chars_saved'] / chars_in, 1) if chars_in else 0.0
+        }
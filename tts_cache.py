@@ -0,0 +1,149 @@
+"""
+TTS Audio Cache
+===============
+
+Content-addressed on-disk cache for synthesized audio.
+
+Entries are keyed by a hash of the normalized text, the voice engine and the
+canonical voice settings, so the same page converted twice with the same voice
+is only synthesized once. Hits are hard-linked into the output folder (falling
+back to a copy across filesystems), and the cache is bounded by total size with
+least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+
+
+class TTSCache:
+    """Size-bounded LRU cache of audio files keyed by synthesis inputs"""
+
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Args:
+            cache_dir: Directory holding cached audio files
+            max_bytes: Total size the cache is allowed to grow to
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text, voice_engine, voice_settings):
+        """Build the cache key for a piece of text synthesized with the given voice"""
+        normalized_text = ' '.join(text.split())
+        canonical_settings = json.dumps(voice_settings or {}, sort_keys=True, separators=(',', ':'))
+        payload = '\n'.join([voice_engine, canonical_settings, normalized_text])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key, dest_path):
+        """
+        Place the cached audio for key at dest_path.
+
+        Returns:
+            True on a cache hit, False on a miss
+        """
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries or not os.path.exists(path):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return False
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        try:
+            os.utime(path)  # Keeps LRU order across restarts
+            _link_or_copy(path, dest_path)
+            return True
+        except OSError as e:
+            print(f"⚠️ TTS cache read failed for {key}: {e}")
+            return False
+
+    def put(self, key, src_path):
+        """Store the audio file at src_path under key, evicting old entries if needed"""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _link_or_copy(src_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"⚠️ TTS cache write failed for {key}: {e}")
+            return
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict_locked()
+
+    def get_stats(self):
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': f"{(self.hits/lookups*100):.1f}%" if lookups else "0%",
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def _load_index(self):
+        """Rebuild the LRU index from the files on disk, oldest access first"""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.mp3'):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                found.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+def _link_or_copy(src, dest):
+    """Hard-link src to dest (replacing dest atomically), copying if linking isn't possible"""
+    tmp_path = f"{dest}.{uuid.uuid4().hex}.tmp"
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dest)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
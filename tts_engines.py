@@ -0,0 +1,460 @@
+"""
+TTS Engines
+===========
+
+Text-to-speech backends behind one contract: synthesize(text, settings)
+returns MP3 bytes.
+
+Features:
+- gTTS, pyttsx3 (offline system voices) and OpenAI TTS backends, plus a local
+  fake engine that returns silent MP3 frames for tests and benchmarks
+- Per-engine concurrency limits, on top of the converter's global TTS limit
+- Request batching: concurrent requests with the same settings are handed to
+  engines that can synthesize several texts in one call (pyttsx3)
+- Rate-limit aware: a 429 from an engine pauses every caller of that engine
+  until the Retry-After delay has passed, then the request is retried
+- Registry with availability checks, used by /api/available-voices and to
+  reject conversions for engines that can't run here
+- Benchmark: python tts_engines.py fake gtts --pages 20 compares pages/second
+"""
+
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+
+try:
+    from gtts import gTTS, gTTSError
+    GTTS_AVAILABLE = True
+except ImportError:
+    GTTS_AVAILABLE = False
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    PYTTSX3_AVAILABLE = False
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+
+class TTSEngineError(Exception):
+    """Raised when an engine is unavailable or fails to synthesize"""
+
+
+class RateLimitedError(TTSEngineError):
+    """Raised by an engine backend when the service asks callers to slow down"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Request:
+    """One synthesize() call waiting for (or taking part in) a batch"""
+
+    def __init__(self, text, settings):
+        self.text = text
+        self.settings = settings
+        self.settings_key = json.dumps(settings or {}, sort_keys=True)
+        self.taken = False  # Claimed by a batch (its own or another caller's)
+        self.done = False
+        self.audio = None
+        self.error = None
+
+
+class TTSEngine:
+    """
+    Base class for engines.
+
+    Subclasses implement _synthesize_batch(texts, settings) (or just
+    _synthesize(text, settings) when max_batch is 1) and available().
+    """
+
+    name = None
+    default_concurrency = 4
+    max_batch = 1            # Texts per backend call
+    max_chars = None         # Longer texts are split at sentences and the audio joined
+    rate_limit_retries = 3
+    default_retry_after = 5.0
+
+    def __init__(self, concurrency=None):
+        """
+        Args:
+            concurrency: Backend calls allowed at once (default_concurrency if None)
+        """
+        self.concurrency = max(1, concurrency or self.default_concurrency)
+        self.stats = Counter()  # Updated and read under _condition
+
+        self._condition = threading.Condition()
+        self._pending = []    # _Request objects not yet taken by a batch
+        self._active = 0
+        self._resume_at = 0.0  # monotonic time before which no call may start
+
+    @classmethod
+    def available(cls):
+        """Check whether the engine can run in this environment"""
+        return False
+
+    def synthesize(self, text, settings=None):
+        """
+        Synthesize text into MP3 bytes.
+
+        Args:
+            text: Text to speak
+            settings: Engine-specific voice settings
+
+        Returns:
+            MP3 audio as bytes
+
+        Raises:
+            TTSEngineError: if the engine fails (after rate-limit retries)
+        """
+        settings = settings or {}
+        if self.max_chars and len(text) > self.max_chars:
+            return b''.join(self.synthesize(part, settings) for part in split_text(text, self.max_chars))
+
+        request = _Request(text, settings)
+        with self._condition:
+            self._pending.append(request)
+            # A request taken into another caller's batch only waits for that batch
+            while not request.done and (request.taken or self._active >= self.concurrency):
+                self._condition.wait()
+            if not request.taken:
+                # Take this request plus any others waiting with the same settings
+                batch = [request] + [
+                    other for other in self._pending
+                    if other is not request and other.settings_key == request.settings_key
+                ][:self.max_batch - 1]
+                for taken in batch:
+                    taken.taken = True
+                    self._pending.remove(taken)
+                self._active += 1
+            else:
+                batch = None
+
+        if batch is not None:
+            try:
+                self._run_batch(batch)
+            finally:
+                with self._condition:
+                    self._active -= 1
+                    for taken in batch:
+                        taken.done = True
+                    self._condition.notify_all()
+
+        if request.error:
+            raise request.error
+        return request.audio
+
+    def get_stats(self):
+        with self._condition:
+            seconds = self.stats['busy_seconds']
+            return {
+                'concurrency': self.concurrency,
+                'max_batch': self.max_batch,
+                'requests': self.stats['requests'],
+                'batches': self.stats['batches'],
+                'characters': self.stats['characters'],
+                'errors': self.stats['errors'],
+                'rate_limited': self.stats['rate_limited'],
+                'busy_seconds': round(seconds, 2),
+                'requests_per_busy_second': round(self.stats['requests'] / seconds, 2) if seconds else None,
+                'waiting': len(self._pending)
+            }
+
+    def _run_batch(self, batch):
+        texts = [request.text for request in batch]
+        for attempt in range(self.rate_limit_retries + 1):
+            self._wait_for_rate_limit()
+            started = time.monotonic()
+            try:
+                audio = self._synthesize_batch(texts, batch[0].settings)
+                break
+            except RateLimitedError as e:
+                self._count(rate_limited=1)
+                if attempt >= self.rate_limit_retries:
+                    self._fail(batch, e)
+                    return
+                delay = e.retry_after or self.default_retry_after * (2 ** attempt)
+                with self._condition:
+                    self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                print(f"⚠️ {self.name} rate limited, pausing for {delay:.1f}s")
+            except Exception as e:
+                self._fail(batch, e if isinstance(e, TTSEngineError) else TTSEngineError(f"{self.name}: {e}"))
+                return
+            finally:
+                self._count(busy_seconds=time.monotonic() - started)
+
+        self._count(batches=1, requests=len(batch), characters=sum(len(text) for text in texts))
+        for request, data in zip(batch, audio):
+            request.audio = data
+
+    def _fail(self, batch, error):
+        self._count(errors=1)
+        for request in batch:
+            request.error = error
+
+    def _count(self, **amounts):
+        # Batches of several callers finish at once, so stats need the lock too
+        with self._condition:
+            self.stats.update(amounts)
+
+    def _wait_for_rate_limit(self):
+        with self._condition:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _synthesize_batch(self, texts, settings):
+        return [self._synthesize(text, settings) for text in texts]
+
+    def _synthesize(self, text, settings):
+        raise NotImplementedError
+
+
+class GTTSEngine(TTSEngine):
+    """Google Translate text-to-speech (network, no API key)"""
+
+    name = 'gtts'
+    default_concurrency = 8
+
+    @classmethod
+    def available(cls):
+        return GTTS_AVAILABLE
+
+    def _synthesize(self, text, settings):
+        buffer = io.BytesIO()
+        try:
+            gTTS(text, lang=settings.get('language', 'en'), slow=bool(settings.get('slow', False))).write_to_fp(buffer)
+        except gTTSError as e:
+            response = getattr(e, 'rsp', None)
+            if response is not None and response.status_code == 429:
+                raise RateLimitedError(f"gtts: {e}", _retry_after(response.headers)) from e
+            raise
+        return buffer.getvalue()
+
+
+class Pyttsx3Engine(TTSEngine):
+    """
+    System voices through pyttsx3 (offline).
+
+    The speech driver isn't thread-safe, so calls run one at a time, but one
+    call renders a whole batch of texts. Output is WAV, transcoded to MP3 with
+    ffmpeg, so the engine is only available when ffmpeg is installed.
+    """
+
+    name = 'pyttsx3'
+    default_concurrency = 1
+    max_batch = 16
+
+    @classmethod
+    def available(cls):
+        return PYTTSX3_AVAILABLE and shutil.which('ffmpeg') is not None
+
+    def _synthesize_batch(self, texts, settings):
+        with tempfile.TemporaryDirectory(prefix='pyttsx3-') as tmp_dir:
+            engine = pyttsx3.init()
+            engine.setProperty('rate', int(settings.get('rate', 200)))
+            engine.setProperty('volume', float(settings.get('volume', 0.9)))
+            voices = engine.getProperty('voices') or []
+            voice_index = int(settings.get('voice_id', 0) or 0)
+            if 0 <= voice_index < len(voices):
+                engine.setProperty('voice', voices[voice_index].id)
+
+            wav_paths = [os.path.join(tmp_dir, f"{i}.wav") for i in range(len(texts))]
+            for text, path in zip(texts, wav_paths):
+                engine.save_to_file(text, path)
+            engine.runAndWait()  # Renders every queued text in one pass
+            return [_wav_to_mp3(path) for path in wav_paths]
+
+
+class OpenAIEngine(TTSEngine):
+    """OpenAI text-to-speech API (needs OPENAI_API_KEY)"""
+
+    name = 'openai'
+    default_concurrency = 4
+    max_chars = 4096  # API input limit
+
+    def __init__(self, concurrency=None):
+        super().__init__(concurrency)
+        self._client = None
+
+    @classmethod
+    def available(cls):
+        return OPENAI_AVAILABLE and bool(os.environ.get('OPENAI_API_KEY'))
+
+    def _synthesize(self, text, settings):
+        if self._client is None:
+            self._client = openai.OpenAI()
+        try:
+            response = self._client.audio.speech.create(
+                model=settings.get('model', 'tts-1'),
+                voice=settings.get('voice', 'alloy'),
+                input=text,
+                response_format='mp3'
+            )
+        except openai.RateLimitError as e:
+            raise RateLimitedError(f"openai: {e}", _retry_after(e.response.headers)) from e
+        return response.content
+
+
+class FakeEngine(TTSEngine):
+    """
+    Local engine for tests and benchmarks: silent MP3 frames, no network.
+
+    Audio length follows the text (about 15 characters per second of speech)
+    and settings['latency'] adds a fixed delay per call in seconds.
+    """
+
+    name = 'fake'
+    default_concurrency = 8
+
+    # MPEG2 Layer III, 32 kbps, 24 kHz mono: 96-byte frames of 24 ms
+    FRAME = b'\xff\xf3\x44\xc4' + b'\x00' * 92
+    FRAME_SECONDS = 0.024
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def _synthesize(self, text, settings):
+        time.sleep(float(settings.get('latency', 0)))
+        frames = max(1, round(len(text) / 15 / self.FRAME_SECONDS))
+        return self.FRAME * frames
+
+
+ENGINE_CLASSES = {engine.name: engine for engine in (GTTSEngine, Pyttsx3Engine, OpenAIEngine, FakeEngine)}
+
+
+class TTSEngineRegistry:
+    """Engines available in this process, created on first use"""
+
+    def __init__(self, concurrency=None, enable_fake=False):
+        """
+        Args:
+            concurrency: Dictionary of engine name -> concurrency limit
+            enable_fake: Offer the fake engine (tests and benchmarks only)
+        """
+        self.concurrency = concurrency or {}
+        self.enable_fake = enable_fake
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def is_available(self, name):
+        engine_class = ENGINE_CLASSES.get(name)
+        if engine_class is None or (engine_class is FakeEngine and not self.enable_fake):
+            return False
+        return engine_class.available()
+
+    def get(self, name):
+        """
+        Get the engine instance for a name.
+
+        Raises:
+            TTSEngineError: if the engine is unknown or can't run here
+        """
+        if not self.is_available(name):
+            raise TTSEngineError(f"Voice engine '{name}' is not available")
+        with self._lock:
+            if name not in self._engines:
+                self._engines[name] = ENGINE_CLASSES[name](self.concurrency.get(name))
+            return self._engines[name]
+
+    def get_stats(self):
+        with self._lock:
+            engines = dict(self._engines)
+        return {name: engine.get_stats() for name, engine in engines.items()}
+
+
+def split_text(text, max_chars):
+    """Split text at sentence (then word) boundaries into parts of at most max_chars"""
+    parts = []
+    current = ''
+    for sentence in re.split(r'(?<=[.!?])\s+', text.strip()):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                parts.append(current)
+                current = ''
+            parts.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            parts.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _retry_after(headers):
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _wav_to_mp3(wav_path):
+    result = subprocess.run(
+        ['ffmpeg', '-loglevel', 'error', '-i', wav_path, '-f', 'mp3', '-'],
+        capture_output=True, check=False
+    )
+    if result.returncode != 0:
+        raise TTSEngineError(f"pyttsx3: ffmpeg failed: {result.stderr.decode(errors='replace')[:200]}")
+    return result.stdout
+
+
+def benchmark(engine, pages, settings=None, workers=8):
+    """
+    Synthesize pages with a pool of workers and measure throughput.
+
+    Returns:
+        Dictionary with pages, seconds, pages_per_second and audio bytes
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sizes = list(executor.map(lambda text: len(engine.synthesize(text, settings or {})), pages))
+    seconds = time.monotonic() - started
+    return {
+        'engine': engine.name,
+        'pages': len(pages),
+        'seconds': round(seconds, 2),
+        'pages_per_second': round(len(pages) / seconds, 2) if seconds else None,
+        'bytes': sum(sizes)
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare TTS engines on pages per second')
+    parser.add_argument('engines', nargs='+', choices=sorted(ENGINE_CLASSES))
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--chars', type=int, default=500, help='Characters per page')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--settings', default='{}', help='Voice settings as JSON')
+    args = parser.parse_args()
+
+    sentence = 'The quick brown fox jumps over the lazy dog. '
+    page = (sentence * (args.chars // len(sentence) + 1))[:args.chars]
+    registry = TTSEngineRegistry(enable_fake=True)
+    for engine_name in args.engines:
+        try:
+            print(benchmark(registry.get(engine_name), [page] * args.pages, json.loads(args.settings), args.workers))
+        except TTSEngineError as e:
+            print(f"❌ {e}")
@@ -0,0 +1,42 @@
+"""
+Conversion Worker Node
+======================
+
+Runs audiobook conversions in a process of its own, separate from the web
+nodes that serve users.
+
+Web nodes (NODE_ROLE=web) persist conversions as 'queued' in the shared
+database; each worker node pulls jobs as its workers go idle and claims them
+atomically, so any number of workers can share the queue. Progress events
+go out through SOCKETIO_MESSAGE_QUEUE and reach clients on every web node.
+
+Features:
+- Same configuration as the web app (database, TTS engines, caches)
+- CONVERSION_WORKERS conversions at a time per node
+- Output folder must be shared with the web nodes that serve the audio
+
+Usage:
+    SOCKETIO_MESSAGE_QUEUE=redis://localhost:6379/0 python worker.py
+"""
+
+import os
+import time
+
+
+def main():
+    # Must be set before the app module builds its scheduler and Socket.IO emitter.
+    # Imported here, not at the top, so PDF extraction processes that re-import
+    # this script (forkserver/spawn) don't start a second worker node
+    os.environ['NODE_ROLE'] = 'worker'
+    import app_simple
+
+    print(f"🚀 Conversion worker node running ({app_simple.app.config['CONVERSION_WORKERS']} workers)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("👋 Worker node stopped")
+
+
+if __name__ == '__main__':
+    main()